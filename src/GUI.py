@@ -15,18 +15,8 @@ except ModuleNotFoundError:
     print('tkinter not available!')
     exit(2)
 
-try:
-    import pynput
-except ModuleNotFoundError:
-    print('Module pynput not found! Please install required modules from file "requirements.txt"')
-    exit(1)
-except Exception as exc:
-    print(f'Import module pynput failed ({exc})!')
-    exit(1)
-
-
 import camera_controller
-import keyboard_sniffer
+import keyboard_bus
 import exceptions
 import settings
 import logger
@@ -111,7 +101,7 @@ class _CameraSettingsWindow:
             self._window.iconbitmap(path)
         except Exception as e:
             logger.Logger().warning('Reading icon file for camera settings window failed!')
-            logger.Logger().debug(f'Error text: {e}')
+            logger.Logger().debug('Error text: %s', e)
         self._lbl_address = tk.Label(self._window, text='Address:')
         self._lbl_port = tk.Label(self._window, text='Port:')
         self._lbl_username = tk.Label(self._window, text='Username:')
@@ -176,19 +166,19 @@ class _CameraSettingsWindow:
         except exceptions.ConnectionToCameraError as e:
             tk_mb.showerror('Test connection failed',
                             'Connection to host failed! Check entered address/port!')
-            logger.Logger().debug(f'Connection to "{address}" failed with error: {str(e)}')
+            logger.Logger().debug('Connection to "%s" failed with error: %s', address, e)
             return None
         except exceptions.GettingProfilesFromCameraError as e:
             tk_mb.showerror('Test connection failed',
                             'Getting media profiles failed! Check entered username/password!')
-            logger.Logger().debug(f'Connection to "{address}" failed with error: {str(e)}')
+            logger.Logger().debug('Connection to "%s" failed with error: %s', address, e)
             return None
         except exceptions.NoMediaProfilesOnCameraError:
             tk_mb.showerror('Test connection failed', 'Media profiles not found! Check settings on camera!')
             return None
         except exceptions.GettingPresetsCountError as e:
             tk_mb.showerror('Test connection failed', 'Request presets count failed!')
-            logger.Logger().debug(f'Connection to "{address}" failed with error: {str(e)}')
+            logger.Logger().debug('Connection to "%s" failed with error: %s', address, e)
             return None
         except exceptions.IncorrectPresetsCountError:
             tk_mb.showerror('Test connection failed', 'Incorrect answer by camera!')
@@ -219,6 +209,9 @@ class _CameraSettingsWindow:
 
 
 class CamerasWindow:
+    _SLOT_COLUMNS: int = 3
+    _VISIBLE_ROWS: int = 3
+
     _hot_key_entries_values: list = list()
     _active_values: list = list()
     _active_checks: list = list()
@@ -227,10 +220,12 @@ class CamerasWindow:
     _presets_values: list = list()
     _presets_spins: list = list()
     _key_pressed: list = list()
-    _updated_cameras: list = list()
+    _updated_cameras: dict = dict()
     _selected_entry_hot_key: int | None = None
-    _keyboard_listener: pynput.keyboard.Listener | None = None
+    _keyboard_subscription: int | None = None
     _config: settings.Settings = None
+    _slots_frame: ttk.Frame | None = None
+    _slots_canvas: tk.Canvas | None = None
 
     @property
     def settings_updated(self) -> bool:
@@ -259,99 +254,128 @@ class CamerasWindow:
             self._window.iconbitmap(path)
         except Exception as e:
             logger.Logger().warning('Reading icon file for settings window failed!')
-            logger.Logger().debug(f' Error text: {e}')
+            logger.Logger().debug(' Error text: %s', e)
+        self._config = settings.Settings()
         hot_key_frame = ttk.Frame(self._window)
-        hot_key_number = 0
-        for column in range(3):
-            for row in range(3):
-                hot_key_number += 1
-                box_hot_key = ttk.LabelFrame(hot_key_frame, text=f'Key {hot_key_number}')
-                command = functools.partial(self._on_click_open_onvif_settings, hot_key_number - 1)
-                btn_onvif_settings = ttk.Button(box_hot_key, text='Set ONVIF settings',
-                                                command=command)
-                box_key_sniffer = ttk.LabelFrame(box_hot_key, text='Hot key')
-                active = tk.IntVar(value=0)
-                ent_value = tk.StringVar(value='')
-                command = functools.partial(self._on_click_active_check, hot_key_number - 1)
-                chk_activated = ttk.Checkbutton(box_key_sniffer, text='Active', variable=active, command=command,
-                                                state=tk.DISABLED)
-                ent_hot_key = ttk.Entry(box_key_sniffer, width=12, textvariable=ent_value, state=tk.DISABLED)
-                ent_hot_key.bind('<Key>', lambda _: 'break')
-                ent_hot_key.bind('<FocusIn>', functools.partial(self._hot_key_focus_in, hot_key_number - 1))
-                ent_hot_key.bind('<FocusOut>', self._hot_key_focus_out)
-                self._hot_key_entries_values.append(ent_value)
-                self._active_values.append(active)
-                self._active_checks.append(chk_activated)
-                self._hot_key_entries.append(ent_hot_key)
-                command = functools.partial(self._on_click_reset_hot_key, hot_key_number - 1)
-                btn_reset_key = ttk.Button(box_key_sniffer, text='Reset key', state=tk.DISABLED, command=command)
-                self._reset_hot_key_buttons.append(btn_reset_key)
-                preset = tk.StringVar(value='1')
-                self._presets_values.append(preset)
-                lbl_preset = ttk.Label(box_hot_key, text='Preset:')
-                num_validator = (self._window.register(lambda val: re.match(r'^\d{0,4}$', val) is not None), '%P')
-                command = functools.partial(self._on_change_preset, hot_key_number - 1)
-                spb_preset = ttk.Spinbox(box_hot_key, from_=1.0, to=1024.0, increment=1.0, wrap=True, validate='all',
-                                         validatecommand=num_validator, command=command, state=tk.DISABLED,
-                                         textvariable=preset)
-                spb_preset.bind('<KeyRelease>', command)
-                self._presets_spins.append(spb_preset)
-                btn_onvif_settings.pack(padx=2, pady=2, fill=tk.BOTH)
-                chk_activated.pack(padx=2, pady=2, fill=tk.BOTH)
-                box_key_sniffer.pack(padx=2, pady=2, fill=tk.BOTH)
-                ent_hot_key.pack(padx=2, pady=2, fill=tk.BOTH)
-                btn_reset_key.pack(padx=2, pady=2, fill=tk.BOTH)
-                lbl_preset.pack(padx=2, pady=2, fill=tk.BOTH)
-                spb_preset.pack(padx=2, pady=2, fill=tk.BOTH)
-                box_hot_key.grid(column=column, row=row, padx=2, pady=2)
+        self._slots_canvas = tk.Canvas(hot_key_frame, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(hot_key_frame, orient=tk.VERTICAL, command=self._slots_canvas.yview)
+        self._slots_canvas.configure(yscrollcommand=scrollbar.set)
+        self._slots_frame = ttk.Frame(self._slots_canvas)
+        self._slots_canvas.create_window((0, 0), window=self._slots_frame, anchor='nw')
+        self._slots_frame.bind('<Configure>', lambda _: self._update_slots_canvas())
+        # Slots for all configured cameras (full rows, 3 rows minimum)
+        max_number = max((camera.number for camera in self._config.data.cameras or list()), default=0)
+        rows = max(self._VISIBLE_ROWS, -(-max_number // self._SLOT_COLUMNS))
+        for _ in range(rows * self._SLOT_COLUMNS):
+            self._add_slot()
+        self._slots_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         btn_frame = ttk.Frame(self._window)
+        btn_add_row = ttk.Button(btn_frame, text='add cameras row', command=self._on_click_add_row)
         btn_ok = ttk.Button(btn_frame, text='ok', command=self._on_click_ok)
         btn_cancel = ttk.Button(btn_frame, text='cancel', command=self._on_click_cancel)
         btn_ok.bind('<Return>', lambda event: self._on_click_ok())
         btn_cancel.bind('<Return>', lambda event: self._on_click_cancel())
+        btn_add_row.pack(side=tk.LEFT, padx=2, pady=2)
         btn_cancel.pack(side=tk.RIGHT, padx=2, pady=2)
         btn_ok.pack(side=tk.RIGHT, padx=2, pady=2)
-        hot_key_frame.pack(padx=2, pady=2)
-        btn_frame.pack(padx=2, pady=2, anchor='se')
-        self._config = settings.Settings()
-        if isinstance(self._config.data, settings.SettingsData):
-            if isinstance(self._config.data.cameras, list):
-                for i in range(9):
-                    item = self._config.get_camera(i + 1)
-                    if item is None:
-                        self._hot_key_entries_values[i].set('')
-                        self._presets_spins[i]['to'] = 1.0
-                        self._presets_values[i].set('1')
-                        self._active_checks[i]['state'] = tk.DISABLED
-                        self._hot_key_entries[i]['state'] = tk.DISABLED
-                        self._reset_hot_key_buttons[i]['state'] = tk.DISABLED
-                        self._presets_spins[i]['state'] = tk.DISABLED
-                        continue
-                    if item.activated:
-                        self._active_values[i].set(1)
-                    else:
-                        self._active_values[i].set(0)
-                    first_key = True
-                    keys_text = ''
-                    for key in item.hot_keys:
-                        if not first_key:
-                            keys_text += ' + '
-                        else:
-                            first_key = False
-                        keys_text += key
-                    self._hot_key_entries_values[i].set(keys_text)
-                    self._presets_spins[i]['to'] = float(item.max_count)
-                    self._presets_values[i].set(str(item.preset))
-                    self._active_checks[i]['state'] = tk.ACTIVE
-                    self._hot_key_entries[i]['state'] = tk.ACTIVE
-                    self._reset_hot_key_buttons[i]['state'] = tk.ACTIVE
-                    self._presets_spins[i]['state'] = tk.ACTIVE
+        hot_key_frame.pack(padx=2, pady=2, fill=tk.BOTH, expand=True)
+        btn_frame.pack(padx=2, pady=2, fill=tk.X)
+        for i in range(len(self._hot_key_entries)):
+            self._fill_slot(i)
         if start_tk_mainloop:
             self._window.after(100, lambda: self._window.focus_force())
             self._window.mainloop()
         if init_hidden:
             self._window.withdraw()
 
+    def _add_slot(self) -> None:
+        """
+        Adding settings box of next camera number
+        """
+        index = len(self._hot_key_entries)
+        box_hot_key = ttk.LabelFrame(self._slots_frame, text=f'Key {index + 1}')
+        command = functools.partial(self._on_click_open_onvif_settings, index)
+        btn_onvif_settings = ttk.Button(box_hot_key, text='Set ONVIF settings', command=command)
+        box_key_sniffer = ttk.LabelFrame(box_hot_key, text='Hot key')
+        active = tk.IntVar(value=0)
+        ent_value = tk.StringVar(value='')
+        command = functools.partial(self._on_click_active_check, index)
+        chk_activated = ttk.Checkbutton(box_key_sniffer, text='Active', variable=active, command=command,
+                                        state=tk.DISABLED)
+        ent_hot_key = ttk.Entry(box_key_sniffer, width=12, textvariable=ent_value, state=tk.DISABLED)
+        ent_hot_key.bind('<Key>', lambda _: 'break')
+        ent_hot_key.bind('<FocusIn>', functools.partial(self._hot_key_focus_in, index))
+        ent_hot_key.bind('<FocusOut>', self._hot_key_focus_out)
+        self._hot_key_entries_values.append(ent_value)
+        self._active_values.append(active)
+        self._active_checks.append(chk_activated)
+        self._hot_key_entries.append(ent_hot_key)
+        command = functools.partial(self._on_click_reset_hot_key, index)
+        btn_reset_key = ttk.Button(box_key_sniffer, text='Reset key', state=tk.DISABLED, command=command)
+        self._reset_hot_key_buttons.append(btn_reset_key)
+        preset = tk.StringVar(value='1')
+        self._presets_values.append(preset)
+        lbl_preset = ttk.Label(box_hot_key, text='Preset:')
+        num_validator = (self._window.register(lambda val: re.match(r'^\d{0,4}$', val) is not None), '%P')
+        command = functools.partial(self._on_change_preset, index)
+        spb_preset = ttk.Spinbox(box_hot_key, from_=1.0, to=1024.0, increment=1.0, wrap=True, validate='all',
+                                 validatecommand=num_validator, command=command, state=tk.DISABLED,
+                                 textvariable=preset)
+        spb_preset.bind('<KeyRelease>', command)
+        self._presets_spins.append(spb_preset)
+        btn_onvif_settings.pack(padx=2, pady=2, fill=tk.BOTH)
+        chk_activated.pack(padx=2, pady=2, fill=tk.BOTH)
+        box_key_sniffer.pack(padx=2, pady=2, fill=tk.BOTH)
+        ent_hot_key.pack(padx=2, pady=2, fill=tk.BOTH)
+        btn_reset_key.pack(padx=2, pady=2, fill=tk.BOTH)
+        lbl_preset.pack(padx=2, pady=2, fill=tk.BOTH)
+        spb_preset.pack(padx=2, pady=2, fill=tk.BOTH)
+        box_hot_key.grid(column=index % self._SLOT_COLUMNS, row=index // self._SLOT_COLUMNS, padx=2, pady=2)
+
+    def _fill_slot(self, index: int) -> None:
+        """
+        Showing camera data in settings box
+        :param index: Box index (camera number - 1)
+        """
+        item = self._config.get_camera(index + 1)
+        if item is None:
+            self._hot_key_entries_values[index].set('')
+            self._presets_spins[index]['to'] = 1.0
+            self._presets_values[index].set('1')
+            self._active_checks[index]['state'] = tk.DISABLED
+            self._hot_key_entries[index]['state'] = tk.DISABLED
+            self._reset_hot_key_buttons[index]['state'] = tk.DISABLED
+            self._presets_spins[index]['state'] = tk.DISABLED
+            return None
+        self._active_values[index].set(1 if item.activated else 0)
+        self._hot_key_entries_values[index].set(' + '.join(item.hot_keys))
+        self._presets_spins[index]['to'] = float(item.max_count)
+        self._presets_values[index].set(str(item.preset))
+        self._active_checks[index]['state'] = tk.ACTIVE
+        self._hot_key_entries[index]['state'] = tk.ACTIVE
+        self._reset_hot_key_buttons[index]['state'] = tk.ACTIVE
+        self._presets_spins[index]['state'] = tk.ACTIVE
+
+    def _update_slots_canvas(self) -> None:
+        """
+        Fitting canvas to slots (scrolling if rows count is greater than visible rows count)
+        """
+        self._slots_canvas.configure(scrollregion=self._slots_canvas.bbox('all'))
+        rows = -(-len(self._hot_key_entries) // self._SLOT_COLUMNS)
+        height = self._slots_frame.winfo_reqheight() * min(rows, self._VISIBLE_ROWS) // max(rows, 1)
+        self._slots_canvas.configure(width=self._slots_frame.winfo_reqwidth(), height=height)
+
+    def _on_click_add_row(self) -> None:
+        count = min(self._SLOT_COLUMNS, settings.MAX_CAMERA_NUMBER - len(self._hot_key_entries))
+        if count <= 0:
+            tk_mb.showerror('Error', f'Maximum count of cameras is {settings.MAX_CAMERA_NUMBER}!')
+            return None
+        for _ in range(count):
+            self._add_slot()
+        self._window.update_idletasks()
+        self._slots_canvas.yview_moveto(1.0)
+
     def wait_result(self) -> None:
         self._window.wait_window()
 
@@ -359,18 +383,9 @@ class CamerasWindow:
         self._window.deiconify()
 
     def _on_click_open_onvif_settings(self, key_number: int) -> None:
-        item = None
-        for camera in self._updated_cameras:
-            if camera.number == key_number + 1:
-                item = camera
-                break
+        item = self._updated_cameras.get(key_number + 1)
         if item is None:
-            if not isinstance(self._config.data, settings.SettingsData):
-                item = None
-            elif not isinstance(self._config.data.cameras, list):
-                item = None
-            else:
-                item = self._config.get_camera(key_number + 1)
+            item = self._config.get_camera(key_number + 1)
         onvif_window = _CameraSettingsWindow()
         if item is not None:
             onvif_window.address = item.address
@@ -396,11 +411,7 @@ class CamerasWindow:
             return None
         if item.preset > item.max_count or item.preset < 1:
             item.preset = 1
-        for camera in self._updated_cameras:
-            if camera.number == key_number + 1:
-                self._updated_cameras.remove(camera)
-                break
-        self._updated_cameras.append(item)
+        self._updated_cameras[item.number] = item
         self._active_checks[key_number]['state'] = tk.ACTIVE
         self._active_values[key_number].set(1)
         self._hot_key_entries[key_number]['state'] = tk.ACTIVE
@@ -416,37 +427,23 @@ class CamerasWindow:
             return None
         self._hot_key_entries_values[key_number].set('')
         key_number = key_number + 1
-        updated = False
-        for camera in self._updated_cameras:
-            if camera.number == key_number:
-                camera.hot_keys = list()
-                updated = True
-                break
-        if not updated:
-            camera = self._config.get_camera(key_number)
-            if camera is not None:
-                camera.hot_keys = list()
-                self._updated_cameras.append(camera)
+        camera = self._get_updated_camera(key_number)
+        if camera is not None:
+            camera.hot_keys = list()
 
     def _hot_key_focus_in(self, index: int, _) -> None:
         self._selected_entry_hot_key = index
-        if self._keyboard_listener is not None:
-            self._keyboard_listener.stop()
-        self._keyboard_listener = pynput.keyboard.Listener(on_press=self._key_press, on_release=self._key_release)
-        self._keyboard_listener.daemon = True
-        self._keyboard_listener.start()
+        if self._keyboard_subscription is None:
+            self._keyboard_subscription = keyboard_bus.KeyboardBus().subscribe(self._key_press, self._key_release)
 
     def _hot_key_focus_out(self, _) -> None:
         self._selected_entry_hot_key = None
         self._key_pressed.clear()
-        if self._keyboard_listener is not None:
-            self._keyboard_listener.stop()
-            self._keyboard_listener = None
+        if self._keyboard_subscription is not None:
+            keyboard_bus.KeyboardBus().unsubscribe(self._keyboard_subscription)
+            self._keyboard_subscription = None
 
-    def _key_press(self, key: pynput.keyboard.Key) -> None:
-        key_text = keyboard_sniffer.KeyboardSniffer.key_to_text(key)
-        if key_text is None:
-            return None
+    def _key_press(self, key_text: str, _: float) -> None:
         if key_text in self._key_pressed:
             return None
         if self._selected_entry_hot_key is None:
@@ -462,37 +459,20 @@ class CamerasWindow:
             keys_text_value += key
         self._hot_key_entries_values[self._selected_entry_hot_key].set(keys_text_value)
         camera_number = self._selected_entry_hot_key + 1
-        updated = False
-        for camera in self._updated_cameras:
-            if camera.number == camera_number:
-                camera.hot_keys = copy.deepcopy(self._key_pressed)
-                updated = True
-                break
-        if not updated:
-            camera = self._config.get_camera(camera_number)
-            if camera is not None:
-                camera.hot_keys = copy.deepcopy(self._key_pressed)
-                self._updated_cameras.append(camera)
+        camera = self._get_updated_camera(camera_number)
+        if camera is not None:
+            camera.hot_keys = copy.deepcopy(self._key_pressed)
 
-    def _key_release(self, key: pynput.keyboard.Key) -> None:
-        key_text = keyboard_sniffer.KeyboardSniffer.key_to_text(key)
-        if key_text is not None and key_text in self._key_pressed:
+    def _key_release(self, key_text: str, _: float) -> None:
+        if key_text in self._key_pressed:
             self._key_pressed.remove(key_text)
 
     def _on_click_active_check(self, index: int) -> None:
         new_state = self._active_values[index].get() == 1
         camera_number = index + 1
-        updated = False
-        for camera in self._updated_cameras:
-            if camera.number == camera_number:
-                camera.activated = new_state
-                updated = True
-                break
-        if not updated:
-            camera = self._config.get_camera(camera_number)
-            if camera is not None:
-                camera.activated = new_state
-                self._updated_cameras.append(camera)
+        camera = self._get_updated_camera(camera_number)
+        if camera is not None:
+            camera.activated = new_state
 
     def _on_change_preset(self, index: int, _=None) -> None:
         preset = self._presets_values[index].get()
@@ -500,31 +480,35 @@ class CamerasWindow:
             preset = int(preset)
         else:
             return None
-        camera_number = index + 1
-        updated = False
-        for camera in self._updated_cameras:
-            if camera.number == camera_number:
-                if camera.max_count >= preset > 0:
-                    camera.preset = preset
-                else:
-                    camera.preset = camera.max_count
-                    self._presets_values[index].set(str(camera.max_count))
-                updated = True
-                break
-        if not updated:
-            camera = self._config.get_camera(camera_number)
+        camera = self._get_updated_camera(index + 1)
+        if camera is None:
+            return None
+        if camera.max_count >= preset > 0:
+            camera.preset = preset
+        else:
+            camera.preset = camera.max_count
+            self._presets_values[index].set(str(camera.max_count))
+
+    def _get_updated_camera(self, number: int) -> settings.CameraData | None:
+        """
+        Camera data changed in window (camera from configuration is added to updated cameras on first change)
+        :param number: Camera number
+        :return: CameraData object or None if camera not configured
+        """
+        camera = self._updated_cameras.get(number)
+        if camera is None:
+            camera = self._config.get_camera(number)
             if camera is not None:
-                if camera.max_count <= preset and preset > 0:
-                    camera.preset = preset
-                    self._updated_cameras.append(camera)
+                self._updated_cameras[number] = camera
+        return camera
 
     def _on_click_ok(self) -> None:
-        for camera in self._updated_cameras:
+        for camera in self._updated_cameras.values():
             try:
                 self._config.insert_camera(camera, replace=True)
             except exceptions.IncorrectData as e:
                 tk_mb.showerror('Error', 'Saving cameras data failed! (incorrect data)')
-                logger.Logger().debug(f'Insert camera failed with error: {str(e)}')
+                logger.Logger().debug('Insert camera failed with error: %s', e)
                 return None
             except exceptions.IncorrectArgsError:
                 tk_mb.showerror('Error', 'Saving cameras data failed! (incorrect data type)')
@@ -532,17 +516,19 @@ class CamerasWindow:
         try:
             if self._config.save():
                 self._settings_updated = True
+                self._hot_key_focus_out(None)
                 self._window.destroy()
             else:
                 tk_mb.showerror('Error', 'Saving cameras data failed!')
                 return None
         except exceptions.IncorrectData as e:
             tk_mb.showerror('Error', 'Saving cameras data failed! (incorrect data)')
-            logger.Logger().debug(f'Save cameras data failed with error: {str(e)}')
+            logger.Logger().debug('Save cameras data failed with error: %s', e)
             return None
 
     def _on_click_cancel(self) -> None:
         self._updated_cameras.clear()
+        self._hot_key_focus_out(None)
         self._window.destroy()
 
     def _on_delete_window(self) -> None:
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 
 
-import sys
-import os
+import threading
+import time
 
 
 try:
@@ -15,28 +15,124 @@ except Exception as exc:
     exit(1)
 
 
+import latency_tracker
+import transport_pool
+import ptz_fast_path
+import wsdl_cache
 import exceptions
 import logger
 
 
+def _is_timeout(value) -> bool:
+    """
+    :return: Value is None or tuple of positive connect and read timeouts
+    """
+    return value is None or (isinstance(value, tuple) and len(value) == 2 and
+                             all(isinstance(item, (int, float)) and item > 0 for item in value))
+
+
+class _ONVIFCamera(onvif.ONVIFCamera):
+    """
+    ONVIF camera with services based on WSDL documents shared by all cameras
+    """
+
+    def create_onvif_service(self, name, from_template=True, portType=None):
+        name = name.lower()
+        xaddr, wsdl_file, binding_name = self.get_definition(name, portType)
+        wsse = onvif.client.UsernameDigestTokenDtDiff(self.user, self.passwd, dt_diff=self.dt_diff,
+                                                      use_digest=self.encrypt)
+        zeep_client = wsdl_cache.WsdlCache().create_client(wsdl_file, wsse, self.transport)
+        with self.services_lock:
+            service = onvif.ONVIFService(xaddr, self.user, self.passwd, wsdl_file, self.encrypt, self.daemon,
+                                         zeep_client=zeep_client, portType=portType, dt_diff=self.dt_diff,
+                                         binding_name=binding_name, transport=self.transport)
+            self.services[name] = service
+            setattr(self, name, service)
+        return service
+
+
 class CameraController:
+    _DEFAULT_CACHE_TTL: float = 300.0
+
     _address: str = '0.0.0.0'
     _port: int = 80
     _username: str = 'admin'
     _password: str = 'admin'
-    _camera: onvif.ONVIFCamera | None = None
+    _camera: _ONVIFCamera | None = None
     _ptz_presets_count: int = 0
+    _media_service: onvif.ONVIFService | None = None
+    _ptz_service: onvif.ONVIFService | None = None
+    _profile_token: str | None = None
+    _goto_preset_request = None
+    _cache_ttl: float | None = _DEFAULT_CACHE_TTL
+    _cache_time: float = 0.0
+    _fast_path: bool = False
+    _timeout: tuple | None = None
+    _fast_ptz: ptz_fast_path.FastPtzDriver | None = None
+    _lock: threading.RLock = None
 
     @property
     def ptz_presets_count(self) -> int:
         return self._ptz_presets_count
 
-    def __init__(self, address: str, port: int, username: str, password: str):
+    @property
+    def fast_path_active(self) -> bool:
+        return self._fast_ptz is not None
+
+    @property
+    def fast_path(self) -> bool:
+        return self._fast_path
+
+    @fast_path.setter
+    def fast_path(self, value: bool) -> None:
+        if not isinstance(value, bool) or value == self._fast_path:
+            return None
+        with self._lock:
+            self._fast_path = value
+            if self._goto_preset_request is not None:
+                self._init_fast_path()
+
+    @property
+    def timeout(self) -> tuple | None:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: tuple | None) -> None:
+        if _is_timeout(value):
+            self._timeout = value
+
+    @property
+    def cache_ttl(self) -> float | None:
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value: float | None) -> None:
+        if value is None or (isinstance(value, (int, float)) and value > 0):
+            self._cache_ttl = value
+
+    @property
+    def cache_expired(self) -> bool:
+        """
+        Cached profile token and presets count are older than cache TTL
+        """
+        if self._profile_token is None or self._goto_preset_request is None:
+            return True
+        if self._cache_ttl is None:
+            return False
+        return time.monotonic() - self._cache_time > self._cache_ttl
+
+    def __init__(self, address: str, port: int, username: str, password: str,
+                 cache_ttl: float | None = _DEFAULT_CACHE_TTL, fast_path: bool = False,
+                 timeout: tuple | None = None, request_timeout: tuple | None = None):
         """
         :param address: Address of IP camera
         :param port: ONVIF port on IP camera
         :param username: ONVIF username
         :param password: ONVIF user password
+        :param cache_ttl: Lifetime (seconds) of cached profile token and presets count. None - cache never expires
+        :param fast_path: Send PTZ commands as prebuilt SOAP envelopes (zeep used as fallback)
+        :param timeout: Tuple of connect and read timeouts (seconds) for every request. None - no timeouts
+        :param request_timeout: Timeouts of connecting requests (None - timeout argument used)
         :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
         :exception exceptions.ConnectionToCameraError: Wrong address or port of camera
         :exception exceptions.GettingProfilesFromCameraError: Getting media profiles failed. Check username and password
@@ -50,37 +146,66 @@ class CameraController:
             raise exceptions.IncorrectArgsError
         if address == '' or port < 1 or port > 65535:
             raise exceptions.IncorrectArgsError
+        if not (cache_ttl is None or (isinstance(cache_ttl, (int, float)) and cache_ttl > 0)):
+            raise exceptions.IncorrectArgsError
+        if not isinstance(fast_path, bool):
+            raise exceptions.IncorrectArgsError
+        if not _is_timeout(timeout) or not _is_timeout(request_timeout):
+            raise exceptions.IncorrectArgsError
         self._address = address
         self._port = port
         self._username = username
         self._password = password
-        self._init_camera()
+        self._cache_ttl = cache_ttl
+        self._fast_path = fast_path
+        self._timeout = timeout
+        self._lock = threading.RLock()
+        self._init_camera(request_timeout or timeout)
         self._get_ptz_presets_count()
 
-    def _init_camera(self) -> None:
+    def _init_camera(self, timeout: tuple | None = None) -> None:
         """
         Initialize camera object
+        :param timeout: Tuple of connect and read timeouts (seconds) of connecting requests. None - no timeouts
         :exception exceptions.ConnectionToCameraError: Wrong address or port of camera
         :exception exceptions.GettingProfilesFromCameraError: Getting media profiles failed. Check username and password
         :exception exceptions.NoMediaProfilesOnCameraError: No media profiles on camera
         """
-        wsdl_path = os.path.dirname(os.path.abspath(__file__))
-        if hasattr(sys, '_MEIPASS'):
-            wsdl_path += '/resources/wsdl'
-        else:
-            wsdl_path += '/../resources/wsdl'
         self._camera = None
+        self._media_service = None
+        self._ptz_service = None
         try:
-            camera = onvif.ONVIFCamera(self._address, self._port, self._username, self._password, wsdl_path)
+            camera = _ONVIFCamera(self._address, self._port, self._username, self._password,
+                                  wsdl_cache.WsdlCache().wsdl_dir,
+                                  transport=transport_pool.TransportPool().get_transport(self._address, self._port,
+                                                                                         timeout))
         except Exception as e:
             raise exceptions.ConnectionToCameraError(str(e))
         try:
-            media_profiles = camera.create_media_service().GetProfiles()
+            media_service = camera.create_media_service()
+        except Exception as e:
+            raise exceptions.GettingProfilesFromCameraError(str(e))
+        self._camera = camera
+        self._media_service = media_service
+        self._get_profile_token()
+
+    def _get_profile_token(self) -> None:
+        """
+        Requesting token of first media profile on IP camera
+        :exception exceptions.CameraError: Camera not initialized
+        :exception exceptions.GettingProfilesFromCameraError: Getting media profiles failed. Check username and password
+        :exception exceptions.NoMediaProfilesOnCameraError: No media profiles on camera
+        """
+        if self._media_service is None:
+            raise exceptions.CameraError
+        self._profile_token = None
+        try:
+            media_profiles = self._media_service.GetProfiles()
         except Exception as e:
             raise exceptions.GettingProfilesFromCameraError(str(e))
         if len(media_profiles) < 1:
             raise exceptions.NoMediaProfilesOnCameraError
-        self._camera = camera
+        self._profile_token = media_profiles[0].token
 
     def _get_ptz_presets_count(self) -> None:
         """
@@ -92,42 +217,145 @@ class CameraController:
         if self._camera is None:
             raise exceptions.CameraError
         self._ptz_presets_count = 0
+        self._goto_preset_request = None
         try:
-            count = self._camera.create_ptz_service().GetNodes()[0]['MaximumNumberOfPresets']
+            if self._ptz_service is None:
+                self._ptz_service = self._camera.create_ptz_service()
+            count = self._ptz_service.GetNodes()[0]['MaximumNumberOfPresets']
         except Exception as e:
             raise exceptions.GettingPresetsCountError(str(e))
         if count < 0:
             raise exceptions.IncorrectPresetsCountError
         self._ptz_presets_count = count
+        try:
+            request = self._ptz_service.create_type('GotoPreset')
+        except Exception as e:
+            raise exceptions.CameraError(str(e))
+        request.ProfileToken = self._profile_token
+        self._goto_preset_request = request
+        self._cache_time = time.monotonic()
+        self._init_fast_path()
+
+    def _init_fast_path(self) -> None:
+        """
+        Creating driver for sending PTZ commands without zeep (if fast path enabled)
+        """
+        if self._fast_ptz is not None:
+            self._fast_ptz.close()
+        self._fast_ptz = None
+        if not self._fast_path:
+            return None
+        try:
+            self._fast_ptz = ptz_fast_path.FastPtzDriver(self._ptz_service.xaddr, self._profile_token,
+                                                         self._username, self._password,
+                                                         timeout=self._camera.transport.operation_timeout or 10.0,
+                                                         time_offset=self._camera.dt_diff)
+        except exceptions.IncorrectArgsError:
+            logger.Logger().warning('Fast PTZ path not available for camera with address "%s"', self._address)
+
+    def _fast_go_to_preset(self, preset_number: int, trace: latency_tracker.MoveTrace | None = None) -> bool:
+        """
+        Moving camera to preset by fast PTZ driver (driver is closed if camera rejects request)
+        :return: Request status (False - zeep must be used)
+        :exception exceptions.CameraMoveError: Moving request failed (timeout, connection or camera error)
+        """
+        try:
+            if trace is not None:
+                trace.mark(latency_tracker.Span.REQUEST_SENT)
+            self._fast_ptz.goto_preset(preset_number)
+            if trace is not None:
+                trace.mark(latency_tracker.Span.RESPONSE_RECEIVED)
+            return True
+        except exceptions.CameraRequestRejectedError as e:
+            # Camera accepts zeep requests only
+            logger.Logger().debug('Fast PTZ request to camera with address "%s" rejected: %s', self._address, e)
+            logger.Logger().info('Fast PTZ path disabled for camera with address "%s"', self._address)
+            self._fast_ptz.close()
+            self._fast_ptz = None
+            return False
+
+    def _set_request_timeout(self, timeout: tuple | None) -> None:
+        """
+        Setting timeouts of next requests to camera and taking transport of camera host from pool (transports are
+        recreated by pool after changing its limits or removing old hosts), called with lock
+        :param timeout: Tuple of connect and read timeouts (seconds). None - timeouts of controller
+        """
+        if timeout is None:
+            timeout = self._timeout
+        if self._camera is not None:
+            transport = transport_pool.TransportPool().get_transport(self._address, self._port, timeout)
+            if transport is not self._camera.transport:
+                self._camera.transport = transport
+                with self._camera.services_lock:
+                    for service in self._camera.services.values():
+                        service.zeep_client.transport = transport
+        if self._fast_ptz is not None:
+            self._fast_ptz.timeout = timeout or 10.0
 
-    def go_to_preset(self, preset_number: int) -> bool:
+    def refresh(self, timeout: tuple | None = None) -> None:
+        """
+        Re-requesting cached profile token and presets count
+        :param timeout: Tuple of connect and read timeouts (seconds) for this call. None - timeouts of controller
+        :exception exceptions.IncorrectArgsError: Wrong timeout
+        :exception exceptions.ConnectionToCameraError: Wrong address or port of camera
+        :exception exceptions.GettingProfilesFromCameraError: Getting media profiles failed. Check username and password
+        :exception exceptions.NoMediaProfilesOnCameraError: No media profiles on camera
+        :exception exceptions.CameraError: Camera not initialized
+        :exception exceptions.GettingPresetsCountError: Request for getting count failed
+        :exception exceptions.IncorrectPresetsCountError: Incorrect answer by camera (check ONVIF data on camera)
+        """
+        if not _is_timeout(timeout):
+            raise exceptions.IncorrectArgsError
+        with self._lock:
+            if self._camera is None:
+                self._init_camera(timeout or self._timeout)
+            else:
+                self._set_request_timeout(timeout)
+                self._get_profile_token()
+            self._get_ptz_presets_count()
+
+    def go_to_preset(self, preset_number: int, trace: latency_tracker.MoveTrace | None = None,
+                     timeout: tuple | None = None) -> bool:
         """
         Moving ONVIF camera to new position
+        :param preset_number: Preset number
+        :param trace: Spans of move command (request sending and response receiving time are marked)
+        :param timeout: Tuple of connect and read timeouts (seconds) for this call. None - timeouts of controller
         :return: Request status
-        :exception exceptions.IncorrectArgsError: Wrong preset number
+        :exception exceptions.IncorrectArgsError: Wrong preset number or timeout
         :exception exceptions.CameraError: Camera not initialized
         :exception exceptions.GettingPresetsCountError: Request for getting count failed
         :exception exceptions.IncorrectPresetsCountError: Incorrect answer by camera (checking ONVIF data on camera)
+        :exception exceptions.GettingProfilesFromCameraError: Getting media profiles failed (cache refreshing)
+        :exception exceptions.NoMediaProfilesOnCameraError: No media profiles on camera (cache refreshing)
+        :exception exceptions.CameraMoveError: Moving request failed
         """
         if self._camera is None:
             raise exceptions.CameraError
-        if not isinstance(preset_number, int):
+        if not isinstance(preset_number, int) or not _is_timeout(timeout):
             raise exceptions.IncorrectArgsError
-        if self._ptz_presets_count == 0:
-            self._get_ptz_presets_count()
+        with self._lock:
+            self._set_request_timeout(timeout)
+            if self.cache_expired:
+                self.refresh(timeout)
             if self._ptz_presets_count == 0:
-                logger.Logger().info(f'For camera with address "{self._address}" presets not found!')
-                return False
-        if preset_number > self._ptz_presets_count or preset_number < 1:
-            raise exceptions.IncorrectArgsError
-        try:
-            media_service = self._camera.create_media_service()
-            ptz_service = self._camera.create_ptz_service()
-            request = ptz_service.create_type('GotoPreset')
-            request.ProfileToken = media_service.GetProfiles()[0].token
-            request.PresetToken = str(preset_number)
-            ptz_service.GotoPreset(request)
-            logger.Logger().info(f'Camera with address "{self._address}" moved to preset №{preset_number}')
-            return True
-        except Exception as e:
-            raise exceptions.CameraMoveError(str(e))
+                self._get_ptz_presets_count()
+                if self._ptz_presets_count == 0:
+                    logger.Logger().info('For camera with address "%s" presets not found!', self._address)
+                    return False
+            if preset_number > self._ptz_presets_count or preset_number < 1:
+                raise exceptions.IncorrectArgsError
+            if self._fast_ptz is not None and self._fast_go_to_preset(preset_number, trace):
+                logger.Logger().info('Camera with address "%s" moved to preset №%d', self._address, preset_number)
+                return True
+            try:
+                self._goto_preset_request.PresetToken = str(preset_number)
+                if trace is not None:
+                    trace.mark(latency_tracker.Span.REQUEST_SENT)
+                self._ptz_service.GotoPreset(self._goto_preset_request)
+                if trace is not None:
+                    trace.mark(latency_tracker.Span.RESPONSE_RECEIVED)
+            except Exception as e:
+                raise exceptions.CameraMoveError(str(e))
+        logger.Logger().info('Camera with address "%s" moved to preset №%d', self._address, preset_number)
+        return True
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+
+import concurrent.futures
+import dataclasses
+import threading
+import typing
+import time
+
+
+import exceptions
+
+
+if typing.TYPE_CHECKING:
+    # onvif and zeep are imported on first camera connection
+    import camera_controller
+
+
+@dataclasses.dataclass
+class _CameraSession:
+    password: str
+    controller: 'camera_controller.CameraController | None' = dataclasses.field(default=None)
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+
+
+class CameraPool:
+    """
+    Long-lived camera controllers, shared by all hot keys pointing at the same camera. Controller is rebuilt only
+    when password changed, fast path and timeouts are changed on working controller
+    """
+    __instance = None
+    __initialized = False
+
+    _sessions: dict | None = None
+    _lock: threading.Lock = None
+
+    @staticmethod
+    def make_key(address: str, port: int, username: str) -> tuple:
+        """
+        Build session key for camera
+        :param address: Address of IP camera
+        :param port: ONVIF port on IP camera
+        :param username: ONVIF username
+        :return: Session key
+        """
+        return address, port, username
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+    def get_controller(self, address: str, port: int, username: str, password: str,
+                       fast_path: bool = False, timeout: tuple | None = None,
+                       request_timeout: tuple | None = None) -> 'camera_controller.CameraController':
+        """
+        Getting camera controller from pool (controller created on first request, options of working controller
+        updated)
+        :param address: Address of IP camera
+        :param port: ONVIF port on IP camera
+        :param username: ONVIF username
+        :param password: ONVIF user password
+        :param fast_path: Send PTZ commands without zeep
+        :param timeout: Tuple of connect and read timeouts (seconds). None - no timeouts
+        :param request_timeout: Timeouts of requests connecting new controller (None - timeout argument used)
+        :return: Initialized camera controller
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        :exception exceptions.CameraError: Creating camera controller failed (see CameraController exceptions)
+        """
+        if not isinstance(password, str):
+            raise exceptions.IncorrectArgsError
+        key = self.make_key(address, port, username)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or session.password != password:
+                session = _CameraSession(password=password)
+                self._sessions[key] = session
+        with session.lock:
+            if session.controller is None:
+                # Importing onvif and zeep on first camera connection
+                import camera_controller
+                session.controller = camera_controller.CameraController(address, port, username, password,
+                                                                        fast_path=fast_path, timeout=timeout,
+                                                                        request_timeout=request_timeout)
+            else:
+                session.controller.fast_path = fast_path
+                session.controller.timeout = timeout
+            return session.controller
+
+    def warm_up(self, cameras: list, workers: int = 8) -> list:
+        """
+        Creating controllers for activated cameras in parallel
+        :param cameras: List of CameraData objects
+        :param workers: Maximum count of connecting threads
+        :return: List of tuples (camera data, exception or None if camera ready, connecting time in seconds)
+        """
+        unique_cameras = dict()
+        for camera in cameras:
+            if camera.activated:
+                unique_cameras.setdefault(self.make_key(camera.address, camera.port, camera.username), camera)
+        if len(unique_cameras) == 0:
+            return list()
+
+        def connect(camera) -> tuple:
+            start_time = time.perf_counter()
+            try:
+                self.get_controller(camera.address, camera.port, camera.username, camera.password,
+                                    camera.fast_path, (camera.connect_timeout, camera.read_timeout))
+            except (exceptions.CameraError, exceptions.IncorrectArgsError) as e:
+                return camera, e, time.perf_counter() - start_time
+            return camera, None, time.perf_counter() - start_time
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(unique_cameras)),
+                                                   thread_name_prefix='camera-warm-up') as executor:
+            return list(executor.map(connect, unique_cameras.values()))
+
+    def evict(self, address: str, port: int, username: str) -> bool:
+        """
+        Removing camera session from pool (controller will be rebuilt on next request)
+        :param address: Address of IP camera
+        :param port: ONVIF port on IP camera
+        :param username: ONVIF username
+        :return: True - session removed. False - session not found
+        """
+        with self._lock:
+            return self._sessions.pop(self.make_key(address, port, username), None) is not None
+
+    def sync(self, cameras: list) -> None:
+        """
+        Removing sessions of cameras missing in cameras list or with changed password, updating fast path and
+        timeouts of other controllers
+        :param cameras: List of CameraData objects
+        """
+        if not isinstance(cameras, list):
+            return None
+        options = dict()
+        for camera in cameras:
+            key = self.make_key(camera.address, camera.port, camera.username)
+            options[key] = (camera.password, camera.fast_path, (camera.connect_timeout, camera.read_timeout))
+        controllers = list()
+        with self._lock:
+            for key in list(self._sessions.keys()):
+                session = self._sessions[key]
+                camera_options = options.get(key)
+                if camera_options is None or camera_options[0] != session.password:
+                    del self._sessions[key]
+                elif session.controller is not None:
+                    controllers.append((session.controller, camera_options))
+        for controller, camera_options in controllers:
+            controller.fast_path = camera_options[1]
+            controller.timeout = camera_options[2]
+
+    def clear(self) -> None:
+        """
+        Removing all sessions from pool
+        """
+        with self._lock:
+            self._sessions.clear()
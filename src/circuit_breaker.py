@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import enum
+import time
+
+
+import exceptions
+import logger
+
+
+class CircuitState(enum.Enum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitBreaker:
+    """
+    Rejecting commands for camera after repeated failures. After reset timeout one probe command is allowed
+    (half-open state): success closes circuit, failure opens it again
+    """
+    _name: str = ''
+    _failure_threshold: int = 3
+    _reset_timeout: float = 30.0
+    _state: CircuitState = CircuitState.CLOSED
+    _failures: int = 0
+    _opened_time: float = 0.0
+    _probe_running: bool = False
+    _lock: threading.Lock = None
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_time >= self._reset_timeout:
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """
+        :param name: Circuit name for log messages
+        :param failure_threshold: Count of consecutive failures opening circuit
+        :param reset_timeout: Time (seconds) before half-open probe
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not (isinstance(name, str) and isinstance(failure_threshold, int) and
+                isinstance(reset_timeout, (int, float))):
+            raise exceptions.IncorrectArgsError
+        if failure_threshold < 1 or reset_timeout < 0:
+            raise exceptions.IncorrectArgsError
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Checking that command may be executed
+        :exception exceptions.CircuitOpenError: Circuit open (or half-open probe already running)
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return None
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_time < self._reset_timeout:
+                    raise exceptions.CircuitOpenError(f'Circuit "{self._name}" is open')
+                self._state = CircuitState.HALF_OPEN
+                self._probe_running = False
+            if self._probe_running:
+                raise exceptions.CircuitOpenError(f'Circuit "{self._name}" is half-open')
+            self._probe_running = True
+        logger.Logger().info('Circuit "%s" is half-open (probe command allowed)', self._name)
+
+    def record_success(self) -> None:
+        with self._lock:
+            old_state = self._state
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probe_running = False
+        if old_state != CircuitState.CLOSED:
+            logger.Logger().info('Circuit "%s" is closed', self._name)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.CLOSED and self._failures < self._failure_threshold:
+                return None
+            self._state = CircuitState.OPEN
+            self._opened_time = time.monotonic()
+            self._probe_running = False
+        logger.Logger().warning('Circuit "%s" is open (%d failures, next probe after %.0f s)', self._name,
+                                self._failures, self._reset_timeout)
+
+    def release(self) -> None:
+        """
+        Finishing command without result for circuit (failure not caused by camera), next probe allowed
+        """
+        with self._lock:
+            self._probe_running = False
+
+    def reset(self) -> None:
+        """
+        Closing circuit without probe
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probe_running = False
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import os
+
+
+import exceptions
+import logger
+
+
+# Time (seconds) without file changes before callback (editors may write file in several steps)
+_SETTLE_TIME: float = 0.2
+
+
+def _file_signature(file_path: str) -> tuple | None:
+    """
+    :return: Modification time, size and inode of file (None - file not found)
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ConfigWatcher:
+    """
+    Polling configuration file and calling callback after every edit (deleted file is ignored)
+    """
+    __instance = None
+    __initialized = False
+
+    _file_path: str | None = None
+    _callback = None
+    _interval: float = 1.0
+    _thread: threading.Thread | None = None
+    _stop_event: threading.Event | None = None
+
+    @property
+    def file_path(self) -> str | None:
+        return self._file_path
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._stop_event = threading.Event()
+
+    def start(self, file_path: str, callback, interval: float = 1.0) -> None:
+        """
+        Start watching thread (watching of previous file is stopped)
+        :param file_path: Configuration file path
+        :param callback: Function without arguments called from watching thread after file edit
+        :param interval: Time (seconds) between file checks
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not isinstance(file_path, str) or len(file_path) == 0 or not callable(callback) or \
+                not isinstance(interval, (int, float)) or interval <= 0:
+            raise exceptions.IncorrectArgsError
+        self.stop()
+        self._file_path = file_path
+        self._callback = callback
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._watching_loop,
+                                        args=(self._stop_event, file_path, callback, interval),
+                                        name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop watching thread (callback running now is not interrupted)
+        """
+        self._stop_event.set()
+        self._thread = None
+
+    @staticmethod
+    def _watching_loop(stop_event: threading.Event, file_path: str, callback, interval: float) -> None:
+        signature = _file_signature(file_path)
+        while not stop_event.wait(interval):
+            current = _file_signature(file_path)
+            if current == signature:
+                continue
+            while not stop_event.wait(_SETTLE_TIME):
+                settled = _file_signature(file_path)
+                if settled == current:
+                    break
+                current = settled
+            if stop_event.is_set():
+                return None
+            signature = current
+            if current is None:
+                logger.Logger().warning('Configuration file "%s" removed, current configuration kept', file_path)
+                continue
+            logger.Logger().info('Configuration file "%s" changed', file_path)
+            try:
+                callback()
+            except Exception as e:
+                logger.Logger().error('Applying changed configuration file failed (%s)', type(e).__name__)
+                logger.Logger().debug('Exception text: %s', e)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+
+import dataclasses
+import threading
+import queue
+import time
+
+
+import latency_tracker
+import exceptions
+import logger
+
+
+@dataclasses.dataclass
+class MoveResult:
+    camera: object
+    moved: bool
+    text: str
+    latency: float
+    wait_time: float
+    superseded: bool = dataclasses.field(default=False)
+    expired: bool = dataclasses.field(default=False)
+
+
+class MoveBatch:
+    """
+    Group of move commands created by one hot key
+    """
+    _size: int = 0
+    _results: list | None = None
+    _callback = None
+    _lock: threading.Lock = None
+
+    @property
+    def results(self) -> list:
+        return self._results
+
+    @property
+    def done(self) -> bool:
+        return len(self._results) >= self._size
+
+    def __init__(self, size: int, callback=None):
+        """
+        :param size: Count of commands in batch
+        :param callback: Function called with list of MoveResult objects when all commands executed
+        """
+        self._size = size
+        self._results = list()
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def add_result(self, result: MoveResult) -> None:
+        with self._lock:
+            self._results.append(result)
+            if len(self._results) != self._size:
+                return None
+            results = list(self._results)
+        if callable(self._callback):
+            try:
+                self._callback(results)
+            except Exception as e:
+                logger.Logger().error('Move batch callback failed! (%s)', e)
+
+
+@dataclasses.dataclass
+class MoveCommand:
+    camera: object
+    batch: MoveBatch
+    enqueue_time: float = dataclasses.field(default_factory=time.perf_counter)
+    deadline: float | None = dataclasses.field(default=None)
+    trace: latency_tracker.MoveTrace | None = dataclasses.field(default=None)
+
+
+class Dispatcher:
+    """
+    Executing move commands in worker threads (keyboard listener thread only enqueues commands).
+    Every camera has one command slot: newer command replaces not yet executed command for the same camera
+    """
+    _handler = None
+    _key = None
+    _deadline = None
+    _log_fields = None
+    _workers_count: int = 1
+    _workers: list | None = None
+    _queue: queue.Queue | None = None
+    _slots: dict | None = None
+    _busy: set | None = None
+    _slots_lock: threading.Lock = None
+    _stats_lock: threading.Lock = None
+    _last_wait_time: float = 0.0
+    _max_wait_time: float = 0.0
+    _executed_count: int = 0
+    _superseded_count: int = 0
+    _expired_count: int = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._slots)
+
+    @property
+    def last_wait_time(self) -> float:
+        return self._last_wait_time
+
+    @property
+    def max_wait_time(self) -> float:
+        return self._max_wait_time
+
+    @property
+    def executed_count(self) -> int:
+        return self._executed_count
+
+    @property
+    def superseded_count(self) -> int:
+        return self._superseded_count
+
+    @property
+    def expired_count(self) -> int:
+        return self._expired_count
+
+    @property
+    def running(self) -> bool:
+        return len(self._workers) > 0
+
+    def __init__(self, handler, workers: int = 8, key=None, deadline=None, log_fields=None, autostart: bool = True):
+        """
+        :param handler: Function executing MoveCommand. Returns moving status, status text and latency
+        :param workers: Count of worker threads
+        :param key: Function returning camera slot key from camera data (None - camera data is key)
+        :param deadline: Function returning command lifetime (seconds, 0 - unlimited) from camera data
+                         (None - commands never expire)
+        :param log_fields: Function returning dictionary of structured log fields from camera data (used in records of
+                           superseded and expired commands)
+        :param autostart: Start worker threads on initialize object
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not callable(handler) or not isinstance(workers, int) or workers < 1:
+            raise exceptions.IncorrectArgsError
+        if (key is not None and not callable(key)) or (deadline is not None and not callable(deadline)):
+            raise exceptions.IncorrectArgsError
+        if log_fields is not None and not callable(log_fields):
+            raise exceptions.IncorrectArgsError
+        self._handler = handler
+        self._key = key
+        self._deadline = deadline
+        self._log_fields = log_fields
+        self._workers_count = workers
+        self._workers = list()
+        self._queue = queue.Queue()
+        self._slots = dict()
+        self._busy = set()
+        self._slots_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        if autostart:
+            self.start()
+
+    def start(self) -> None:
+        """
+        Start worker threads
+        """
+        if self.running:
+            return None
+        for index in range(self._workers_count):
+            worker = threading.Thread(target=self._worker_loop, name=f'camera-move-{index}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, wait: bool = False) -> None:
+        """
+        Stop worker threads after executing already enqueued commands
+        :param wait: Waiting for worker threads to finish
+        """
+        workers = self._workers
+        self._workers = list()
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def submit(self, cameras: list, callback=None, trace: latency_tracker.MoveTrace | None = None) -> MoveBatch:
+        """
+        Enqueue move commands for cameras
+        :param cameras: List of cameras data
+        :param callback: Function called with list of MoveResult objects when all commands executed
+        :param trace: Spans of hot key (copied to every command)
+        :return: Batch of enqueued commands
+        """
+        batch = MoveBatch(len(cameras), callback)
+        for camera in cameras:
+            command = MoveCommand(camera=camera, batch=batch, trace=None if trace is None else trace.copy())
+            lifetime = None if self._deadline is None else self._deadline(camera)
+            if lifetime:
+                command.deadline = command.enqueue_time + lifetime
+            key = camera if self._key is None else self._key(camera)
+            with self._slots_lock:
+                superseded_command = self._slots.get(key)
+                self._slots[key] = command
+                if superseded_command is None and key not in self._busy:
+                    self._queue.put(key)
+            if superseded_command is not None:
+                self._supersede(key, superseded_command)
+        return batch
+
+    def _supersede(self, key, command: MoveCommand) -> None:
+        with self._stats_lock:
+            self._superseded_count += 1
+        wait_time = time.perf_counter() - command.enqueue_time
+        logger.Logger().info('Move command for camera %s superseded by newer command (superseded commands: %d)', key,
+                             self._superseded_count, fields=self._get_log_fields(command, 'superseded', wait_time))
+        command.batch.add_result(MoveResult(camera=command.camera, moved=False, text='Move superseded', latency=0.0,
+                                            wait_time=wait_time, superseded=True))
+
+    def _get_log_fields(self, command: MoveCommand, outcome: str, wait_time: float) -> dict | None:
+        if self._log_fields is None or logger.Logger().json_file_path is None:
+            return None
+        fields = dict(self._log_fields(command.camera))
+        fields.update(outcome=outcome, error=None, latency_ms=None, wait_ms=round(wait_time * 1000, 3))
+        return fields
+
+    def _worker_loop(self) -> None:
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return None
+            with self._slots_lock:
+                command = self._slots.pop(key, None)
+                if command is None:
+                    continue
+                self._busy.add(key)
+            try:
+                self._execute(key, command)
+            finally:
+                with self._slots_lock:
+                    self._busy.discard(key)
+                    if key in self._slots:
+                        self._queue.put(key)
+
+    def _execute(self, key, command: MoveCommand) -> None:
+        if command.trace is not None:
+            command.trace.mark(latency_tracker.Span.COMMAND_STARTED)
+        wait_time = time.perf_counter() - command.enqueue_time
+        with self._stats_lock:
+            self._last_wait_time = wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+        if logger.Logger().is_enabled_for(logger.LogLevel.DEBUG):
+            logger.Logger().debug('Move command waited %.0f ms in queue (queue depth %d)', wait_time * 1000,
+                                  self.queue_depth)
+        if command.deadline is not None and time.perf_counter() >= command.deadline:
+            with self._stats_lock:
+                self._expired_count += 1
+            logger.Logger().warning('Move command for camera %s expired in queue (%.0f ms)', key, wait_time * 1000,
+                                    fields=self._get_log_fields(command, 'expired', wait_time))
+            command.batch.add_result(MoveResult(camera=command.camera, moved=False,
+                                                text='Camera not moved! Command deadline exceeded', latency=0.0,
+                                                wait_time=wait_time, expired=True))
+            return None
+        try:
+            moved, text, latency = self._handler(command)
+        except Exception as e:
+            logger.Logger().error('Executing move command failed! (%s)', e)
+            moved, text, latency = False, 'Camera not moved!', time.perf_counter() - command.enqueue_time - wait_time
+        with self._stats_lock:
+            self._executed_count += 1
+        command.batch.add_result(MoveResult(camera=command.camera, moved=moved, text=text, latency=latency,
+                                            wait_time=wait_time))
@@ -13,6 +13,10 @@ class ConnectionToCameraError(CameraError):
     pass
 
 
+class CameraOfflineError(ConnectionToCameraError):
+    pass
+
+
 class GettingProfilesFromCameraError(CameraError):
     pass
 
@@ -33,6 +37,18 @@ class CameraMoveError(CameraError):
     pass
 
 
+class CameraRequestRejectedError(CameraMoveError):
+    pass
+
+
+class CircuitOpenError(CameraError):
+    pass
+
+
+class DeadlineExceededError(CameraError):
+    pass
+
+
 class IncorrectData(Exception):
     pass
 
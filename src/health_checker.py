@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+
+import concurrent.futures
+import threading
+import random
+import socket
+import enum
+import time
+
+
+import transport_pool
+import exceptions
+import logger
+
+
+class CameraState(enum.Enum):
+    UNKNOWN = 0
+    ONLINE = 1
+    OFFLINE = 2
+
+
+class HealthChecker:
+    """
+    Periodic (jittered) TCP probes of cameras with online/offline states table
+    """
+    __instance = None
+    __initialized = False
+
+    _MAX_PROBING_THREADS: int = 8
+
+    _interval: float = 30.0
+    _jitter: float = 0.2
+    _probe_timeout: float = 2.0
+    _states: dict | None = None
+    _next_checks: dict | None = None
+    _state_callback = None
+    _thread: threading.Thread | None = None
+    _stop_event: threading.Event | None = None
+    _wake_event: threading.Event | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value > 0:
+            self._interval = value
+
+    @property
+    def probe_timeout(self) -> float:
+        return self._probe_timeout
+
+    @probe_timeout.setter
+    def probe_timeout(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value > 0:
+            self._probe_timeout = value
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._states = dict()
+        self._next_checks = dict()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def set_state_callback(self, callback) -> None:
+        """
+        :param callback: Function called with address, port and new CameraState when camera state changed
+        """
+        if callback is None or callable(callback):
+            self._state_callback = callback
+
+    def set_cameras(self, cameras: list) -> None:
+        """
+        Updating list of checked cameras (states of removed cameras are forgotten)
+        :param cameras: List of CameraData objects
+        """
+        if not isinstance(cameras, list):
+            return None
+        keys = {(camera.address, camera.port) for camera in cameras if camera.activated}
+        with self._lock:
+            for key in list(self._states.keys()):
+                if key not in keys:
+                    del self._states[key]
+                    del self._next_checks[key]
+            for key in keys:
+                if key not in self._states:
+                    self._states[key] = CameraState.UNKNOWN
+                    self._next_checks[key] = 0.0
+        self._wake_event.set()
+
+    def get_state(self, address: str, port: int) -> CameraState:
+        with self._lock:
+            return self._states.get((address, port), CameraState.UNKNOWN)
+
+    def is_offline(self, address: str, port: int) -> bool:
+        """
+        Camera marked offline (always False when health checking is stopped)
+        """
+        return self.running and self.get_state(address, port) == CameraState.OFFLINE
+
+    def check_now(self, address: str, port: int) -> None:
+        """
+        Scheduling camera probe without waiting for check interval
+        """
+        with self._lock:
+            if (address, port) not in self._next_checks:
+                return None
+            self._next_checks[(address, port)] = 0.0
+        self._wake_event.set()
+
+    def report_success(self, address: str, port: int) -> None:
+        """
+        Marking camera online after successful request
+        """
+        if not self.running:
+            return None
+        self._set_state(address, port, CameraState.ONLINE)
+
+    def report_failure(self, address: str, port: int) -> None:
+        """
+        Marking camera offline after failed connection (camera will be probed again soon)
+        """
+        if not self.running:
+            return None
+        self._set_state(address, port, CameraState.OFFLINE)
+        self.check_now(address, port)
+
+    def start(self) -> None:
+        """
+        Start health checking thread
+        """
+        if self.running:
+            return None
+        # New event for every thread: thread stopped before is not restarted by clearing its event
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._checking_loop, args=(self._stop_event,), name='camera-health',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop health checking thread
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread = None
+
+    def probe(self, address: str, port: int) -> bool:
+        """
+        Checking TCP connection to camera
+        :return: True - camera accepts connections
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type
+        """
+        if not isinstance(address, str) or not isinstance(port, int):
+            raise exceptions.IncorrectArgsError
+        try:
+            with socket.create_connection((transport_pool.DnsCache().resolve(address), port),
+                                          timeout=self._probe_timeout):
+                return True
+        except OSError:
+            return False
+
+    def _set_state(self, address: str, port: int, state: CameraState) -> None:
+        with self._lock:
+            if (address, port) not in self._states:
+                return None
+            old_state = self._states[(address, port)]
+            self._states[(address, port)] = state
+        if old_state == state or (old_state == CameraState.UNKNOWN and state == CameraState.ONLINE):
+            return None
+        if state == CameraState.OFFLINE:
+            logger.Logger().warning('Camera with address "%s" is offline', address)
+        else:
+            logger.Logger().info('Camera with address "%s" is online', address)
+        if callable(self._state_callback):
+            try:
+                self._state_callback(address, port, state)
+            except Exception as e:
+                logger.Logger().error('Camera state callback failed! (%s)', e)
+
+    def _next_check_time(self) -> float:
+        return time.monotonic() + self._interval * random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+
+    def _checking_loop(self, stop_event: threading.Event) -> None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._MAX_PROBING_THREADS,
+                                                   thread_name_prefix='camera-probe') as executor:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                with self._lock:
+                    due_cameras = [key for key, check_time in self._next_checks.items() if check_time <= now]
+                    for key in due_cameras:
+                        self._next_checks[key] = self._next_check_time()
+                    wait_time = min(self._next_checks.values(), default=now + self._interval) - now
+                probes = [executor.submit(self.probe, address, port) for address, port in due_cameras]
+                for (address, port), probe in zip(due_cameras, probes):
+                    self._set_state(address, port, CameraState.ONLINE if probe.result() else CameraState.OFFLINE)
+                if len(due_cameras) > 0:
+                    continue
+                self._wake_event.wait(max(wait_time, 0.0))
+                self._wake_event.clear()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import time
+
+
+import startup_profiler
+import exceptions
+import metrics
+import logger
+
+
+class KeyboardBus:
+    """
+    One keyboard listener for whole program publishing key texts to subscribers (hot keys matcher, hot keys
+    recorder). Listener is started by first subscription and kept working while subscribers attach and detach
+    """
+    __instance = None
+    __initialized = False
+
+    _listener = None
+    _key_to_text = None
+    _subscribers: tuple = tuple()
+    _next_token: int = 1
+    _lock: threading.Lock = None
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None and self._listener.is_alive()
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscribers)
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._lock = threading.Lock()
+
+    def subscribe(self, on_press, on_release) -> int:
+        """
+        Attaching subscriber (keyboard listener started if not working)
+        :param on_press: Function called with key text and time.perf_counter value of event on key press
+        :param on_release: Function called with key text and time.perf_counter value of event on key release
+        :return: Subscription token
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type
+        """
+        if not callable(on_press) or not callable(on_release):
+            raise exceptions.IncorrectArgsError
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            # Subscribers tuple is replaced (not changed), listener thread reads it without lock
+            self._subscribers = self._subscribers + ((token, on_press, on_release),)
+            self._start_listener()
+        return token
+
+    def unsubscribe(self, token: int) -> bool:
+        """
+        Detaching subscriber (keyboard listener keeps working)
+        :param token: Subscription token
+        :return: True - subscriber detached. False - subscriber not found
+        """
+        with self._lock:
+            subscribers = tuple(subscriber for subscriber in self._subscribers if subscriber[0] != token)
+            if len(subscribers) == len(self._subscribers):
+                return False
+            self._subscribers = subscribers
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop keyboard listener and detach all subscribers (on program exit)
+        """
+        with self._lock:
+            self._subscribers = tuple()
+            if self._listener is not None and self._listener.is_alive():
+                self._listener.stop()
+            self._listener = None
+
+    def _start_listener(self) -> None:
+        """
+        Starting keyboard listener (called with lock)
+        """
+        if self._listener is not None:
+            if self._listener.is_alive():
+                return None
+            logger.Logger().warning('Keyboard listener stopped unexpectedly, starting new listener')
+            metrics.Metrics().inc('movemycam_listener_restarts_total')
+        # Imported here: keyboard_sniffer imports this module
+        import keyboard_sniffer
+        self._key_to_text = keyboard_sniffer.KeyboardSniffer.key_to_text
+        self._listener = keyboard_sniffer.import_pynput().Listener(on_press=self._on_press,
+                                                                   on_release=self._on_release)
+        self._listener.daemon = True
+        self._listener.start()
+        startup_profiler.StartupProfiler().mark('listener_started')
+
+    def _on_press(self, key) -> None:
+        self._publish(key, 1)
+
+    def _on_release(self, key) -> None:
+        self._publish(key, 2)
+
+    def _publish(self, key, handler_index: int) -> None:
+        """
+        Sending key text to subscribers (exception of subscriber does not stop listener)
+        :param key: Pynput key object
+        :param handler_index: Index of handler in subscriber tuple (1 - press, 2 - release)
+        """
+        timestamp = time.perf_counter()
+        subscribers = self._subscribers
+        if len(subscribers) == 0:
+            return None
+        key_text = self._key_to_text(key)
+        if key_text is None:
+            return None
+        for subscriber in subscribers:
+            try:
+                subscriber[handler_index](key_text, timestamp)
+            except Exception as e:
+                logger.Logger().error('Keyboard event handler failed (%s)', type(e).__name__)
+                logger.Logger().debug('Exception text: %s', e)
@@ -2,94 +2,91 @@
 
 
 from string import printable as simbols
+import itertools
+import threading
 import platform
+import time
+import copy
 
 
-try:
-    import pynput
-    from pynput.keyboard import Key as PynputKey
-except ModuleNotFoundError:
-    print('Module pynput not found! Please install required modules from file "requirements.txt"')
-    exit(1)
-except Exception as exc:
-    print(f'Import module pynput failed ({exc})!')
-    exit(1)
-try:
-    import pystray
-except ModuleNotFoundError:
-    print('Module pystray not found! Please install required modules from file "requirements.txt"')
-    exit(1)
-except Exception as exc:
-    print(f'Import module pynput failed ({exc})!')
-    exit(1)
-
-
-import camera_controller
+import startup_profiler
+import circuit_breaker
+import latency_tracker
+import health_checker
+import keyboard_bus
+import config_watcher
+import camera_pool
+import dispatcher
 import exceptions
 import settings
+import metrics
 import logger
 
 
+# Maximum count of pressed keys for matching hot keys by lookup of every keys subset (table scanned for more keys)
+_MAX_LOOKUP_KEYS: int = 5
+
+# Attribute of pynput.keyboard.Key, key text
 _KEYS = (
-    (PynputKey.alt, 'ALT'),
-    (PynputKey.alt_r, 'ALT R'),
-    (PynputKey.alt_l, 'ALT L'),
-    (PynputKey.alt_gr, 'ALT GR'),
-    (PynputKey.backspace, 'BACKSPACE'),
-    (PynputKey.caps_lock, 'CAPS LOCK'),
-    (PynputKey.cmd, 'CMD'),
-    (PynputKey.cmd_l, 'CMD L'),
-    (PynputKey.cmd_r, 'CMD R'),
-    (PynputKey.delete, 'DEL'),
-    (PynputKey.down, 'DOWN'),
-    (PynputKey.end, 'END'),
-    (PynputKey.enter, 'ENTER'),
-    (PynputKey.esc, 'ESC'),
-    (PynputKey.f1, 'F1'),
-    (PynputKey.f2, 'F2'),
-    (PynputKey.f3, 'F3'),
-    (PynputKey.f4, 'F4'),
-    (PynputKey.f5, 'F5'),
-    (PynputKey.f6, 'F6'),
-    (PynputKey.f7, 'F7'),
-    (PynputKey.f8, 'F8'),
-    (PynputKey.f9, 'F9'),
-    (PynputKey.f10, 'F10'),
-    (PynputKey.f11, 'F11'),
-    (PynputKey.f12, 'F12'),
-    (PynputKey.f13, 'F13'),
-    (PynputKey.f14, 'F14'),
-    (PynputKey.f15, 'F15'),
-    (PynputKey.f16, 'F16'),
-    (PynputKey.f17, 'F17'),
-    (PynputKey.f18, 'F18'),
-    (PynputKey.f19, 'F19'),
-    (PynputKey.f20, 'F20'),
-    (PynputKey.home, 'HOME'),
-    (PynputKey.page_down, 'PAGE DOWN'),
-    (PynputKey.page_up, 'PAGE UP'),
-    (PynputKey.right, 'RIGHT'),
-    (PynputKey.shift, 'SHIFT'),
-    (PynputKey.shift_l, 'SHIFT L'),
-    (PynputKey.shift_r, 'SHIFT R'),
-    (PynputKey.space, 'SPACE'),
-    (PynputKey.tab, 'TAB'),
-    (PynputKey.up, 'UP'),
-    (PynputKey.media_play_pause, 'PLAY/PAUSE'),
-    (PynputKey.media_volume_mute, 'MUTE'),
-    (PynputKey.media_volume_down, 'VOL DOWN'),
-    (PynputKey.media_volume_up, 'VOL UP'),
-    (PynputKey.media_previous, 'PRE MEDIA'),
-    (PynputKey.media_next, 'NEXT MEDIA'),
-    (PynputKey.insert, 'INSERT'),
-    (PynputKey.menu, 'MENU'),
-    (PynputKey.num_lock, 'NUM LOCK'),
-    (PynputKey.pause, 'PAUSE'),
-    (PynputKey.scroll_lock, 'SCROLL LOCK'),
-    (PynputKey.ctrl, 'CTRL'),
-    (PynputKey.ctrl_l, 'CTRL L'),
-    (PynputKey.ctrl_r, 'CTRL R'),
-    (PynputKey.left, 'LEFT'),
+    ('alt', 'ALT'),
+    ('alt_r', 'ALT R'),
+    ('alt_l', 'ALT L'),
+    ('alt_gr', 'ALT GR'),
+    ('backspace', 'BACKSPACE'),
+    ('caps_lock', 'CAPS LOCK'),
+    ('cmd', 'CMD'),
+    ('cmd_l', 'CMD L'),
+    ('cmd_r', 'CMD R'),
+    ('delete', 'DEL'),
+    ('down', 'DOWN'),
+    ('end', 'END'),
+    ('enter', 'ENTER'),
+    ('esc', 'ESC'),
+    ('f1', 'F1'),
+    ('f2', 'F2'),
+    ('f3', 'F3'),
+    ('f4', 'F4'),
+    ('f5', 'F5'),
+    ('f6', 'F6'),
+    ('f7', 'F7'),
+    ('f8', 'F8'),
+    ('f9', 'F9'),
+    ('f10', 'F10'),
+    ('f11', 'F11'),
+    ('f12', 'F12'),
+    ('f13', 'F13'),
+    ('f14', 'F14'),
+    ('f15', 'F15'),
+    ('f16', 'F16'),
+    ('f17', 'F17'),
+    ('f18', 'F18'),
+    ('f19', 'F19'),
+    ('f20', 'F20'),
+    ('home', 'HOME'),
+    ('page_down', 'PAGE DOWN'),
+    ('page_up', 'PAGE UP'),
+    ('right', 'RIGHT'),
+    ('shift', 'SHIFT'),
+    ('shift_l', 'SHIFT L'),
+    ('shift_r', 'SHIFT R'),
+    ('space', 'SPACE'),
+    ('tab', 'TAB'),
+    ('up', 'UP'),
+    ('media_play_pause', 'PLAY/PAUSE'),
+    ('media_volume_mute', 'MUTE'),
+    ('media_volume_down', 'VOL DOWN'),
+    ('media_volume_up', 'VOL UP'),
+    ('media_previous', 'PRE MEDIA'),
+    ('media_next', 'NEXT MEDIA'),
+    ('insert', 'INSERT'),
+    ('menu', 'MENU'),
+    ('num_lock', 'NUM LOCK'),
+    ('pause', 'PAUSE'),
+    ('scroll_lock', 'SCROLL LOCK'),
+    ('ctrl', 'CTRL'),
+    ('ctrl_l', 'CTRL L'),
+    ('ctrl_r', 'CTRL R'),
+    ('left', 'LEFT'),
 )
 
 
@@ -107,11 +104,116 @@ _WINDOWS_KEYS = (
 )
 
 
+# Exception type, log reason, notification text, evict camera session (first matched type used)
+_MOVE_ERRORS = (
+    (exceptions.IncorrectArgsError, 'wrong data', 'Camera not moved!', False),
+    (exceptions.CameraOfflineError, 'camera offline', 'Camera not moved! Camera offline', False),
+    (exceptions.CircuitOpenError, 'too many failures, commands rejected', 'Camera not moved! Too many failures',
+     False),
+    (exceptions.DeadlineExceededError, 'command deadline exceeded', 'Camera not moved! Command deadline exceeded',
+     False),
+    (exceptions.CameraMoveError, 'move request failed', 'Camera not moved! Move request failed', False),
+    (exceptions.ConnectionToCameraError, 'connection failed', 'Camera not moved! Connection failed', True),
+    (exceptions.GettingProfilesFromCameraError, 'wrong username/password', 'Camera not moved! Wrong username/password',
+     True),
+    (exceptions.NoMediaProfilesOnCameraError, 'no media profiles', 'Camera not moved! No media profiles', True),
+    (exceptions.IncorrectPresetsCountError, 'incorrect camera answer', 'Camera not moved! Incorrect answer', True),
+    (exceptions.GettingPresetsCountError, 'request preset count failed',
+     'Camera not moved! Request preset count failed', True),
+    (exceptions.CameraError, 'camera not initialized', 'Camera not initialized!', True),
+)
+
+
+_KEYS_NAMES = frozenset(text for _, text in _KEYS)
+_WINDOWS_KEYS_TEXT = {vk: text for vk, text in _WINDOWS_KEYS}
+_WINDOWS_KEYS_NAMES = frozenset(_WINDOWS_KEYS_TEXT.values())
+
+# Filled on pynput import
+_KEYS_TEXT = dict()
+_pynput_keyboard = None
+_pynput_lock = threading.Lock()
+
+
+def import_pynput():
+    """
+    Importing pynput on demand (keyboard hooks are not needed before sniffer start or hot keys recording)
+    :return: Module pynput.keyboard
+    """
+    global _pynput_keyboard
+    with _pynput_lock:
+        if _pynput_keyboard is not None:
+            return _pynput_keyboard
+        try:
+            import pynput.keyboard
+        except ModuleNotFoundError:
+            print('Module pynput not found! Please install required modules from file "requirements.txt"')
+            exit(1)
+        except Exception as e:
+            print(f'Import module pynput failed ({e})!')
+            exit(1)
+        _KEYS_TEXT.update({getattr(pynput.keyboard.Key, name): text for name, text in _KEYS})
+        _pynput_keyboard = pynput.keyboard
+        return _pynput_keyboard
+
+
 class KeyboardSniffer:
+    _MAX_MOVING_THREADS: int = 8
+
     _config: settings.Settings = None
-    _tray_icon: pystray.Icon | None = None
-    _keyboard_listener: pynput.keyboard.Listener | None = None
+    _dispatcher: dispatcher.Dispatcher | None = None
+    _tray_icon = None
+    _subscription: int | None = None
     _key_pressed: set | None = None
+    _bindings: dict | None = None
+    _breakers: dict | None = None
+    _applied_data: settings.SettingsData | None = None
+    _reload_lock: threading.Lock = None
+
+    @staticmethod
+    def build_bindings(cameras: list) -> dict:
+        """
+        Building hot keys table for activated cameras
+        :param cameras: List of CameraData objects
+        :return: Dictionary {frozenset of hot keys texts: tuple of cameras data}
+        """
+        bindings = dict()
+        if not isinstance(cameras, list):
+            return bindings
+        for camera in cameras:
+            if not camera.activated or len(camera.hot_keys) == 0:
+                continue
+            chord = frozenset(hot_key.upper() for hot_key in camera.hot_keys)
+            bindings[chord] = bindings.get(chord, tuple()) + (camera,)
+        return bindings
+
+    @staticmethod
+    def match_bindings(bindings: dict, pressed_keys) -> list:
+        """
+        Finding cameras which hot keys are all pressed (other pressed keys are ignored)
+        :param bindings: Hot keys table built by build_bindings
+        :param pressed_keys: Texts of pressed keys
+        :return: List of cameras data (sorted by camera number if several chords matched)
+        """
+        pressed_keys = frozenset(pressed_keys)
+        if len(pressed_keys) <= _MAX_LOOKUP_KEYS:
+            chords = (frozenset(keys) for size in range(1, len(pressed_keys) + 1)
+                      for keys in itertools.combinations(pressed_keys, size))
+            matched = [bindings[chord] for chord in chords if chord in bindings]
+        else:
+            matched = [cameras for chord, cameras in bindings.items() if chord <= pressed_keys]
+        if len(matched) == 1:
+            return list(matched[0])
+        return sorted((camera for cameras in matched for camera in cameras), key=lambda camera: camera.number)
+
+    @staticmethod
+    def move_log_fields(camera) -> dict:
+        """
+        Structured log fields of camera move (JSON lines log)
+        :param camera: CameraData object
+        :return: Dictionary with camera address, port, preset and hot keys chord
+        """
+        return {'address': camera.address, 'port': camera.port, 'preset': camera.preset,
+                'chord': [hot_key.upper() for hot_key in camera.hot_keys]}
 
     @staticmethod
     def key_text_exist(key_text: str) -> bool:
@@ -122,35 +224,30 @@ class KeyboardSniffer:
         if not isinstance(key_text, str):
             return False
         key_text = key_text.upper()
-        for k in _KEYS:
-            if k[1] == key_text:
-                return True
-        if platform.system() == 'Windows':
-            for k in _WINDOWS_KEYS:
-                if k[1] == key_text:
-                    return True
+        if key_text in _KEYS_NAMES:
+            return True
+        if platform.system() == 'Windows' and key_text in _WINDOWS_KEYS_NAMES:
+            return True
         if key_text in simbols and len(key_text) == 1:
             return True
         return False
 
     @staticmethod
-    def key_to_text(key: pynput.keyboard.Key) -> str | None:
+    def key_to_text(key) -> str | None:
         """
         Gey key text from pynput keyboard key object
-        :param key: Pynput key object
+        :param key: Pynput key object (pynput.keyboard.Key or pynput.keyboard.KeyCode)
         :return: Key text or None if key text not found
         """
         try:
             return key.char.upper()
         except AttributeError:
-            for i in _KEYS:
-                if key == i[0]:
-                    return i[1]
-            if hasattr(key, 'vk'):
-                for i in _WINDOWS_KEYS:
-                    if key.vk == i[0]:
-                        return i[1]
-            return None
+            if _pynput_keyboard is None:
+                import_pynput()
+            key_text = _KEYS_TEXT.get(key)
+            if key_text is None and hasattr(key, 'vk'):
+                key_text = _WINDOWS_KEYS_TEXT.get(key.vk)
+            return key_text
 
     @property
     def ready(self) -> bool:
@@ -168,6 +265,26 @@ class KeyboardSniffer:
         """
         self._config = settings.Settings()
         self._key_pressed = set()
+        self._bindings = self.build_bindings(self._config.data.cameras)
+        self._breakers = dict()
+        # Nothing applied yet: first configuration load applies all cameras
+        self._applied_data = settings.SettingsData()
+        self._reload_lock = threading.Lock()
+        health_checker.HealthChecker().set_state_callback(self._on_camera_state_changed)
+        self._dispatcher = dispatcher.Dispatcher(self._move_camera, self._MAX_MOVING_THREADS,
+                                                 key=lambda c: camera_pool.CameraPool.make_key(c.address, c.port,
+                                                                                               c.username),
+                                                 deadline=lambda c: c.deadline, log_fields=self.move_log_fields)
+        metrics.Metrics().register('movemycam_queue_depth', 'gauge', 'Cameras with pending move commands',
+                                   lambda: self._dispatcher.queue_depth)
+        metrics.Metrics().register('movemycam_moves_superseded_total', 'counter',
+                                   'Move commands replaced by newer commands before execution',
+                                   lambda: self._dispatcher.superseded_count)
+        metrics.Metrics().register('movemycam_moves_expired_total', 'counter',
+                                   'Move commands expired in queue', lambda: self._dispatcher.expired_count)
+        metrics.Metrics().register('movemycam_log_records_dropped_total', 'counter',
+                                   'Log records dropped because log writer queue was full',
+                                   lambda: logger.Logger().dropped_count)
         if autostart:
             self.start()
 
@@ -179,137 +296,344 @@ class KeyboardSniffer:
         if not self.ready:
             return False
         self.load_configuration()
-        if isinstance(self._keyboard_listener, pynput.keyboard.Listener):
-            self._keyboard_listener.stop()
-            self._keyboard_listener = None
-        self._key_pressed = set()
-        self._keyboard_listener = pynput.keyboard.Listener(on_press=self._key_press, on_release=self._key_release)
-        self._keyboard_listener.daemon = True
-        self._keyboard_listener.start()
-        return self._keyboard_listener.is_alive()
+        if self._subscription is None:
+            self._key_pressed = set()
+            self._subscription = keyboard_bus.KeyboardBus().subscribe(self._key_press, self._key_release)
+        threading.Thread(target=self._warm_up, name='camera-warm-up', daemon=True).start()
+        if self._config.data.health_check_interval > 0:
+            health_checker.HealthChecker().start()
+        latency_tracker.LatencyTracker().start_reporting(self._config.data.latency_summary_interval)
+        self._start_config_watcher()
+        return keyboard_bus.KeyboardBus().running
 
     def stop(self) -> None:
         """
         Stop keyboard sniffer
         """
-        if self._keyboard_listener is None:
+        config_watcher.ConfigWatcher().stop()
+        health_checker.HealthChecker().stop()
+        latency_tracker.LatencyTracker().stop_reporting()
+        if self._subscription is None:
             return None
-        if self._keyboard_listener.is_alive():
-            self._keyboard_listener.stop()
-        self._keyboard_listener = None
+        keyboard_bus.KeyboardBus().unsubscribe(self._subscription)
+        self._subscription = None
         self._key_pressed.clear()
 
+    @property
+    def running(self) -> bool:
+        return self._subscription is not None
+
     def load_configuration(self) -> bool:
         """
-        (Re-) loading data from configuration file
+        (Re-) loading data from configuration file. Only changes are applied (sessions of changed cameras, hot keys
+        table, circuit breakers and health checks), keyboard listener keeps working
         :return: Data update status
         """
-        before_worked = False
-        if self._keyboard_listener is not None:
-            before_worked = self._keyboard_listener.is_alive()
-            if before_worked:
-                self._keyboard_listener.stop()
+        with self._reload_lock:
+            loaded = self._load_settings()
+            if not isinstance(self._config.data.cameras, list):
+                return False
+            data = self._config.data
+            changes = self._applied_data.diff(data)
+            if not changes.empty:
+                self._apply_configuration(data, changes)
+                self._applied_data = copy.deepcopy(data)
+            return loaded
+
+    def _load_settings(self) -> bool:
+        """
+        Reading configuration file (current settings are kept if reading failed)
+        :return: Reading status
+        """
         try:
-            if not self._config.load():
-                logger.Logger().error('Configuration file not loaded (keyboard sniffer)!')
+            if self._config.load():
+                metrics.Metrics().inc('movemycam_config_reloads_total', result='ok')
+                return True
+            metrics.Metrics().inc('movemycam_config_reloads_total', result='failed')
+            logger.Logger().error('Configuration file not loaded (keyboard sniffer)!')
         except exceptions.IncorrectArgsError:
+            metrics.Metrics().inc('movemycam_config_reloads_total', result='failed')
             logger.Logger().error('Wrong camera data type (waiting dictionary, keyboard sniffer)!')
-            return False
         except exceptions.IncorrectData as e:
+            metrics.Metrics().inc('movemycam_config_reloads_total', result='failed')
             logger.Logger().error('Not found or wrong required parameter in camera data (keyboard sniffer)!')
             logger.Logger().debug(str(e))
-            return False
         except ValueError:
+            metrics.Metrics().inc('movemycam_config_reloads_total', result='failed')
             logger.Logger().error('Wrong log level value (keyboard sniffer)!')
-            return False
-        if not isinstance(self._config.data.cameras, list):
-            return False
-        if before_worked:
-            self._keyboard_listener = pynput.keyboard.Listener(on_press=self._key_press, on_release=self._key_release)
-            self._keyboard_listener.daemon = True
-            self._keyboard_listener.start()
-        return True
+        return False
+
+    def _apply_configuration(self, data: settings.SettingsData, changes: settings.SettingsDiff) -> None:
+        """
+        Applying settings changes to running sniffer
+        :param data: New settings
+        :param changes: Difference between applied and new settings
+        """
+        if changes.cameras_changed:
+            # Sessions are evicted only for removed cameras and cameras with changed connection options
+            camera_pool.CameraPool().sync(data.cameras)
+            # Key release handler reads table once per event, new table is swapped by one assignment
+            self._bindings = self.build_bindings(data.cameras)
+            health_checker.HealthChecker().set_cameras(data.cameras)
+        if 'circuit_failures' in changes.options or 'circuit_reset_timeout' in changes.options:
+            self._breakers = dict()
+        elif len(changes.removed) > 0 or len(changes.changed) > 0:
+            breakers = dict(self._breakers)
+            for camera in changes.removed + [old for old, _ in changes.changed]:
+                breakers.pop(camera_pool.CameraPool.make_key(camera.address, camera.port, camera.username), None)
+            self._breakers = breakers
+        health_checker.HealthChecker().interval = data.health_check_interval
+        if self.running:
+            self._apply_running_options(data, changes)
+        logger.Logger().info('Configuration applied (cameras added: %d, removed: %d, changed: %d, options: %s)',
+                             len(changes.added), len(changes.removed), len(changes.changed),
+                             ', '.join(sorted(changes.options)) if len(changes.options) > 0 else 'none')
+
+    def _apply_running_options(self, data: settings.SettingsData, changes: settings.SettingsDiff) -> None:
+        """
+        Restarting background tasks with changed options and connecting to new cameras while sniffer works
+        """
+        if 'health_check_interval' in changes.options:
+            if data.health_check_interval > 0:
+                health_checker.HealthChecker().start()
+            else:
+                health_checker.HealthChecker().stop()
+        if 'latency_summary_interval' in changes.options:
+            latency_tracker.LatencyTracker().start_reporting(data.latency_summary_interval)
+        if 'config_watch_interval' in changes.options:
+            self._start_config_watcher()
+        if 'metrics_address' in changes.options or 'metrics_port' in changes.options:
+            logger.Logger().warning('Metrics endpoint options are applied after program restart')
+        cameras = changes.added + [new for _, new in changes.changed]
+        if len(cameras) > 0:
+            threading.Thread(target=camera_pool.CameraPool().warm_up, args=(cameras, self._MAX_MOVING_THREADS),
+                             name='camera-warm-up', daemon=True).start()
 
-    def set_tray_icon(self, icon: pystray.Icon) -> None:
-        if isinstance(icon, pystray.Icon):
+    def _start_config_watcher(self) -> None:
+        """
+        Watching configuration file edits (stopped if watch interval is 0)
+        """
+        interval = self._config.data.config_watch_interval
+        if interval > 0:
+            config_watcher.ConfigWatcher().start(self._config.file_path, self.load_configuration, interval)
+        else:
+            config_watcher.ConfigWatcher().stop()
+
+    def set_tray_icon(self, icon) -> None:
+        """
+        :param icon: Tray icon (pystray.Icon or any object with "notify" method). None - notifications disabled
+        """
+        if icon is None or callable(getattr(icon, 'notify', None)):
             self._tray_icon = icon
 
     def _tray_notify(self, text: str, title: str | None = None) -> None:
-        if not isinstance(self._tray_icon, pystray.Icon):
+        if self._tray_icon is None:
             return None
         self._tray_icon.notify(text, title)
 
-    def _key_press(self, key: pynput.keyboard.Key) -> None:
+    def _warm_up(self) -> None:
         """
-        Key press handler
+        Connecting to activated cameras before first hot key
+        """
+        results = camera_pool.CameraPool().warm_up(self._config.data.cameras, self._MAX_MOVING_THREADS)
+        startup_profiler.StartupProfiler().mark('hotkeys_ready')
+        if len(results) == 0:
+            return None
+        ready_count = 0
+        lines = list()
+        for camera, error, duration in results:
+            if error is None:
+                ready_count += 1
+                logger.Logger().info('Camera with address "%s" ready (%.0f ms)', camera.address, duration * 1000)
+            else:
+                logger.Logger().warning('Camera with address "%s" not ready (%s)', camera.address, type(error).__name__)
+                logger.Logger().debug('Exception text: %s', error)
+                lines.append(f'{camera.address}: not ready')
+        self._tray_notify('\n'.join(lines) if len(lines) > 0 else 'All cameras connected',
+                          f'Cameras ready: {ready_count}/{len(results)}')
+
+    def _on_camera_state_changed(self, address: str, port: int, state: health_checker.CameraState) -> None:
+        """
+        Camera health state handler (reconnecting in background when camera is online again)
+        """
+        cameras = self._config.get_cameras_by_address(address, port)
+        if state == health_checker.CameraState.OFFLINE:
+            for camera in cameras:
+                camera_pool.CameraPool().evict(camera.address, camera.port, camera.username)
+            self._tray_notify('Camera is offline', f'Camera {address}')
+        elif state == health_checker.CameraState.ONLINE:
+            threading.Thread(target=camera_pool.CameraPool().warm_up, args=(cameras,), name='camera-reconnect',
+                             daemon=True).start()
+
+    def _key_press(self, key_text: str, _: float | None = None) -> None:
+        """
+        Key press handler (keyboard bus subscriber)
+        :param key_text: Key text
         """
         if not isinstance(self._config.data, settings.SettingsData) or \
            not isinstance(self._config.data.cameras, list):
             return None
-        text_key = self.key_to_text(key)
-        if text_key is None:
+        if key_text in self._key_pressed:
+            return None
+        self._key_pressed.add(key_text)
+
+    def _get_breaker(self, camera: settings.CameraData) -> circuit_breaker.CircuitBreaker:
+        """
+        Getting circuit breaker of camera (created on first request)
+        """
+        key = camera_pool.CameraPool.make_key(camera.address, camera.port, camera.username)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers.setdefault(key, circuit_breaker.CircuitBreaker(
+                camera.address, self._config.data.circuit_failures, self._config.data.circuit_reset_timeout))
+        return breaker
+
+    @staticmethod
+    def _request_timeout(timeout: tuple, deadline: float | None) -> tuple:
+        """
+        Timeouts of camera requests limited by time remaining before command deadline
+        :param timeout: Tuple of connect and read timeouts (seconds) from camera settings
+        :param deadline: time.perf_counter value of command deadline (None - no deadline)
+        :return: Tuple of connect and read timeouts (seconds)
+        :exception exceptions.DeadlineExceededError: Command deadline passed
+        """
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise exceptions.DeadlineExceededError
+        return min(timeout[0], remaining), min(timeout[1], remaining)
+
+    def _move_camera(self, command: dispatcher.MoveCommand) -> tuple:
+        """
+        Moving camera to preset from its settings
+        :param command: Move command (camera data, deadline and spans trace)
+        :return: Moving status, status text for notification and latency (seconds)
+        """
+        start_time = time.perf_counter()
+        camera = command.camera
+        camera_name = f'{camera.address}:{camera.port}'
+        breaker = self._get_breaker(camera)
+        metrics.Metrics().inc('movemycam_moves_issued_total', camera=camera_name)
+        try:
+            if health_checker.HealthChecker().is_offline(camera.address, camera.port):
+                raise exceptions.CameraOfflineError
+            breaker.before_call()
+            try:
+                timeout = (camera.connect_timeout, camera.read_timeout)
+                controller = camera_pool.CameraPool().get_controller(camera.address,
+                                                                     camera.port,
+                                                                     camera.username,
+                                                                     camera.password,
+                                                                     camera.fast_path,
+                                                                     timeout,
+                                                                     self._request_timeout(timeout, command.deadline))
+                if command.trace is not None:
+                    command.trace.mark(latency_tracker.Span.CONTROLLER_ACQUIRED)
+                moved = controller.go_to_preset(camera.preset, command.trace,
+                                                self._request_timeout(timeout, command.deadline))
+            except (exceptions.DeadlineExceededError, exceptions.IncorrectArgsError):
+                # Failure not caused by camera
+                breaker.release()
+                raise
+            except exceptions.CameraError:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release()
+                raise
+            breaker.record_success()
+            if not moved:
+                latency = time.perf_counter() - start_time
+                metrics.Metrics().inc('movemycam_moves_failed_total', camera=camera_name, error='PresetsNotFound')
+                self._record_latency(camera_name, command, 'failed')
+                logger.Logger().warning('Camera with address "%s" not moved to preset №%d (presets not found)',
+                                        camera.address, camera.preset,
+                                        fields=self._move_result_fields(command, start_time, latency, 'failed',
+                                                                        'PresetsNotFound'))
+                return False, 'Presets not found!', latency
+        except (exceptions.CameraError, exceptions.IncorrectArgsError) as e:
+            reason, text, evict = next((reason, text, evict) for error_type, reason, text, evict in _MOVE_ERRORS
+                                       if isinstance(e, error_type))
+            latency = time.perf_counter() - start_time
+            logger.Logger().error('Camera with address "%s" not moved to preset №%d (%s)', camera.address,
+                                  camera.preset, reason,
+                                  fields=self._move_result_fields(command, start_time, latency, 'failed',
+                                                                  type(e).__name__))
+            if evict:
+                camera_pool.CameraPool().evict(camera.address, camera.port, camera.username)
+            if type(e) is exceptions.ConnectionToCameraError:
+                health_checker.HealthChecker().report_failure(camera.address, camera.port)
+            metrics.Metrics().inc('movemycam_moves_failed_total', camera=camera_name, error=type(e).__name__)
+            self._record_latency(camera_name, command, 'failed')
+            return False, text, latency
+        latency = time.perf_counter() - start_time
+        health_checker.HealthChecker().report_success(camera.address, camera.port)
+        metrics.Metrics().inc('movemycam_moves_succeeded_total', camera=camera_name)
+        self._record_latency(camera_name, command, 'moved')
+        logger.Logger().info('Camera with address "%s" moved to preset №%d (%.0f ms)', camera.address, camera.preset,
+                             latency * 1000, fields=self._move_result_fields(command, start_time, latency, 'moved'))
+        return True, f'Camera moved to preset №{camera.preset}', latency
+
+    @staticmethod
+    def _record_latency(camera_name: str, command: dispatcher.MoveCommand, outcome: str) -> None:
+        """
+        Adding trace of finished command to latency histograms
+        :param camera_name: Camera address and port
+        :param outcome: "moved" or "failed"
+        """
+        if command.trace is None:
             return None
-        if text_key in self._key_pressed:
+        command.trace.mark(latency_tracker.Span.COMMAND_FINISHED)
+        latency_tracker.LatencyTracker().record(camera_name, command.trace, outcome)
+
+    def _move_result_fields(self, command: dispatcher.MoveCommand, start_time: float, latency: float, outcome: str,
+                            error: str | None = None) -> dict | None:
+        """
+        Structured log fields of executed move command (None if JSON lines log disabled)
+        :param start_time: time.perf_counter value of command start
+        :param latency: Command execution time (seconds)
+        :param outcome: "moved" or "failed"
+        :param error: Exception class name
+        """
+        if logger.Logger().json_file_path is None:
             return None
-        self._key_pressed.add(text_key)
+        fields = self.move_log_fields(command.camera)
+        fields.update(outcome=outcome, error=error, latency_ms=round(latency * 1000, 3),
+                      wait_ms=round((start_time - command.enqueue_time) * 1000, 3))
+        return fields
 
-    def _key_release(self, key: pynput.keyboard.Key) -> None:
+    def _notify_results(self, results: list) -> None:
         """
-        Key release handler
+        Sending one tray notification for all moved cameras
+        :param results: List of dispatcher.MoveResult objects
         """
-        key_text = self.key_to_text(key)
-        if key_text is None:
+        results = [result for result in results if not result.superseded]
+        if len(results) == 0:
             return None
-        for camera in self._config.data.cameras:
-            if not camera.activated:
-                continue
-            match = True
-            for hot_key in camera.hot_keys:
-                if hot_key not in self._key_pressed:
-                    match = False
-                    break
-            if match:
-                try:
-                    controller = camera_controller.CameraController(camera.address,
-                                                                    camera.port,
-                                                                    camera.username,
-                                                                    camera.password)
-                    if controller.go_to_preset(camera.preset):
-                        logger.Logger().info(f'Camera with address "{camera.address}" moved to preset №{camera.preset}')
-                        self._tray_notify(f'Camera moved to preset №{camera.preset}', f'Camera {camera.address}')
-                except exceptions.IncorrectArgsError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (wrong data)')
-                    self._tray_notify(f'Camera not moved!', f'Camera {camera.address}')
-                    continue
-                except exceptions.ConnectionToCameraError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (connection failed)')
-                    continue
-                except exceptions.GettingProfilesFromCameraError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (wrong username/password)')
-                    self._tray_notify(f'Camera not moved! Wrong username/password', f'Camera {camera.address}')
-                    continue
-                except exceptions.NoMediaProfilesOnCameraError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (no media profiles)')
-                    self._tray_notify(f'Camera not moved! No media profiles', f'Camera {camera.address}')
-                    continue
-                except exceptions.IncorrectPresetsCountError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (incorrect camera answer)')
-                    self._tray_notify(f'Camera not moved! Incorrect answer', f'Camera {camera.address}')
-                    continue
-                except exceptions.GettingPresetsCountError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (request preset count failed)')
-                    self._tray_notify(f'Camera not moved! Request preset count failed', f'Camera {camera.address}')
-                    continue
-                except exceptions.CameraError:
-                    logger.Logger().error(f'Camera with address "{camera.address}" not moved to preset '
-                                          f'№{camera.preset} (camera not initialized)')
-                    self._tray_notify(f'Camera not initialized!', f'Camera {camera.address}')
-                    continue
+        if len(results) == 1:
+            self._tray_notify(results[0].text, f'Camera {results[0].camera.address}')
+            return None
+        moved_count = 0
+        lines = list()
+        for result in results:
+            if result.moved:
+                moved_count += 1
+            lines.append(f'{result.camera.address}: {result.text} ({result.latency * 1000:.0f} ms)')
+        self._tray_notify('\n'.join(lines), f'Cameras moved: {moved_count}/{len(results)}')
+
+    def _key_release(self, key_text: str, received_time: float | None = None) -> None:
+        """
+        Key release handler (keyboard bus subscriber)
+        :param key_text: Key text
+        :param received_time: time.perf_counter value of key event (None - current time)
+        """
+        if received_time is None:
+            received_time = time.perf_counter()
+        matched_cameras = self.match_bindings(self._bindings, self._key_pressed)
+        if len(matched_cameras) > 0:
+            trace = latency_tracker.MoveTrace({latency_tracker.Span.KEY_RECEIVED: received_time})
+            trace.mark(latency_tracker.Span.BINDING_MATCHED)
+            self._dispatcher.submit(matched_cameras, self._notify_results, trace)
         if key_text in self._key_pressed:
             self._key_pressed.remove(key_text)
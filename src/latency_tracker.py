@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import bisect
+import enum
+import time
+
+
+import exceptions
+import logger
+
+
+class Span(enum.Enum):
+    KEY_RECEIVED = 'key_received'
+    BINDING_MATCHED = 'binding_matched'
+    COMMAND_STARTED = 'command_started'
+    CONTROLLER_ACQUIRED = 'controller_acquired'
+    REQUEST_SENT = 'request_sent'
+    RESPONSE_RECEIVED = 'response_received'
+    COMMAND_FINISHED = 'command_finished'
+
+
+# Stage name, first span, last span
+STAGES = (
+    ('match', Span.KEY_RECEIVED, Span.BINDING_MATCHED),
+    ('queue', Span.BINDING_MATCHED, Span.COMMAND_STARTED),
+    ('acquire', Span.COMMAND_STARTED, Span.CONTROLLER_ACQUIRED),
+    ('prepare', Span.CONTROLLER_ACQUIRED, Span.REQUEST_SENT),
+    ('request', Span.REQUEST_SENT, Span.RESPONSE_RECEIVED),
+    ('total', Span.KEY_RECEIVED, Span.COMMAND_FINISHED),
+)
+
+# Upper bounds of histogram buckets (seconds)
+BUCKET_BOUNDS = (0.0005, 0.001, 0.002, 0.003, 0.005, 0.0075, 0.01, 0.015, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15, 0.2,
+                 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, float('inf'))
+
+
+class MoveTrace:
+    """
+    Timestamps (time.perf_counter values) of one move command passing through sniffer, dispatcher and controller
+    """
+    _marks: dict | None = None
+
+    def __init__(self, marks: dict | None = None):
+        self._marks = dict() if marks is None else dict(marks)
+
+    def mark(self, span: Span, timestamp: float | None = None) -> None:
+        """
+        Saving span time
+        :param span: Span
+        :param timestamp: time.perf_counter value (None - current time)
+        """
+        self._marks[span] = time.perf_counter() if timestamp is None else timestamp
+
+    def get(self, span: Span) -> float | None:
+        return self._marks.get(span)
+
+    def duration(self, first: Span, last: Span) -> float | None:
+        """
+        Time between spans
+        :return: Seconds or None if any span not marked
+        """
+        if first not in self._marks or last not in self._marks:
+            return None
+        return self._marks[last] - self._marks[first]
+
+    def copy(self):
+        return MoveTrace(self._marks)
+
+
+class LatencyHistogram:
+    """
+    Latencies counted in fixed buckets (percentiles are interpolated inside bucket)
+    """
+    _counts: list | None = None
+    _count: int = 0
+    _sum: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def counts(self) -> list:
+        return list(self._counts)
+
+    def __init__(self):
+        self._counts = [0] * len(BUCKET_BOUNDS)
+
+    def add(self, value: float) -> None:
+        self._counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self._count += 1
+        self._sum += value
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Estimating percentile value
+        :param percent: Percentile (0 .. 100)
+        :return: Seconds or None if histogram is empty
+        """
+        if self._count == 0:
+            return None
+        rank = self._count * percent / 100.0
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            if count == 0 or cumulative + count < rank:
+                cumulative += count
+                continue
+            lower = 0.0 if index == 0 else BUCKET_BOUNDS[index - 1]
+            upper = BUCKET_BOUNDS[index]
+            if upper == float('inf'):
+                return lower
+            return lower + (upper - lower) * max(rank - cumulative, 0.0) / count
+        return BUCKET_BOUNDS[-2]
+
+
+class LatencyTracker:
+    """
+    Per-camera histograms of hot key latency stages (separate for every command outcome) with periodic summaries in
+    log
+    """
+    __instance = None
+    __initialized = False
+
+    _histograms: dict | None = None
+    _summary_interval: float = 0.0
+    _print_summary: bool = False
+    _thread: threading.Thread | None = None
+    _stop_event: threading.Event | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def summary_interval(self) -> float:
+        return self._summary_interval
+
+    @property
+    def print_summary(self) -> bool:
+        return self._print_summary
+
+    @print_summary.setter
+    def print_summary(self, value: bool) -> None:
+        if isinstance(value, bool):
+            self._print_summary = value
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._histograms = dict()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def record(self, camera: str, trace: MoveTrace, outcome: str = 'moved') -> None:
+        """
+        Adding durations of trace stages to camera histograms
+        :param camera: Camera name (address and port)
+        :param trace: Trace of executed command (stages with missing spans are skipped)
+        :param outcome: Command outcome ("moved" or "failed")
+        """
+        with self._lock:
+            for stage, first, last in STAGES:
+                duration = trace.duration(first, last)
+                if duration is None:
+                    continue
+                histogram = self._histograms.get((camera, stage, outcome))
+                if histogram is None:
+                    histogram = self._histograms[(camera, stage, outcome)] = LatencyHistogram()
+                histogram.add(duration)
+
+    def get_histograms(self) -> dict:
+        """
+        :return: Dictionary {(camera name, stage name, outcome): LatencyHistogram}
+        """
+        with self._lock:
+            return dict(self._histograms)
+
+    def summary(self) -> list:
+        """
+        Percentiles of every camera stage and command outcome
+        :return: List of text lines
+        """
+        lines = list()
+        histograms = self.get_histograms()
+        for camera, outcome in sorted({(camera, outcome) for camera, _, outcome in histograms.keys()}):
+            for stage, _, _ in STAGES:
+                histogram = histograms.get((camera, stage, outcome))
+                if histogram is None or histogram.count == 0:
+                    continue
+                lines.append(f'{camera} {stage} ({outcome}): p50 {histogram.percentile(50) * 1000:.1f} ms, '
+                             f'p95 {histogram.percentile(95) * 1000:.1f} ms, '
+                             f'p99 {histogram.percentile(99) * 1000:.1f} ms (count {histogram.count})')
+        return lines
+
+    def report(self) -> None:
+        """
+        Writing summary to log (and console if summary printing enabled)
+        """
+        lines = self.summary()
+        if len(lines) == 0:
+            return None
+        for line in lines:
+            logger.Logger().info('Latency %s', line)
+        if self._print_summary:
+            print('Hot key latency:\n  ' + '\n  '.join(lines))
+
+    def start_reporting(self, interval: float) -> None:
+        """
+        Start periodic summaries
+        :param interval: Time (seconds) between summaries (0 - stop reporting)
+        :exception exceptions.IncorrectArgsError: Wrong argument type or value
+        """
+        if not isinstance(interval, (int, float)) or interval < 0:
+            raise exceptions.IncorrectArgsError
+        self.stop_reporting()
+        self._summary_interval = interval
+        if interval == 0:
+            return None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._reporting_loop, args=(self._stop_event, interval),
+                                        name='latency-report', daemon=True)
+        self._thread.start()
+
+    def stop_reporting(self) -> None:
+        self._stop_event.set()
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def _reporting_loop(self, stop_event: threading.Event, interval: float) -> None:
+        while not stop_event.wait(interval):
+            self.report()
@@ -6,9 +6,15 @@ Yes, I'm know about logging module. If you like logger - use it. I don't like lo
 """
 
 
-import datetime
+import threading
+import atexit
+import queue
+import gzip
 import enum
+import json
+import time
 import os
+import re
 
 
 try:
@@ -27,6 +33,408 @@ class LogLevel(enum.Enum):
     DISABLE_LOG = 5
 
 
+# Text between timestamp and record text
+_TEXT_PREFIXES = {
+    LogLevel.DEBUG: ' :: DEBUG :: ',
+    LogLevel.INFO: ' :: INFO :: ',
+    LogLevel.WARNING: ' :: WARNING :: ',
+    LogLevel.ERROR: ' :: ERROR :: ',
+    LogLevel.CRITICAL: ' :: CRITICAL :: ',
+}
+
+if _SYSLOG_AVAILABLE:
+    _SYSLOG_PRIORITIES = {
+        LogLevel.DEBUG: syslog.LOG_DEBUG,
+        LogLevel.INFO: syslog.LOG_INFO,
+        LogLevel.WARNING: syslog.LOG_WARNING,
+        LogLevel.ERROR: syslog.LOG_ERR,
+        LogLevel.CRITICAL: syslog.LOG_CRIT,
+    }
+
+_DEBUG = LogLevel.DEBUG.value
+_INFO = LogLevel.INFO.value
+_WARNING = LogLevel.WARNING.value
+_ERROR = LogLevel.ERROR.value
+_CRITICAL = LogLevel.CRITICAL.value
+
+# Second (int of time.time value) and its text
+_timestamp_cache: tuple = (None, '')
+# Second, its ISO 8601 text and UTC offset
+_iso_timestamp_cache: tuple = (None, '', '')
+
+
+def _format_time(created: float) -> str:
+    """
+    Timestamp text of record (text is built once per second)
+    :param created: time.time value
+    """
+    global _timestamp_cache
+    second = int(created)
+    cache = _timestamp_cache
+    if cache[0] != second:
+        cache = _timestamp_cache = (second, time.strftime('%d-%m-%Y %H:%M:%S', time.localtime(second)))
+    return cache[1]
+
+
+def _format_iso_time(created: float) -> str:
+    """
+    ISO 8601 timestamp of record with milliseconds and UTC offset (text without milliseconds is built once per second)
+    :param created: time.time value
+    """
+    global _iso_timestamp_cache
+    second = int(created)
+    cache = _iso_timestamp_cache
+    if cache[0] != second:
+        local_time = time.localtime(second)
+        offset = time.strftime('%z', local_time)
+        cache = _iso_timestamp_cache = (second, time.strftime('%Y-%m-%dT%H:%M:%S', local_time),
+                                        f'{offset[:3]}:{offset[3:]}')
+    return f'{cache[1]}.{int((created - second) * 1000):03d}{cache[2]}'
+
+
+def _format_text(text: str, args: tuple) -> str:
+    """
+    Formatting record text ("%" style) with arguments
+    """
+    if len(args) == 0:
+        return text
+    try:
+        return text % args
+    except (TypeError, ValueError) as e:
+        return f'{text} {args!r} (formatting failed: {e})'
+
+
+def _segment_start(file_path: str) -> float | None:
+    """
+    Time of first record in log file (text or JSON lines)
+    :param file_path: Log file path
+    :return: time.time value or None if file is empty or first record has no timestamp
+    """
+    try:
+        with open(file_path, 'r', encoding='UTF-8', errors='replace') as f:
+            line = f.readline(4096)
+        if line.startswith('{'):
+            return time.mktime(time.strptime(json.loads(line)['time'][:19], '%Y-%m-%dT%H:%M:%S'))
+        return time.mktime(time.strptime(line[:19], '%d-%m-%Y %H:%M:%S'))
+    except (IOError, ValueError, OverflowError, KeyError, TypeError):
+        return None
+
+
+class _LogFile:
+    """
+    Opened log file with size (bytes) and time of first record (used by log writer thread only)
+    """
+    path: str = ''
+    size: int = 0
+    started: float = 0.0
+    rotate_after: float = 0.0
+    _file = None
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def opened(self) -> bool:
+        return self._file is not None
+
+    def open(self, created: float) -> bool:
+        """
+        :param created: Time of record opening file (used as first record time of new file)
+        :return: Opening status
+        """
+        try:
+            self._file = open(self.path, 'a', encoding='UTF-8')
+            self.size = self._file.tell()
+        except IOError:
+            self._file = None
+            return False
+        self.started = created
+        if self.size > 0:
+            self.started = _segment_start(self.path) or created
+        return True
+
+    def write(self, line: str, line_size: int) -> None:
+        """
+        :param line: Record text
+        :param line_size: Size (bytes) of record text encoded to UTF-8
+        """
+        try:
+            self._file.write(line)
+            self.size += line_size
+        except (IOError, ValueError):
+            self.close()
+
+    def flush(self) -> None:
+        if self._file is None:
+            return None
+        try:
+            self._file.flush()
+        except (IOError, ValueError):
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except IOError:
+                pass
+        self._file = None
+        self.size = 0
+
+
+class _LogWriter:
+    """
+    Background thread writing log records to files or syslog in batches. Records are dropped (and counted) when queue
+    is full, callers never wait for disk. Log files are rotated by size and age, rotated segments are compressed by
+    separate thread
+    """
+    _QUEUE_SIZE: int = 10000
+    _BATCH_SIZE: int = 256
+    _FLUSH_INTERVAL: float = 1.0
+    # Time (seconds) before next rotation attempt if log file was not renamed
+    _ROTATE_RETRY_INTERVAL: float = 60.0
+
+    _queue: queue.Queue | None = None
+    _thread: threading.Thread | None = None
+    _files: dict | None = None
+    _max_size: int = 0
+    _max_age: float = 0.0
+    _retention: int = 5
+    _rotated_paths: set | None = None
+    _compressor: threading.Thread | None = None
+    _compress_event: threading.Event | None = None
+    _dropped: int = 0
+    _unreported_dropped: int = 0
+    _lock: threading.Lock = None
+
+    @property
+    def dropped_count(self) -> int:
+        return self._dropped
+
+    def __init__(self):
+        self._queue = queue.Queue(self._QUEUE_SIZE)
+        self._files = dict()
+        self._rotated_paths = set()
+        self._compress_event = threading.Event()
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def set_rotation(self, max_size: int, max_age: float, retention: int) -> None:
+        """
+        :param max_size: Maximum log file size (bytes, 0 - no limit)
+        :param max_age: Maximum time (seconds) between first and last records of log file (0 - no limit)
+        :param retention: Count of kept rotated log files
+        """
+        self._max_size = max_size
+        self._max_age = max_age
+        self._retention = retention
+
+    def put(self, record: tuple) -> bool:
+        """
+        Adding record to queue
+        :param record: Tuple (log level, time.time value, text, format arguments, structured fields, write to syslog,
+                       text log file path, JSON lines log file path). Paths are None for disabled outputs
+        :return: False if record dropped
+        """
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+                self._unreported_dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waiting until queued records are written to disk
+        :param timeout: Maximum waiting time (seconds)
+        :return: False if records not written in time
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Writing queued records and stopping thread (thread is started again by next record)
+        :param timeout: Maximum waiting time (seconds)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return None
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return None
+        self._thread.join(timeout)
+        with self._lock:
+            self._thread = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return None
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        flush_time = None
+        last_record = None
+        while True:
+            timeout = None if flush_time is None else max(flush_time - time.monotonic(), 0.0)
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                self._flush_files()
+                flush_time = None
+                continue
+            while len(batch) < self._BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for item in batch:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    self._flush_files()
+                    flush_time = None
+                    item.set()
+                else:
+                    self._write(*item)
+                    last_record = item
+            with self._lock:
+                dropped, self._unreported_dropped = self._unreported_dropped, 0
+            if dropped > 0 and last_record is not None:
+                self._write(LogLevel.WARNING, time.time(), '%d log record(s) dropped (queue is full)', (dropped,),
+                            None, *last_record[5:])
+            if stop:
+                self._flush_files()
+                self._close_files()
+                return None
+            if len(self._files) > 0 and flush_time is None:
+                flush_time = time.monotonic() + self._FLUSH_INTERVAL
+            elif flush_time is not None and time.monotonic() >= flush_time:
+                self._flush_files()
+                flush_time = None
+
+    def _write(self, log_level: LogLevel, created: float, text: str, args: tuple, fields: dict | None,
+               use_syslog: bool, file_path: str | None, json_path: str | None) -> None:
+        text = _format_text(text, args)
+        if use_syslog and _SYSLOG_AVAILABLE and log_level in _SYSLOG_PRIORITIES:
+            syslog.syslog(_SYSLOG_PRIORITIES[log_level], text)
+        if file_path is not None:
+            self._write_line(file_path, created, _format_time(created) +
+                             _TEXT_PREFIXES.get(log_level, ' :: UNKNOWN :: ') + text + '\n')
+        if json_path is not None:
+            record = {'time': _format_iso_time(created), 'level': log_level.name, 'message': text}
+            if fields is not None:
+                record.update(fields)
+            self._write_line(json_path, created, json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def _write_line(self, file_path: str, created: float, line: str) -> None:
+        log_file = self._files.get(file_path)
+        if log_file is None:
+            log_file = self._files[file_path] = _LogFile(file_path)
+        if not log_file.opened and not log_file.open(created):
+            return None
+        line_size = len(line) if line.isascii() else len(line.encode('UTF-8'))
+        if log_file.size > 0 and created >= log_file.rotate_after and \
+                ((0 < self._max_size < log_file.size + line_size) or (0 < self._max_age <= created - log_file.started)):
+            if not self._rotate(log_file, created):
+                return None
+        log_file.write(line, line_size)
+
+    def _rotate(self, log_file: _LogFile, created: float) -> bool:
+        """
+        Renaming log file to "<file path>.<date>-<time>" and opening new file (rotated file is compressed later). If
+        file can not be renamed, writing to it is continued and rotation is retried after _ROTATE_RETRY_INTERVAL
+        :param log_file: Opened log file
+        :param created: Time of record started new file
+        :return: False if new file not opened
+        """
+        log_file.close()
+        rotated_path = base_path = f'{log_file.path}.{time.strftime("%Y%m%d-%H%M%S", time.localtime(created))}'
+        index = 1
+        while os.path.exists(rotated_path) or os.path.exists(rotated_path + '.gz'):
+            rotated_path = f'{base_path}-{index}'
+            index += 1
+        try:
+            os.replace(log_file.path, rotated_path)
+        except OSError:
+            log_file.rotate_after = created + self._ROTATE_RETRY_INTERVAL
+            return log_file.open(created)
+        log_file.rotate_after = 0.0
+        if not log_file.open(created):
+            return False
+        with self._lock:
+            self._rotated_paths.add(log_file.path)
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_loop, name='log-compressor', daemon=True)
+            self._compressor.start()
+        self._compress_event.set()
+        return True
+
+    def _compress_loop(self) -> None:
+        while True:
+            self._compress_event.wait()
+            self._compress_event.clear()
+            with self._lock:
+                rotated_paths = list(self._rotated_paths)
+                self._rotated_paths.clear()
+            for file_path in rotated_paths:
+                self._compress_rotated(file_path, self._retention)
+
+    @staticmethod
+    def _compress_rotated(file_path: str, retention: int) -> None:
+        """
+        Compressing rotated segments of log file (gzip) and removing old segments
+        :param file_path: Log file path
+        :param retention: Count of kept segments
+        """
+        directory, name = os.path.split(os.path.abspath(file_path))
+        pattern = re.compile(re.escape(name) + r'\.\d{8}-\d{6}(-\d+)?(\.gz)?$')
+        try:
+            segments = sorted((segment for segment in os.listdir(directory) if pattern.match(segment)),
+                              key=lambda segment: segment.removesuffix('.gz'))
+        except OSError:
+            return None
+        for segment in segments[:max(len(segments) - retention, 0)]:
+            try:
+                os.remove(os.path.join(directory, segment))
+            except OSError:
+                pass
+        for segment in segments[max(len(segments) - retention, 0):]:
+            if segment.endswith('.gz'):
+                continue
+            source_path = os.path.join(directory, segment)
+            try:
+                with open(source_path, 'rb') as source, gzip.open(source_path + '.gz.tmp', 'wb') as target:
+                    while chunk := source.read(1024 * 1024):
+                        target.write(chunk)
+                os.replace(source_path + '.gz.tmp', source_path + '.gz')
+                os.remove(source_path)
+            except OSError:
+                continue
+
+    def _flush_files(self) -> None:
+        for log_file in self._files.values():
+            log_file.flush()
+
+    def _close_files(self) -> None:
+        for log_file in self._files.values():
+            log_file.close()
+        self._files.clear()
+
+
 class Logger:
     __instance = None
     __initialized = False
@@ -34,9 +442,19 @@ class Logger:
     _DEFAULT_FILE_PATH = 'MoveMyCam.log'
 
     _current_log_level: LogLevel = LogLevel.INFO
+    _level_value: int = _INFO
     _printer: bool = False
     _force_use_file_log: bool = False
     _file_path: str | None = None
+    _json_file_path: str | None = None
+    _writer: _LogWriter | None = None
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        Count of log records dropped because writer queue was full
+        """
+        return self._writer.dropped_count
 
     @property
     def log_level(self) -> LogLevel:
@@ -46,6 +464,7 @@ class Logger:
     def log_level(self, value: LogLevel) -> None:
         if isinstance(value, LogLevel):
             self._current_log_level = value
+            self._level_value = value.value
 
     @property
     def print_log(self) -> bool:
@@ -83,6 +502,28 @@ class Logger:
             except IOError:
                 return
 
+    @property
+    def json_file_path(self) -> str | None:
+        """
+        JSON lines log file (written in addition to syslog / text log file, records with structured fields are written
+        regardless of log level). None - JSON log disabled
+        """
+        return self._json_file_path
+
+    @json_file_path.setter
+    def json_file_path(self, value: str | None) -> None:
+        if value is None or value == '':
+            self._json_file_path = None
+            return
+        if not isinstance(value, str) or os.path.isdir(value):
+            return
+        try:
+            fp = open(value, 'a')
+            fp.close()
+            self._json_file_path = value
+        except IOError:
+            return
+
     @property
     def force_use_file_log(self) -> bool:
         return self._force_use_file_log
@@ -106,6 +547,7 @@ class Logger:
         if self.__initialized:
             return
         self.__initialized = True
+        self._writer = _LogWriter()
         if not isinstance(log_level, LogLevel) or not isinstance(print_log, bool) or \
                 not isinstance(force_use_file_log, bool) or not (isinstance(file_path, str) or file_path is None):
             self.log_level = LogLevel.DISABLE_LOG
@@ -114,7 +556,7 @@ class Logger:
             if not _SYSLOG_AVAILABLE:
                 self._init_file_path()
             return
-        self._current_log_level = log_level
+        self.log_level = log_level
         self._printer = print_log
         if file_path is not None:
             self.file_path = file_path
@@ -139,76 +581,88 @@ class Logger:
             except IOError:
                 self._file_path = None
 
-    def _add_log_record(self, log_level: LogLevel, text: str) -> bool:
-
-        def to_syslog() -> None:
-            syslog_priority = None
-            match log_level:
-                case LogLevel.DEBUG:
-                    syslog_priority = syslog.LOG_DEBUG
-                case LogLevel.INFO:
-                    syslog_priority = syslog.LOG_INFO
-                case LogLevel.WARNING:
-                    syslog_priority = syslog.LOG_WARNING
-                case LogLevel.ERROR:
-                    syslog_priority = syslog.LOG_ERR
-                case LogLevel.CRITICAL:
-                    syslog_priority = syslog.LOG_CRIT
-            if syslog_priority is None:
-                return None
-            syslog.syslog(syslog_priority, text)
-
-        def get_text_prefix() -> str:
-            match log_level:
-                case LogLevel.DEBUG:
-                    return 'DEBUG'
-                case LogLevel.INFO:
-                    return 'INFO'
-                case LogLevel.WARNING:
-                    return 'WARNING'
-                case LogLevel.ERROR:
-                    return 'ERROR'
-                case LogLevel.CRITICAL:
-                    return 'CRITICAL'
-            return 'UNKNOWN'
-
-        def to_file() -> bool:
-            timestamp = datetime.datetime.now().strftime('%d-%m-%Y %H:%M:%S')
-            try:
-                with open(self._file_path, 'a', encoding='UTF-8') as f:
-                    f.write(timestamp + ' :: ' + get_text_prefix() + ' :: ' + text + '\n')
-                return True
-            except IOError:
-                return False
-
-        def to_console() -> None:
-            timestamp = datetime.datetime.now().strftime('%d-%m-%Y %H:%M:%S')
-            print(timestamp + ' :: ' + get_text_prefix() + ' :: ' + text + '\n')
-
+    def is_enabled_for(self, log_level: LogLevel) -> bool:
+        """
+        Checking that records of log level are written (for skipping expensive preparing of record arguments)
+        :param log_level: Log level of record
+        """
+        return log_level is not LogLevel.DISABLE_LOG and log_level.value >= self._level_value
+
+    def _add_log_record(self, log_level: LogLevel, text: str, args: tuple = tuple(),
+                        fields: dict | None = None) -> bool:
+        """
+        :param text: Record text ("%" style format string if arguments passed)
+        :param args: Format arguments (text is formatted by log writer thread, arguments should not be changed later)
+        :param fields: Typed fields of record written to JSON lines log only (names must not be "time", "level" or
+                       "message"). Records with fields are written to JSON lines log regardless of log level
+        """
         if not isinstance(text, str) or len(text) < 1:
             return False
-        if log_level.value < self._current_log_level.value:
-            return False
+        if log_level.value < self._level_value:
+            if fields is None or self._json_file_path is None:
+                return False
+            return self._writer.put((log_level, time.time(), text, args, fields, False, None, self._json_file_path))
+        created = time.time()
         if self._printer:
-            to_console()
-        if _SYSLOG_AVAILABLE and not self._force_use_file_log:
-            to_syslog()
-            return True
-        if self._file_path is None:
+            print(_format_time(created) + _TEXT_PREFIXES.get(log_level, ' :: UNKNOWN :: ') + _format_text(text, args) +
+                  '\n')
+        use_syslog = _SYSLOG_AVAILABLE and not self._force_use_file_log
+        file_path = None if use_syslog else self._file_path
+        if not use_syslog and file_path is None and self._json_file_path is None:
             return False
-        return to_file()
-
-    def debug(self, text: str) -> bool:
-        return self._add_log_record(LogLevel.DEBUG, text)
+        return self._writer.put((log_level, created, text, args, fields, use_syslog, file_path,
+                                 self._json_file_path))
+
+    def set_rotation(self, max_size: int, max_age: float, retention: int) -> bool:
+        """
+        Setting log file rotation (rotated files are named "<file path>.<date>-<time>" and compressed by gzip)
+        :param max_size: Maximum log file size (bytes, 0 - no limit)
+        :param max_age: Maximum time (seconds) between first and last records of log file (0 - no limit)
+        :param retention: Count of kept rotated log files
+        :return: False if any argument is wrong (rotation not changed)
+        """
+        if not isinstance(max_size, int) or not isinstance(max_age, (int, float)) or not isinstance(retention, int):
+            return False
+        if max_size < 0 or max_age < 0 or retention < 0:
+            return False
+        self._writer.set_rotation(max_size, max_age, retention)
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waiting until queued log records are written (records are written by background thread)
+        :param timeout: Maximum waiting time (seconds)
+        :return: False if records not written in time
+        """
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """
+        Writing queued log records and stopping background writer (called on exit automatically)
+        """
+        self._writer.stop()
+
+    def debug(self, text: str, *args, fields: dict | None = None) -> bool:
+        if self._level_value > _DEBUG and fields is None:
+            return False
+        return self._add_log_record(LogLevel.DEBUG, text, args, fields)
 
-    def info(self, text: str) -> bool:
-        return self._add_log_record(LogLevel.INFO, text)
+    def info(self, text: str, *args, fields: dict | None = None) -> bool:
+        if self._level_value > _INFO and fields is None:
+            return False
+        return self._add_log_record(LogLevel.INFO, text, args, fields)
 
-    def warning(self, text: str) -> bool:
-        return self._add_log_record(LogLevel.WARNING, text)
+    def warning(self, text: str, *args, fields: dict | None = None) -> bool:
+        if self._level_value > _WARNING and fields is None:
+            return False
+        return self._add_log_record(LogLevel.WARNING, text, args, fields)
 
-    def error(self, text: str) -> bool:
-        return self._add_log_record(LogLevel.ERROR, text)
+    def error(self, text: str, *args, fields: dict | None = None) -> bool:
+        if self._level_value > _ERROR and fields is None:
+            return False
+        return self._add_log_record(LogLevel.ERROR, text, args, fields)
 
-    def critical(self, text: str) -> bool:
-        return self._add_log_record(LogLevel.CRITICAL, text)
+    def critical(self, text: str, *args, fields: dict | None = None) -> bool:
+        if self._level_value > _CRITICAL and fields is None:
+            return False
+        return self._add_log_record(LogLevel.CRITICAL, text, args, fields)
@@ -2,65 +2,158 @@
 # -*- coding: utf-8 -*-
 
 
+import threading
 import argparse
+import signal
+import time
 import sys
 import os
 
 
-try:
-    import pystray
-except ModuleNotFoundError:
-    print('Module pystray not found! Please install required modules from file "requirements.txt"')
-    exit(1)
-except Exception as exc:
-    print(f'Import module pynput failed ({exc})!')
-    exit(1)
+_START_TIME = time.perf_counter()
 
-try:
-    import PIL.Image
-except ModuleNotFoundError:
-    print('Module pillow not found! Please install required modules from file "requirements.txt"')
-    exit(1)
-except Exception as exc:
-    print(f'Import module pynput failed ({exc})!')
-    exit(1)
+
+import startup_profiler
+
+
+# Imports measured from the start, before argument parsing
+if any(arg == '--profile-startup' or arg.startswith('--profile-startup=') for arg in sys.argv[1:]):
+    startup_profiler.StartupProfiler().start(_START_TIME)
 
 
 import keyboard_sniffer
+import latency_tracker
+import keyboard_bus
 import exceptions
 import settings
+import metrics
 import logger
-import GUI
+
+
+def _import_tray_modules() -> tuple:
+    """
+    Importing tray modules on demand (not needed in headless mode)
+    :return: Modules pystray and PIL.Image
+    """
+    try:
+        import pystray
+    except ModuleNotFoundError:
+        print('Module pystray not found! Please install required modules from file "requirements.txt"')
+        exit(1)
+    except Exception as e:
+        print(f'Import module pystray failed ({e})!')
+        exit(1)
+    try:
+        import PIL.Image
+    except ModuleNotFoundError:
+        print('Module pillow not found! Please install required modules from file "requirements.txt"')
+        exit(1)
+    except Exception as e:
+        print(f'Import module pillow failed ({e})!')
+        exit(1)
+    return pystray, PIL.Image
+
+
+def _preload_wsdl() -> None:
+    """
+    Parsing ONVIF WSDL documents in background thread (zeep imported there, not delaying tray and hot keys)
+    """
+    import wsdl_cache
+    wsdl_cache.WsdlCache().preload()
+
+
+def _load_config(config_path: str | None) -> bool:
+    """
+    Loading configuration file passed in command line
+    :param config_path: Configuration file path (None - default configuration file loaded by settings module)
+    :return: False if configuration file is wrong
+    """
+    if not isinstance(config_path, str):
+        return True
+    config = settings.Settings(config_file_path=config_path, autoload=False)
+    try:
+        logger.Logger().print_log = True
+        if not config.load():
+            logger.Logger().error('Configuration file not loaded!')
+    except exceptions.IncorrectArgsError:
+        logger.Logger().error('Wrong camera data type (waiting dictionary)!')
+        return False
+    except exceptions.IncorrectData as e:
+        logger.Logger().error('Not found or wrong required parameter in camera data!')
+        logger.Logger().debug(str(e))
+        return False
+    except ValueError:
+        logger.Logger().error('Wrong log level value!')
+        return False
+    return True
+
+
+def _start_metrics(metrics_port: int | None) -> None:
+    """
+    :param metrics_port: Port of local metrics endpoint (None - port from configuration file, 0 - disabled)
+    """
+    if metrics_port is None:
+        metrics_port = settings.Settings().data.metrics_port
+    if metrics_port > 0:
+        metrics.Metrics().start(settings.Settings().data.metrics_address, metrics_port)
+
+
+class Daemon:
+    """
+    Headless mode: keyboard sniffer and cameras engine without tray icon and settings window
+    """
+    _sniffer: keyboard_sniffer.KeyboardSniffer | None = None
+    _stop_event: threading.Event | None = None
+
+    def __init__(self, config_path: str | None = None, metrics_port: int | None = None):
+        """
+        :param config_path: Configuration file path
+        :param metrics_port: Port of local metrics endpoint (None - port from configuration file, 0 - disabled)
+        """
+        startup_profiler.StartupProfiler().expect('hotkeys_ready')
+        if not _load_config(config_path):
+            exit(2)
+        startup_profiler.StartupProfiler().mark('config_loaded')
+        self._stop_event = threading.Event()
+        threading.Thread(target=_preload_wsdl, name='wsdl-preload', daemon=True).start()
+        _start_metrics(metrics_port)
+        self._sniffer = keyboard_sniffer.KeyboardSniffer()
+        if not self._sniffer.ready:
+            logger.Logger().error('Sniffer not ready for start (no cameras in configuration file)')
+            exit(2)
+        if not self._sniffer.start():
+            logger.Logger().error('Sniffer not started')
+            exit(2)
+        logger.Logger().info('Headless mode started in %.0f ms', (time.perf_counter() - _START_TIME) * 1000)
+        signal.signal(signal.SIGTERM, lambda *_: self._stop_event.set())
+        try:
+            while not self._stop_event.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        self._sniffer.stop()
+        keyboard_bus.KeyboardBus().stop()
+        metrics.Metrics().stop()
+        logger.Logger().info('Headless mode stopped')
 
 
 class Tray:
     _ICON_IMAGE_PATH: str = 'resources/icon.png'
-    _icon: pystray.Icon | None = None
+    _icon = None
     _activation_checked: bool = False
     _settings_window_opened: bool = False
     _sniffer: keyboard_sniffer.KeyboardSniffer | None = None
 
-    def __init__(self, config_path: str | None = None, auto_activate: bool = False):
+    def __init__(self, config_path: str | None = None, auto_activate: bool = False, metrics_port: int | None = None):
         """
         :param config_path: Configuration file path
         :param auto_activate: Enable keyboard sniffer on start program (script / tray)
+        :param metrics_port: Port of local metrics endpoint (None - port from configuration file, 0 - disabled)
         """
-        if isinstance(config_path, str):
-            config = settings.Settings(config_file_path=config_path)
-            try:
-                logger.Logger().print_log = True
-                if not config.load():
-                    logger.Logger().error('Configuration file not loaded!')
-            except exceptions.IncorrectArgsError:
-                logger.Logger().error('Wrong camera data type (waiting dictionary)!')
-                return
-            except exceptions.IncorrectData as e:
-                logger.Logger().error('Not found or wrong required parameter in camera data!')
-                logger.Logger().debug(str(e))
-                return
-            except ValueError:
-                logger.Logger().error('Wrong log level value!')
-                return
+        startup_profiler.StartupProfiler().expect('tray_ready', *(('hotkeys_ready',) if auto_activate else ()))
+        if not _load_config(config_path):
+            return
+        startup_profiler.StartupProfiler().mark('config_loaded')
         logger.Logger().print_log = False
         # PyInstaller special
         if hasattr(sys, '_MEIPASS'):
@@ -71,6 +164,7 @@ class Tray:
         if not os.path.isfile(self._ICON_IMAGE_PATH):
             logger.Logger().error('Tray icon is not a file!')
             return
+        pystray, pil_image = _import_tray_modules()
         menu = pystray.Menu(
             pystray.MenuItem('Activation',
                              action=self._on_clicked_tray_menu,
@@ -79,6 +173,8 @@ class Tray:
             pystray.Menu.SEPARATOR,
             pystray.MenuItem('Exit', action=self._on_clicked_tray_menu)
         )
+        threading.Thread(target=_preload_wsdl, name='wsdl-preload', daemon=True).start()
+        _start_metrics(metrics_port)
         self._sniffer = keyboard_sniffer.KeyboardSniffer()
         if auto_activate:
             if self._sniffer.ready:
@@ -90,11 +186,17 @@ class Tray:
             else:
                 logger.Logger().warning('Sniffer not ready for start by autorun')
         try:
-            self._icon = pystray.Icon('MoveMyCam', PIL.Image.open(self._ICON_IMAGE_PATH), menu=menu)
+            self._icon = pystray.Icon('MoveMyCam', pil_image.open(self._ICON_IMAGE_PATH), menu=menu)
             self._sniffer.set_tray_icon(self._icon)
-            self._icon.run()
+            self._icon.run(setup=self._on_tray_ready)
         except Exception as e:
-            logger.Logger().error(f'Start tray menu failed! ({e})')
+            logger.Logger().error('Start tray menu failed! (%s)', e)
+
+    @staticmethod
+    def _on_tray_ready(icon) -> None:
+        icon.visible = True
+        startup_profiler.StartupProfiler().mark('tray_ready')
+        logger.Logger().info('Tray started in %.0f ms', (time.perf_counter() - _START_TIME) * 1000)
 
     def _on_clicked_tray_menu(self, _, item):
         """
@@ -124,6 +226,7 @@ class Tray:
                     if self._activation_checked:
                         self._sniffer.stop()
                     self._settings_window_opened = True
+                    import GUI
                     config_gui = GUI.CamerasWindow()
                     if config_gui.settings_updated:
                         self._sniffer.load_configuration()
@@ -134,6 +237,7 @@ class Tray:
                 if self._sniffer is not None:
                     self._activation_checked = False
                     self._sniffer.stop()
+                keyboard_bus.KeyboardBus().stop()
                 if self._icon is not None:
                     self._icon.stop()
                     self._icon = None
@@ -148,5 +252,24 @@ if __name__ == '__main__':
     parser.add_argument('-a', '--auto-activate', action='store_true', dest='auto_activate',
                         help='auto activate sniffing hotkeys')
     parser.add_argument('-c', '--config', type=str, default=None, help='path to the configuration file')
+    parser.add_argument('-l', '--latency-stats', action='store_true', dest='latency_stats',
+                        help='print hotkey latency percentiles (periodically and on exit)')
+    parser.add_argument('-m', '--metrics-port', type=int, default=None, dest='metrics_port',
+                        help='port of local Prometheus metrics endpoint (0 - disabled)')
+    parser.add_argument('--headless', action='store_true', help='run without tray icon and settings window '
+                                                                '(sniffing hotkeys activated automatically)')
+    parser.add_argument('--profile-startup', type=float, nargs='?', const=0.0, default=None, dest='profile_startup',
+                        metavar='BUDGET_MS', help='report import time of modules, time to tray ready and time to '
+                                                  'hotkeys ready (warning if any exceeds budget in milliseconds)')
     args = parser.parse_args()
-    Tray(args.config, args.auto_activate)
+    if args.profile_startup is not None:
+        startup_profiler.StartupProfiler().budget = args.profile_startup / 1000
+        startup_profiler.StartupProfiler().mark('arguments_parsed')
+    latency_tracker.LatencyTracker().print_summary = args.latency_stats
+    if args.headless:
+        Daemon(args.config, args.metrics_port)
+    else:
+        Tray(args.config, args.auto_activate, args.metrics_port)
+    if args.latency_stats:
+        latency_tracker.LatencyTracker().report()
+    startup_profiler.StartupProfiler().report()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+
+
+import latency_tracker
+import exceptions
+import logger
+
+
+_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_COUNTERS_HELP = {
+    'movemycam_moves_issued_total': 'Move commands executed by cameras',
+    'movemycam_moves_succeeded_total': 'Move commands accepted by cameras',
+    'movemycam_moves_failed_total': 'Failed move commands by exception class',
+    'movemycam_listener_restarts_total': 'Keyboard listener restarts',
+    'movemycam_config_reloads_total': 'Configuration reloads by result',
+}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels_text(labels: tuple) -> str:
+    if len(labels) == 0:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Metrics:
+    """
+    Counters and gauges exposed in Prometheus text format on local HTTP endpoint (counting disabled while
+    endpoint is not started)
+    """
+    __instance = None
+    __initialized = False
+
+    _enabled: bool = False
+    _counters: dict | None = None
+    _callbacks: dict | None = None
+    _server = None
+    _lock: threading.Lock = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def address(self) -> tuple | None:
+        """
+        Listening address and port of endpoint (None - endpoint not started)
+        """
+        if self._server is None:
+            return None
+        return self._server.server_address[:2]
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._counters = dict()
+        self._callbacks = dict()
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Incrementing counter (nothing is done while endpoint is disabled)
+        :param name: Counter name
+        :param value: Increment
+        :param labels: Counter labels
+        """
+        if not self._enabled:
+            return None
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register(self, name: str, metric_type: str, help_text: str, callback) -> None:
+        """
+        Registering metric with value requested on every scrape
+        :param name: Metric name
+        :param metric_type: Prometheus metric type ("gauge" or "counter")
+        :param help_text: Metric description
+        :param callback: Function returning metric value
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not isinstance(name, str) or metric_type not in ('gauge', 'counter') or not callable(callback):
+            raise exceptions.IncorrectArgsError
+        with self._lock:
+            self._callbacks[name] = (metric_type, help_text, callback)
+
+    def start(self, address: str = '127.0.0.1', port: int = 9464) -> bool:
+        """
+        Start HTTP endpoint (metrics available on /metrics)
+        :param address: Listening address
+        :param port: Listening port
+        :return: Endpoint status
+        """
+        if self._server is not None:
+            return True
+        # HTTP server is imported only when endpoint is enabled
+        import http.server
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return None
+                answer = metrics.render().encode('UTF-8')
+                self.send_response(200)
+                self.send_header('Content-Type', _CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(answer)))
+                self.end_headers()
+                self.wfile.write(answer)
+
+        try:
+            self._server = http.server.ThreadingHTTPServer((address, port), Handler)
+        except OSError as e:
+            logger.Logger().error('Metrics endpoint not started on %s:%s (%s)', address, port, e)
+            return False
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True).start()
+        self._enabled = True
+        logger.Logger().info('Metrics endpoint listening on http://%s:%d/metrics', address, self._server.server_port)
+        return True
+
+    def stop(self) -> None:
+        if self._server is None:
+            return None
+        self._enabled = False
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def render(self) -> str:
+        """
+        Building metrics text in Prometheus exposition format
+        """
+        lines = list()
+        with self._lock:
+            counters = dict(self._counters)
+            callbacks = dict(self._callbacks)
+        for name in sorted({name for name, _ in counters.keys()}):
+            lines.append(f'# HELP {name} {_COUNTERS_HELP.get(name, name)}')
+            lines.append(f'# TYPE {name} counter')
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f'{name}{_labels_text(labels)} {value}')
+        for name, (metric_type, help_text, callback) in sorted(callbacks.items()):
+            try:
+                value = callback()
+            except Exception as e:
+                logger.Logger().debug('Getting metric %s failed: %s', name, e)
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.append(f'{name} {value}')
+        histograms = latency_tracker.LatencyTracker().get_histograms()
+        if len(histograms) > 0:
+            name = 'movemycam_latency_seconds'
+            lines.append(f'# HELP {name} Hot key latency stages by camera and command outcome')
+            lines.append(f'# TYPE {name} histogram')
+            for (camera, stage, outcome), histogram in sorted(histograms.items()):
+                labels = (('camera', camera), ('stage', stage), ('outcome', outcome))
+                cumulative = 0
+                for bound, count in zip(latency_tracker.BUCKET_BOUNDS, histogram.counts):
+                    cumulative += count
+                    bucket_labels = labels + (('le', '+Inf' if bound == float('inf') else repr(bound)),)
+                    lines.append(f'{name}_bucket{_labels_text(bucket_labels)} {cumulative}')
+                lines.append(f'{name}_sum{_labels_text(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{_labels_text(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
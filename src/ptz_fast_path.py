@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+
+import xml.etree.ElementTree as ElementTree
+import xml.sax.saxutils as saxutils
+import urllib.parse
+import http.client
+import threading
+import datetime
+import hashlib
+import base64
+import os
+
+
+import transport_pool
+import exceptions
+
+
+_SOAP_ENVELOPE_NS = 'http://www.w3.org/2003/05/soap-envelope'
+_PTZ_NS = 'http://www.onvif.org/ver20/ptz/wsdl'
+_SCHEMA_NS = 'http://www.onvif.org/ver10/schema'
+
+_ENVELOPE_HEAD = ('<?xml version="1.0" encoding="UTF-8"?>'
+                  f'<s:Envelope xmlns:s="{_SOAP_ENVELOPE_NS}" xmlns:tptz="{_PTZ_NS}" xmlns:tt="{_SCHEMA_NS}">'
+                  '<s:Header>')
+_ENVELOPE_BODY = '</s:Header><s:Body>'
+_ENVELOPE_TAIL = '</s:Body></s:Envelope>'
+
+_SECURITY_HEADER = (
+    '<wsse:Security xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd" '
+    'xmlns:wsu="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd">'
+    '<wsse:UsernameToken><wsse:Username>{username}</wsse:Username>'
+    '<wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0'
+    '#PasswordDigest">{digest}</wsse:Password>'
+    '<wsse:Nonce EncodingType="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-soap-message-security-1.0'
+    '#Base64Binary">{nonce}</wsse:Nonce>'
+    '<wsu:Created>{created}</wsu:Created></wsse:UsernameToken></wsse:Security>'
+)
+
+_GOTO_PRESET_BODY = ('<tptz:GotoPreset><tptz:ProfileToken>{profile}</tptz:ProfileToken>'
+                     '<tptz:PresetToken>{{preset}}</tptz:PresetToken></tptz:GotoPreset>')
+_STOP_BODY = ('<tptz:Stop><tptz:ProfileToken>{profile}</tptz:ProfileToken>'
+              '<tptz:PanTilt>{{pan_tilt}}</tptz:PanTilt><tptz:Zoom>{{zoom}}</tptz:Zoom></tptz:Stop>')
+_CONTINUOUS_MOVE_BODY = ('<tptz:ContinuousMove><tptz:ProfileToken>{profile}</tptz:ProfileToken>'
+                         '<tptz:Velocity><tt:PanTilt x="{{pan}}" y="{{tilt}}"/><tt:Zoom x="{{zoom}}"/></tptz:Velocity>'
+                         '</tptz:ContinuousMove>')
+_GET_STATUS_BODY = '<tptz:GetStatus><tptz:ProfileToken>{profile}</tptz:ProfileToken></tptz:GetStatus>'
+
+# Answers meaning that camera does not accept request built without zeep (not transient errors)
+_REJECTING_FAULT_CODES = frozenset({'ActionNotSupported', 'NotAuthorized', 'FailedAuthentication', 'InvalidSecurity',
+                                    'InvalidSecurityToken', 'FailedCheck'})
+_REJECTING_HTTP_STATUSES = frozenset({401, 403, 404, 405, 415, 501})
+
+
+class FastPtzDriver:
+    """
+    PTZ commands sent as prebuilt SOAP envelopes over keep-alive HTTP connection (without zeep)
+    """
+    _host: str = ''
+    _port: int = 80
+    _path: str = '/'
+    _secure: bool = False
+    _host_header: str = ''
+    _username: str = ''
+    _password: str = ''
+    _connect_timeout: float = 10.0
+    _read_timeout: float = 10.0
+    _time_offset: datetime.timedelta | None = None
+    _templates: dict | None = None
+    _connection: http.client.HTTPConnection | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def timeout(self) -> tuple:
+        return self._connect_timeout, self._read_timeout
+
+    @timeout.setter
+    def timeout(self, value: float | tuple) -> None:
+        """
+        Changing timeouts of next requests (seconds or tuple of connect and read timeouts)
+        """
+        if isinstance(value, (int, float)):
+            value = (value, value)
+        if not (isinstance(value, tuple) and len(value) == 2 and
+                all(isinstance(item, (int, float)) and item > 0 for item in value)):
+            return None
+        with self._lock:
+            self._connect_timeout, self._read_timeout = value
+            if self._connection is not None and self._connection.sock is not None:
+                self._connection.sock.settimeout(self._read_timeout)
+
+    def __init__(self, ptz_address: str, profile_token: str, username: str, password: str,
+                 timeout: float | tuple = 10.0, time_offset: datetime.timedelta | None = None):
+        """
+        :param ptz_address: URL of PTZ service on camera (XAddr)
+        :param profile_token: Token of media profile
+        :param username: ONVIF username
+        :param password: ONVIF user password
+        :param timeout: Connection and reading timeout (seconds or tuple of connect and read timeouts)
+        :param time_offset: Difference between camera and local time for WS-UsernameToken
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not (isinstance(ptz_address, str) and isinstance(profile_token, str) and isinstance(username, str) and
+                isinstance(password, str)):
+            raise exceptions.IncorrectArgsError
+        if isinstance(timeout, (int, float)):
+            timeout = (timeout, timeout)
+        if not (isinstance(timeout, tuple) and len(timeout) == 2 and
+                all(isinstance(value, (int, float)) and value > 0 for value in timeout)):
+            raise exceptions.IncorrectArgsError
+        url = urllib.parse.urlsplit(ptz_address)
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise exceptions.IncorrectArgsError
+        self._secure = url.scheme == 'https'
+        self._host = url.hostname
+        self._port = url.port or (443 if self._secure else 80)
+        self._host_header = url.netloc.rsplit('@', 1)[-1]
+        self._path = url.path or '/'
+        if url.query:
+            self._path += '?' + url.query
+        self._username = username
+        self._password = password
+        self._connect_timeout, self._read_timeout = timeout
+        self._time_offset = time_offset
+        profile = saxutils.escape(profile_token)
+        self._templates = {
+            'GotoPreset': _GOTO_PRESET_BODY.format(profile=profile),
+            'Stop': _STOP_BODY.format(profile=profile),
+            'ContinuousMove': _CONTINUOUS_MOVE_BODY.format(profile=profile),
+            'GetStatus': _GET_STATUS_BODY.format(profile=profile),
+        }
+        self._lock = threading.Lock()
+
+    def goto_preset(self, preset_number: int) -> None:
+        """
+        Moving camera to preset
+        :param preset_number: Preset number (token)
+        :exception exceptions.CameraRequestRejectedError: Request not accepted by camera (zeep must be used)
+        :exception exceptions.CameraMoveError: Request failed
+        """
+        self._send('GotoPreset', self._templates['GotoPreset'].format(preset=int(preset_number)))
+
+    def stop(self, pan_tilt: bool = True, zoom: bool = True) -> None:
+        """
+        Stopping camera movement
+        :param pan_tilt: Stop pan and tilt
+        :param zoom: Stop zoom
+        :exception exceptions.CameraMoveError: Request failed
+        """
+        self._send('Stop', self._templates['Stop'].format(pan_tilt=str(bool(pan_tilt)).lower(),
+                                                          zoom=str(bool(zoom)).lower()))
+
+    def continuous_move(self, pan: float, tilt: float, zoom: float = 0.0) -> None:
+        """
+        Starting continuous camera movement
+        :param pan: Pan velocity (-1.0 .. 1.0)
+        :param tilt: Tilt velocity (-1.0 .. 1.0)
+        :param zoom: Zoom velocity (-1.0 .. 1.0)
+        :exception exceptions.CameraMoveError: Request failed
+        """
+        self._send('ContinuousMove', self._templates['ContinuousMove'].format(pan=float(pan), tilt=float(tilt),
+                                                                              zoom=float(zoom)))
+
+    def get_status(self) -> dict:
+        """
+        Requesting PTZ status
+        :return: Dictionary with keys "pan", "tilt", "zoom" (None if unknown), "pan_tilt_status" and "zoom_status"
+        :exception exceptions.CameraMoveError: Request failed
+        """
+        root = self._send('GetStatus', self._templates['GetStatus'])
+        status = {'pan': None, 'tilt': None, 'zoom': None, 'pan_tilt_status': None, 'zoom_status': None}
+        pan_tilt = root.find(f'.//{{{_SCHEMA_NS}}}Position/{{{_SCHEMA_NS}}}PanTilt')
+        if pan_tilt is not None:
+            status['pan'] = float(pan_tilt.get('x', 0.0))
+            status['tilt'] = float(pan_tilt.get('y', 0.0))
+        zoom = root.find(f'.//{{{_SCHEMA_NS}}}Position/{{{_SCHEMA_NS}}}Zoom')
+        if zoom is not None:
+            status['zoom'] = float(zoom.get('x', 0.0))
+        status['pan_tilt_status'] = root.findtext(f'.//{{{_SCHEMA_NS}}}MoveStatus/{{{_SCHEMA_NS}}}PanTilt')
+        status['zoom_status'] = root.findtext(f'.//{{{_SCHEMA_NS}}}MoveStatus/{{{_SCHEMA_NS}}}Zoom')
+        return status
+
+    def close(self) -> None:
+        """
+        Closing HTTP connection
+        """
+        with self._lock:
+            self._close_connection()
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _security_header(self) -> str:
+        nonce = os.urandom(16)
+        created_time = datetime.datetime.now(datetime.timezone.utc)
+        if self._time_offset is not None:
+            created_time += self._time_offset
+        created = created_time.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        digest = hashlib.sha1(nonce + created.encode('UTF-8') + self._password.encode('UTF-8')).digest()
+        return _SECURITY_HEADER.format(username=saxutils.escape(self._username),
+                                       digest=base64.b64encode(digest).decode('ascii'),
+                                       nonce=base64.b64encode(nonce).decode('ascii'),
+                                       created=created)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self._secure:
+            connection = http.client.HTTPSConnection(self._host, self._port, timeout=self._connect_timeout)
+        else:
+            connection = http.client.HTTPConnection(transport_pool.DnsCache().resolve(self._host), self._port,
+                                                    timeout=self._connect_timeout)
+        connection.connect()
+        connection.sock.settimeout(self._read_timeout)
+        return connection
+
+    def _send(self, operation: str, body: str) -> ElementTree.Element:
+        envelope = (_ENVELOPE_HEAD + self._security_header() + _ENVELOPE_BODY + body + _ENVELOPE_TAIL).encode('UTF-8')
+        headers = {'Host': self._host_header,
+                   'Content-Type': f'application/soap+xml; charset=utf-8; action="{_PTZ_NS}/{operation}"',
+                   'Connection': 'keep-alive'}
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._connection is None:
+                        self._connection = self._new_connection()
+                    self._connection.request('POST', self._path, body=envelope, headers=headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    if response.will_close:
+                        self._close_connection()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                    # Keep-alive connection closed by camera - reconnecting once
+                    self._close_connection()
+                    if attempt > 0:
+                        raise exceptions.CameraMoveError(f'{operation} request failed: {e}')
+                except (OSError, http.client.HTTPException) as e:
+                    self._close_connection()
+                    raise exceptions.CameraMoveError(f'{operation} request failed: {e}')
+        try:
+            root = ElementTree.fromstring(data)
+        except ElementTree.ParseError as e:
+            if response.status in _REJECTING_HTTP_STATUSES:
+                raise exceptions.CameraRequestRejectedError(f'{operation} request rejected (HTTP {response.status})')
+            raise exceptions.CameraMoveError(f'Wrong {operation} answer (HTTP {response.status}): {e}')
+        fault = root.find(f'.//{{{_SOAP_ENVELOPE_NS}}}Fault')
+        if fault is not None or response.status != 200:
+            reason = None
+            codes = set()
+            if fault is not None:
+                reason = fault.findtext(f'.//{{{_SOAP_ENVELOPE_NS}}}Text')
+                # Fault code and subcodes are qualified names ("ter:ActionNotSupported")
+                codes = {value.text.strip().rsplit(':', 1)[-1]
+                         for value in fault.iter(f'{{{_SOAP_ENVELOPE_NS}}}Value') if value.text}
+            if response.status in _REJECTING_HTTP_STATUSES or not codes.isdisjoint(_REJECTING_FAULT_CODES):
+                raise exceptions.CameraRequestRejectedError(f'{operation} request rejected '
+                                                            f'(HTTP {response.status}): {reason}')
+            raise exceptions.CameraMoveError(f'{operation} request failed (HTTP {response.status}): {reason}')
+        return root
@@ -2,6 +2,7 @@
 
 
 import dataclasses
+import threading
 import base64
 import json
 import os
@@ -15,11 +16,25 @@ except ModuleNotFoundError:
     _SYSLOG_AVAILABLE = False
 
 
-import keyboard_sniffer
+import transport_pool
 import exceptions
 import logger
 
 
+# Configuration file format version (version 1 files have no version field and camera numbers 0-9)
+CONFIG_VERSION: int = 2
+MAX_CAMERA_NUMBER: int = 999
+_V1_MAX_CAMERA_NUMBER: int = 9
+
+
+def _key_text_exist(key_text: str) -> bool:
+    """
+    Checking hot key text by keyboard sniffer (imported on first check, keyboard_sniffer module imports settings)
+    """
+    import keyboard_sniffer
+    return keyboard_sniffer.KeyboardSniffer.key_text_exist(key_text)
+
+
 @dataclasses.dataclass
 class CameraData:
     number: int
@@ -31,6 +46,10 @@ class CameraData:
     password: str
     max_count: int
     preset: int
+    fast_path: bool = dataclasses.field(default=False)
+    connect_timeout: float = dataclasses.field(default=2.0)
+    read_timeout: float = dataclasses.field(default=5.0)
+    deadline: float = dataclasses.field(default=10.0)
 
     def convert_to_dict(self) -> dict:
         """
@@ -40,7 +59,7 @@ class CameraData:
         """
         if not isinstance(self.number, int):
             raise exceptions.IncorrectData('Camera number is not integer!')
-        if self.number < 0 or self.number > 9:
+        if self.number < 0 or self.number > MAX_CAMERA_NUMBER:
             raise exceptions.IncorrectData(f'Incorrect camera number value ({self.number})!')
         if not isinstance(self.activated, bool):
             raise exceptions.IncorrectData(f'Incorrect activated state type for camera №{self.number}!')
@@ -52,7 +71,7 @@ class CameraData:
                 raise exceptions.IncorrectData(f'Wrong type of hot key №{index} for camera №{self.number}!')
             if len(hot_key) == 0:
                 raise exceptions.IncorrectData(f'Empty hot key №{index} for camera №{self.number}!')
-            if not keyboard_sniffer.KeyboardSniffer.key_text_exist(hot_key):
+            if not _key_text_exist(hot_key):
                 raise exceptions.IncorrectData(f'Wrong hot key value №{index} for camera №{self.number}!')
             index += 1
         if not isinstance(self.address, str):
@@ -77,6 +96,14 @@ class CameraData:
             raise exceptions.IncorrectData(f'Incorrect preset number for camera №{self.number}')
         if self.preset > self.max_count:
             raise exceptions.IncorrectData(f'Incorrect preset number for camera №{self.number}')
+        if not isinstance(self.fast_path, bool):
+            raise exceptions.IncorrectData(f'Incorrect fast path state type for camera №{self.number}')
+        if not isinstance(self.connect_timeout, (int, float)) or self.connect_timeout <= 0:
+            raise exceptions.IncorrectData(f'Incorrect connect timeout for camera №{self.number}')
+        if not isinstance(self.read_timeout, (int, float)) or self.read_timeout <= 0:
+            raise exceptions.IncorrectData(f'Incorrect read timeout for camera №{self.number}')
+        if not isinstance(self.deadline, (int, float)) or self.deadline < 0:
+            raise exceptions.IncorrectData(f'Incorrect command deadline for camera №{self.number}')
         return {'number': self.number,
                 'activated': self.activated,
                 'hot-keys': self.hot_keys,
@@ -85,14 +112,19 @@ class CameraData:
                 'username': self.username,
                 'password': base64.b64encode(self.password.encode('UTF-8')).decode('UTF-8'),
                 'max-count': self.max_count,
-                'preset': self.preset
+                'preset': self.preset,
+                'fast-path': self.fast_path,
+                'connect-timeout': self.connect_timeout,
+                'read-timeout': self.read_timeout,
+                'deadline': self.deadline
                 }
 
     @staticmethod
-    def from_dict(data: dict):
+    def from_dict(data: dict, max_number: int = MAX_CAMERA_NUMBER):
         """
         Dictionary to CameraData object converter
         :param data: Dictionary with camera data
+        :param max_number: Maximum camera number (depends on configuration file version)
         :return: CameraData object
         :exception exceptions.IncorrectArgsError: Wrong data type (waiting dict)
         :exception exceptions.IncorrectData: Not found or wrong required parameter
@@ -102,7 +134,7 @@ class CameraData:
         number = data.get('number')
         if not isinstance(number, int):
             raise exceptions.IncorrectData('Not found or wrong type camera number!')
-        if number < 0 or number > 9:
+        if number < 0 or number > max_number:
             raise exceptions.IncorrectData(f'Incorrect camera number ({number})!')
         if not isinstance(data.get('activated'), bool):
             raise exceptions.IncorrectData(f'Not found or wrong activation state type for camera №{number}!')
@@ -115,7 +147,7 @@ class CameraData:
                 raise exceptions.IncorrectData(f'Wrong type of hot key №{index} for camera №{number}!')
             if len(hot_key) == 0:
                 raise exceptions.IncorrectData(f'Empty hot key №{index} for camera №{number}!')
-            if not keyboard_sniffer.KeyboardSniffer.key_text_exist(hot_key):
+            if not _key_text_exist(hot_key):
                 raise exceptions.IncorrectData(f'Wrong hot key №{index} for camera №{number}!')
             index += 1
         if not isinstance(data.get('address'), str):
@@ -142,6 +174,17 @@ class CameraData:
             raise exceptions.IncorrectData(f'Not found or wrong preset type for camera №{number}!')
         if data.get('preset') > data.get('max-count') or data.get('preset') < 1:
             raise exceptions.IncorrectData(f'Wrong preset value for camera №{number}')
+        if not isinstance(data.get('fast-path', False), bool):
+            raise exceptions.IncorrectData(f'Wrong fast path state type for camera №{number}')
+        connect_timeout = data.get('connect-timeout', 2.0)
+        if not isinstance(connect_timeout, (int, float)) or connect_timeout <= 0:
+            raise exceptions.IncorrectData(f'Wrong connect timeout for camera №{number}')
+        read_timeout = data.get('read-timeout', 5.0)
+        if not isinstance(read_timeout, (int, float)) or read_timeout <= 0:
+            raise exceptions.IncorrectData(f'Wrong read timeout for camera №{number}')
+        deadline = data.get('deadline', 10.0)
+        if not isinstance(deadline, (int, float)) or deadline < 0:
+            raise exceptions.IncorrectData(f'Wrong command deadline for camera №{number}')
         return CameraData(number=data.get('number'),
                           activated=data.get('activated'),
                           hot_keys=data.get('hot-keys'),
@@ -150,15 +193,72 @@ class CameraData:
                           username=data.get('username'),
                           password=password,
                           max_count=data.get('max-count'),
-                          preset=data.get('preset')
+                          preset=data.get('preset'),
+                          fast_path=data.get('fast-path', False),
+                          connect_timeout=connect_timeout,
+                          read_timeout=read_timeout,
+                          deadline=deadline
                           )
 
 
+@dataclasses.dataclass
+class SettingsDiff:
+    """
+    Difference between two SettingsData objects
+    """
+    added: list = dataclasses.field(default_factory=list)
+    removed: list = dataclasses.field(default_factory=list)
+    changed: list = dataclasses.field(default_factory=list)
+    options: set = dataclasses.field(default_factory=set)
+
+    @property
+    def cameras_changed(self) -> bool:
+        return len(self.added) > 0 or len(self.removed) > 0 or len(self.changed) > 0
+
+    @property
+    def empty(self) -> bool:
+        return not self.cameras_changed and len(self.options) == 0
+
+
 @dataclasses.dataclass
 class SettingsData:
     cameras: list | None = dataclasses.field(default=None)
     log_level: logger.LogLevel = dataclasses.field(default=logger.LogLevel.DISABLE_LOG)
     log_path: str = dataclasses.field(default='MoveMyCam.log', init=False)
+    log_max_size: int = dataclasses.field(default=10485760)
+    log_max_age: float = dataclasses.field(default=604800.0)
+    log_retention: int = dataclasses.field(default=5)
+    json_log_path: str = dataclasses.field(default='')
+    http_pool_size: int = dataclasses.field(default=16)
+    http_host_connections: int = dataclasses.field(default=2)
+    dns_ttl: float = dataclasses.field(default=300.0)
+    health_check_interval: float = dataclasses.field(default=30.0)
+    circuit_failures: int = dataclasses.field(default=3)
+    circuit_reset_timeout: float = dataclasses.field(default=30.0)
+    latency_summary_interval: float = dataclasses.field(default=300.0)
+    metrics_address: str = dataclasses.field(default='127.0.0.1')
+    metrics_port: int = dataclasses.field(default=0)
+    config_watch_interval: float = dataclasses.field(default=1.0)
+
+    def diff(self, other):
+        """
+        Comparing current (old) settings with other (new) settings, cameras are matched by number
+        :param other: SettingsData object with new settings
+        :return: SettingsDiff object
+        :exception exceptions.IncorrectArgsError: Wrong settings data type
+        """
+        if not isinstance(other, SettingsData):
+            raise exceptions.IncorrectArgsError
+        old_cameras = {camera.number: camera for camera in (self.cameras or list())}
+        new_cameras = {camera.number: camera for camera in (other.cameras or list())}
+        changes = SettingsDiff()
+        changes.added = [camera for number, camera in new_cameras.items() if number not in old_cameras]
+        changes.removed = [camera for number, camera in old_cameras.items() if number not in new_cameras]
+        changes.changed = [(old_cameras[number], camera) for number, camera in new_cameras.items()
+                           if number in old_cameras and old_cameras[number] != camera]
+        changes.options = {field.name for field in dataclasses.fields(self)
+                           if field.name != 'cameras' and getattr(self, field.name) != getattr(other, field.name)}
+        return changes
 
     def convert_to_dict(self):
         cameras_list = list()
@@ -166,8 +266,23 @@ class SettingsData:
             for camera in self.cameras:
                 cameras_list.append(camera.convert_to_dict())
         data = {
+            'version': CONFIG_VERSION,
             'cameras': cameras_list,
-            'log_level': self.log_level.value
+            'log_level': self.log_level.value,
+            'log_max_size': self.log_max_size,
+            'log_max_age': self.log_max_age,
+            'log_retention': self.log_retention,
+            'json_log_path': self.json_log_path,
+            'http_pool_size': self.http_pool_size,
+            'http_host_connections': self.http_host_connections,
+            'dns_ttl': self.dns_ttl,
+            'health_check_interval': self.health_check_interval,
+            'circuit_failures': self.circuit_failures,
+            'circuit_reset_timeout': self.circuit_reset_timeout,
+            'latency_summary_interval': self.latency_summary_interval,
+            'metrics_address': self.metrics_address,
+            'metrics_port': self.metrics_port,
+            'config_watch_interval': self.config_watch_interval
         }
         if not _SYSLOG_AVAILABLE:
             data['log_path'] = self.log_path
@@ -176,20 +291,82 @@ class SettingsData:
     @staticmethod
     def from_dict(data: dict):
         settings_data = SettingsData()
+        version = data.get('version', 1)
+        if not isinstance(version, int) or version < 1:
+            raise exceptions.IncorrectData('Wrong configuration file version!')
+        if version > CONFIG_VERSION:
+            raise exceptions.IncorrectData(f'Configuration file version {version} not supported '
+                                           f'(maximum {CONFIG_VERSION})!')
         cameras_list = data.get('cameras', list())
-        cameras_list_out = list()
         if not isinstance(cameras_list, list):
             raise exceptions.IncorrectData('Cameras not a list!')
+        max_number = _V1_MAX_CAMERA_NUMBER if version == 1 else MAX_CAMERA_NUMBER
+        cameras = dict()
         for camera in cameras_list:
-            cameras_list_out.append(CameraData.from_dict(camera))
-        settings_data.cameras = cameras_list_out
+            camera = CameraData.from_dict(camera, max_number)
+            if camera.number not in cameras:
+                cameras[camera.number] = camera
+            elif version == 1:
+                # Version 1 files were not checked for duplicates: first camera was used by settings window
+                logger.Logger().warning('Duplicate camera number %d in configuration file skipped', camera.number)
+            else:
+                raise exceptions.IncorrectData(f'Duplicate camera number ({camera.number})!')
+        settings_data.cameras = list(cameras.values())
         settings_data.log_level = logger.LogLevel(int(data.get('log_level', logger.LogLevel.DISABLE_LOG.value)))
+        settings_data.log_max_size = data.get('log_max_size', settings_data.log_max_size)
+        if not isinstance(settings_data.log_max_size, int) or settings_data.log_max_size < 0:
+            raise exceptions.IncorrectData('Wrong maximum log file size!')
+        settings_data.log_max_age = data.get('log_max_age', settings_data.log_max_age)
+        if not isinstance(settings_data.log_max_age, (int, float)) or settings_data.log_max_age < 0:
+            raise exceptions.IncorrectData('Wrong maximum log file age!')
+        settings_data.log_retention = data.get('log_retention', settings_data.log_retention)
+        if not isinstance(settings_data.log_retention, int) or settings_data.log_retention < 0:
+            raise exceptions.IncorrectData('Wrong count of kept log files!')
+        settings_data.json_log_path = data.get('json_log_path', settings_data.json_log_path)
+        if not isinstance(settings_data.json_log_path, str):
+            raise exceptions.IncorrectData('Wrong JSON log file path!')
+        settings_data.http_pool_size = data.get('http_pool_size', settings_data.http_pool_size)
+        if not isinstance(settings_data.http_pool_size, int) or settings_data.http_pool_size < 1:
+            raise exceptions.IncorrectData('Wrong HTTP pool size!')
+        settings_data.http_host_connections = data.get('http_host_connections', settings_data.http_host_connections)
+        if not isinstance(settings_data.http_host_connections, int) or settings_data.http_host_connections < 1:
+            raise exceptions.IncorrectData('Wrong count of HTTP connections to host!')
+        settings_data.dns_ttl = data.get('dns_ttl', settings_data.dns_ttl)
+        if not isinstance(settings_data.dns_ttl, (int, float)) or settings_data.dns_ttl < 0:
+            raise exceptions.IncorrectData('Wrong DNS cache TTL!')
+        settings_data.health_check_interval = data.get('health_check_interval', settings_data.health_check_interval)
+        if not isinstance(settings_data.health_check_interval, (int, float)) or settings_data.health_check_interval < 0:
+            raise exceptions.IncorrectData('Wrong health check interval!')
+        settings_data.circuit_failures = data.get('circuit_failures', settings_data.circuit_failures)
+        if not isinstance(settings_data.circuit_failures, int) or settings_data.circuit_failures < 1:
+            raise exceptions.IncorrectData('Wrong count of failures opening camera circuit!')
+        settings_data.circuit_reset_timeout = data.get('circuit_reset_timeout', settings_data.circuit_reset_timeout)
+        if not isinstance(settings_data.circuit_reset_timeout, (int, float)) or settings_data.circuit_reset_timeout < 0:
+            raise exceptions.IncorrectData('Wrong camera circuit reset timeout!')
+        settings_data.latency_summary_interval = data.get('latency_summary_interval',
+                                                          settings_data.latency_summary_interval)
+        if not isinstance(settings_data.latency_summary_interval, (int, float)) or \
+                settings_data.latency_summary_interval < 0:
+            raise exceptions.IncorrectData('Wrong latency summary interval!')
+        settings_data.metrics_address = data.get('metrics_address', settings_data.metrics_address)
+        if not isinstance(settings_data.metrics_address, str) or len(settings_data.metrics_address) == 0:
+            raise exceptions.IncorrectData('Wrong metrics endpoint address!')
+        settings_data.metrics_port = data.get('metrics_port', settings_data.metrics_port)
+        if not isinstance(settings_data.metrics_port, int) or not 0 <= settings_data.metrics_port <= 65535:
+            raise exceptions.IncorrectData('Wrong metrics endpoint port!')
+        settings_data.config_watch_interval = data.get('config_watch_interval', settings_data.config_watch_interval)
+        if not isinstance(settings_data.config_watch_interval, (int, float)) or settings_data.config_watch_interval < 0:
+            raise exceptions.IncorrectData('Wrong configuration file watch interval!')
         if not _SYSLOG_AVAILABLE:
             settings_data.log_path = data.get('log_path', 'MoveMyCam.conf')
         return settings_data
 
 
 class Settings:
+    """
+    Configuration file data with cameras indexed by number and by address (cameras list of data is replaced by new
+    list under lock after every cameras change, readers never see partially changed list)
+    """
     __instance = None
     __initialized = False
 
@@ -197,13 +374,16 @@ class Settings:
 
     _file_path: str = ''
     _data: SettingsData | None = None
+    _cameras: dict | None = None
+    _addresses: dict | None = None
+    _camera_addresses: dict | None = None
+    _lock: threading.RLock = None
 
     @property
     def data(self) -> SettingsData:
         if self._data is None:
             return SettingsData()
-        else:
-            return self._data
+        return self._data
 
     @property
     def file_path(self) -> str:
@@ -211,16 +391,25 @@ class Settings:
 
     def __new__(cls, *args, **kwargs):
         if cls.__instance is None:
+            cls.__initialized = False
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
     def __init__(self, config_file_path: str | None = None, autoload: bool = True):
         """
-        :param config_file_path: Configuration file path
+        :param config_file_path: Configuration file path (None - default path on first initialization, current path
+                                 is kept later)
         :param autoload: Load configuration file when object initialize
         :exception exceptions.IncorrectArgsError: Wrong camera data type (waiting dictionary)
         :exception exceptions.IncorrectData: Not found or wrong required parameter in camera data
         """
+        if self.__initialized and config_file_path is None:
+            return
+        if not self.__initialized:
+            self._lock = threading.RLock()
+        self.__initialized = True
+        with self._lock:
+            self._rebuild_indexes()
         if config_file_path is None:
             self._file_path = self._DEFAULT_FILE_PATH
         elif isinstance(config_file_path, str) and len(config_file_path) > 0:
@@ -239,17 +428,18 @@ class Settings:
         """
         if not isinstance(number, int):
             raise exceptions.IncorrectArgsError
-        if number < 0 or number > 9:
+        if number < 0 or number > MAX_CAMERA_NUMBER:
             raise exceptions.IncorrectArgsError
-        if not isinstance(self._data, SettingsData):
-            return None
-        if not isinstance(self._data.cameras, list):
-            self._data.cameras = list()
-            return None
-        for camera in self._data.cameras:
-            if camera.number == number:
-                return camera
-        return None
+        return self._cameras.get(number)
+
+    def get_cameras_by_address(self, address: str, port: int) -> list:
+        """
+        Receiving cameras data by camera address
+        :param address: Camera address
+        :param port: Camera port
+        :return: List of CameraData objects (empty - cameras not found)
+        """
+        return list(self._addresses.get((address, port), dict()).values())
 
     def insert_camera(self, camera: CameraData, replace: bool = False) -> bool:
         """
@@ -266,20 +456,16 @@ class Settings:
                 isinstance(camera.username, str) and isinstance(camera.password, str) and isinstance(camera.preset, int)
                 and isinstance(camera.max_count, int) and isinstance(camera.activated, bool)):
             raise exceptions.IncorrectArgsError
-        if camera.number < 1 or camera.number > 9 or len(camera.address) == 0 or camera.port < 1 or camera.preset < 0 \
-                or camera.max_count < camera.preset or camera.port > 65535:
+        if camera.number < 1 or camera.number > MAX_CAMERA_NUMBER or len(camera.address) == 0 or camera.port < 1 \
+                or camera.preset < 0 or camera.max_count < camera.preset or camera.port > 65535:
             raise exceptions.IncorrectData
-        if not isinstance(self._data, SettingsData):
-            self._data = SettingsData()
-        if not isinstance(self._data.cameras, list):
-            self._data.cameras = list()
-        for c in self._data.cameras:
-            if camera.number == c.number:
-                if replace:
-                    self._data.cameras.remove(c)
-                else:
-                    return False
-        self._data.cameras.append(camera)
+        with self._lock:
+            if not isinstance(self._data, SettingsData):
+                self._data = SettingsData()
+            if camera.number in self._cameras and not replace:
+                return False
+            self._index_camera(camera)
+            self._update_cameras_list()
         return True
 
     def remove_camera(self, number: int) -> bool:
@@ -291,28 +477,74 @@ class Settings:
         """
         if not isinstance(number, int):
             raise exceptions.IncorrectArgsError
-        if number < 1 or number > 9:
+        if number < 1 or number > MAX_CAMERA_NUMBER:
             raise exceptions.IncorrectArgsError
-        if not isinstance(self._data, SettingsData):
-            return True
-        if not isinstance(self._data.cameras, list):
-            return True
-        for camera in self._data.cameras:
-            if camera.number == number:
-                self._data.cameras.remove(camera)
+        with self._lock:
+            if not isinstance(self._data, SettingsData):
                 return True
-        return False
+            if number not in self._cameras:
+                return False
+            self._unindex_camera(number)
+            self._update_cameras_list()
+        return True
 
     def clear_data(self) -> None:
         """
         Clearing camera list
         """
-        if not isinstance(self._data, SettingsData):
-            return None
-        if isinstance(self._data.cameras, list):
-            self._data.cameras.clear()
-        else:
-            self._data.cameras = list()
+        with self._lock:
+            if not isinstance(self._data, SettingsData):
+                return None
+            self._cameras.clear()
+            self._camera_addresses.clear()
+            self._addresses.clear()
+            self._update_cameras_list()
+
+    def _index_camera(self, camera: CameraData) -> None:
+        """
+        Adding camera to indexes (replaced camera keeps its position in cameras list)
+        """
+        if camera.number in self._camera_addresses:
+            self._remove_address(camera.number)
+        address = (camera.address, camera.port)
+        self._cameras[camera.number] = camera
+        self._camera_addresses[camera.number] = address
+        self._addresses.setdefault(address, dict())[camera.number] = camera
+
+    def _unindex_camera(self, number: int) -> None:
+        self._remove_address(number)
+        del self._cameras[number]
+
+    def _update_cameras_list(self) -> None:
+        """
+        Replacing cameras list of data by cameras from number index (called with lock)
+        """
+        self._data.cameras = list(self._cameras.values())
+
+    def _remove_address(self, number: int) -> None:
+        """
+        Removing camera from address index (indexed address is saved, camera data may be changed in place)
+        """
+        address = self._camera_addresses.pop(number)
+        cameras = self._addresses[address]
+        del cameras[number]
+        if len(cameras) == 0:
+            del self._addresses[address]
+
+    def _rebuild_indexes(self) -> None:
+        """
+        Building indexes from cameras list of loaded data (new indexes replace old ones after building, other
+        threads never see partially built index)
+        """
+        cameras = dict()
+        camera_addresses = dict()
+        addresses = dict()
+        if isinstance(self._data, SettingsData) and isinstance(self._data.cameras, list):
+            for camera in self._data.cameras:
+                cameras[camera.number] = camera
+                camera_addresses[camera.number] = (camera.address, camera.port)
+                addresses.setdefault((camera.address, camera.port), dict())[camera.number] = camera
+        self._cameras, self._camera_addresses, self._addresses = cameras, camera_addresses, addresses
 
     def save(self) -> bool:
         """
@@ -322,16 +554,14 @@ class Settings:
         """
         if not isinstance(self._data, SettingsData):
             return False
-        if not isinstance(self._data.cameras, list):
-            return False
-        if len(self._data.cameras) == 0:
+        if len(self._cameras) == 0:
             return False
         try:
             with open(self._file_path, 'w', encoding='UTF-8') as f:
-                json.dump(self._data.convert_to_dict(), f)
+                json.dump(self.data.convert_to_dict(), f)
                 return True
         except Exception as e:
-            logger.Logger().error(f'Configuration file not saved! Exception text: {str(e)}')
+            logger.Logger().error('Configuration file not saved! Exception text: %s', e)
             return False
 
     def load(self) -> bool:
@@ -352,11 +582,18 @@ class Settings:
             pre_print_state = logger.Logger().print_log
             logger.Logger().print_log = True
             logger.Logger().error('Reading configuration file failed!')
-            logger.Logger().debug(f'Exception text: {e}')
+            logger.Logger().debug('Exception text: %s', e)
             logger.Logger().print_log = pre_print_state
             return False
-        self._data = SettingsData.from_dict(dict_data)
+        data = SettingsData.from_dict(dict_data)
+        with self._lock:
+            self._data = data
+            self._rebuild_indexes()
         logger.Logger().log_level = self._data.log_level
+        logger.Logger().set_rotation(self._data.log_max_size, self._data.log_max_age, self._data.log_retention)
+        logger.Logger().json_file_path = self._data.json_log_path
+        transport_pool.TransportPool().configure(self._data.http_pool_size, self._data.http_host_connections,
+                                                 self._data.dns_ttl)
         if not _SYSLOG_AVAILABLE:
             logger.Logger().file_path = self._data.log_path
         return True
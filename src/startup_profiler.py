@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+
+import importlib.abc
+import threading
+import time
+import sys
+
+
+import logger
+
+
+class _TimingLoader:
+    """
+    Loader wrapper measuring module execution time (original loader restored in module before execution)
+    """
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        return None if create_module is None else create_module(spec)
+
+    def exec_module(self, module) -> None:
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler.measure(module.__name__, self._loader.exec_module, module)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder wrapping loaders of found modules by _TimingLoader
+    """
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname: str, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimingLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Import time of every module and program milestones (time since start of program) reported once all
+    expected milestones are reached
+    """
+    __instance = None
+    __initialized = False
+
+    _enabled: bool = False
+    _reported: bool = False
+    _start_time: float = 0.0
+    _budget: float = 0.0
+    _finder: _TimingFinder | None = None
+    _imports: dict | None = None
+    _milestones: dict | None = None
+    _expected: set | None = None
+    _stacks: threading.local | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def budget(self) -> float:
+        """
+        Maximum time (seconds) to every milestone, warning reported if exceeded (0 - no budget)
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value >= 0:
+            self._budget = value
+
+    @property
+    def milestones(self) -> dict:
+        """
+        :return: Dictionary {milestone name: seconds since start of program}
+        """
+        with self._lock:
+            return dict(self._milestones)
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._imports = dict()
+        self._milestones = dict()
+        self._expected = set()
+        self._stacks = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self, start_time: float | None = None) -> None:
+        """
+        Start measuring imports (only modules imported after start are measured)
+        :param start_time: time.perf_counter value of program start (None - current time)
+        """
+        if self._enabled:
+            return None
+        self._start_time = time.perf_counter() if start_time is None else start_time
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+        self._enabled = True
+
+    def stop(self) -> None:
+        """
+        Stop measuring imports (results are kept)
+        """
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def expect(self, *names: str) -> None:
+        """
+        Adding milestones waited before automatic report
+        :param names: Milestones names
+        """
+        with self._lock:
+            self._expected.update(names)
+
+    def measure(self, name: str, function, *args) -> None:
+        """
+        Executing module code with measuring self (without nested imports) and cumulative time. Self time includes
+        waiting for modules imported by other threads at the same time
+        :param name: Module name
+        :param function: Module execution function
+        """
+        stack = getattr(self._stacks, 'stack', None)
+        if stack is None:
+            stack = self._stacks.stack = list()
+        stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            function(*args)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            nested = stack.pop()
+            if len(stack) > 0:
+                stack[-1] += elapsed
+            with self._lock:
+                self._imports[name] = (elapsed - nested, elapsed, threading.current_thread().name)
+
+    def mark(self, name: str) -> None:
+        """
+        Saving time of milestone (only first time is saved, nothing is done while profiler is disabled)
+        :param name: Milestone name
+        """
+        if not self._enabled:
+            return None
+        with self._lock:
+            if name in self._milestones:
+                return None
+            self._milestones[name] = time.perf_counter() - self._start_time
+            done = len(self._expected) > 0 and self._expected.issubset(self._milestones.keys())
+        if done:
+            self.report()
+
+    def summary(self, limit: int = 15) -> list:
+        """
+        Slowest imports and milestones
+        :param limit: Count of modules in summary
+        :return: List of text lines
+        """
+        with self._lock:
+            imports = dict(self._imports)
+            milestones = dict(self._milestones)
+        lines = [f'Imported {len(imports)} modules, {sum(own for own, _, _ in imports.values()) * 1000:.0f} ms']
+        slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        for name, (own, cumulative, thread) in slowest:
+            thread = '' if thread == threading.main_thread().name else f' [{thread}]'
+            lines.append(f'{cumulative * 1000:8.1f} ms (self {own * 1000:6.1f} ms) {name}{thread}')
+        for name, elapsed in sorted(milestones.items(), key=lambda item: item[1]):
+            lines.append(f'{name}: {elapsed * 1000:.0f} ms')
+        return lines
+
+    def report(self) -> None:
+        """
+        Stop measuring, write summary to log and console (once, console skipped if log is printed)
+        """
+        with self._lock:
+            if not self._enabled or self._reported:
+                return None
+            self._reported = True
+        self.stop()
+        lines = self.summary()
+        for line in lines:
+            logger.Logger().info('Startup %s', line)
+        if not logger.Logger().print_log:
+            print('Startup profile:\n  ' + '\n  '.join(lines))
+        if self._budget == 0:
+            return None
+        for name, elapsed in self.milestones.items():
+            if elapsed > self._budget:
+                text = f'Startup budget exceeded: {name} {elapsed * 1000:.0f} ms (budget {self._budget * 1000:.0f} ms)'
+                logger.Logger().warning(text)
+                if not logger.Logger().print_log:
+                    print(text)
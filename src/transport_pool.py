@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+
+import urllib.parse
+import collections
+import ipaddress
+import threading
+import socket
+import time
+
+
+import exceptions
+import logger
+
+
+# Module requests, HTTP adapter and zeep transport classes (imported on first transport request)
+_http_modules: tuple | None = None
+_http_modules_lock = threading.Lock()
+
+
+class DnsCache:
+    """
+    Resolved camera host names with limited lifetime
+    """
+    __instance = None
+    __initialized = False
+
+    _ttl: float = 300.0
+    _entries: dict | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value >= 0:
+            self._ttl = value
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._entries = dict()
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str) -> str:
+        """
+        Getting IP address of host
+        :param host: Host name or IP address
+        :return: IP address (host itself if resolving failed)
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        try:
+            address = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)[0][4][0]
+        except (socket.gaierror, IndexError) as e:
+            logger.Logger().debug('Resolving host "%s" failed: %s', host, e)
+            return host
+        with self._lock:
+            self._entries[host] = (address, now + self._ttl)
+        return address
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def resolve_url(url: str) -> tuple:
+    """
+    Replacing host name in HTTP URL by cached IP address
+    :param url: Request URL
+    :return: URL with IP address and original host (None if URL not changed)
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme != 'http' or not parts.hostname:
+        return url, None
+    address = DnsCache().resolve(parts.hostname)
+    if address == parts.hostname:
+        return url, None
+    netloc = f'[{address}]' if ':' in address else address
+    if parts.port is not None:
+        netloc += f':{parts.port}'
+    return urllib.parse.urlunsplit(parts._replace(netloc=netloc)), parts.netloc.rsplit('@', 1)[-1]
+
+
+def _import_http_modules() -> tuple:
+    """
+    Importing requests and zeep on demand (slowest imports of program, not needed before first camera request)
+    :return: Module requests, HTTP adapter class with DNS cache and zeep transport class with per thread timeout
+    """
+    global _http_modules
+    with _http_modules_lock:
+        if _http_modules is not None:
+            return _http_modules
+        try:
+            import requests.adapters
+            import zeep.transports
+        except ModuleNotFoundError:
+            print('Module zeep not found! Please install required modules from file "requirements.txt"')
+            exit(1)
+        except Exception as e:
+            print(f'Import module zeep failed ({e})!')
+            exit(1)
+
+        class DnsCachingAdapter(requests.adapters.HTTPAdapter):
+            """
+            HTTP adapter connecting to IP address from DNS cache (original host sent in "Host" header)
+            """
+
+            def send(self, request, **kwargs):
+                url, host = resolve_url(request.url)
+                if host is not None:
+                    request.url = url
+                    request.headers['Host'] = host
+                return super().send(request, **kwargs)
+
+        class ThreadTimeoutTransport(zeep.transports.Transport):
+            """
+            zeep transport with timeout of ONVIF requests kept per thread (controllers of one camera host share
+            transport and move cameras in parallel with different timeouts)
+            """
+
+            def __init__(self, *args, **kwargs):
+                self._timeouts = threading.local()
+                super().__init__(*args, **kwargs)
+
+            @property
+            def operation_timeout(self):
+                return getattr(self._timeouts, 'value', None)
+
+            @operation_timeout.setter
+            def operation_timeout(self, value) -> None:
+                self._timeouts.value = value
+
+        _http_modules = (requests, DnsCachingAdapter, ThreadTimeoutTransport)
+        return _http_modules
+
+
+class TransportPool:
+    """
+    Keep-alive HTTP transports for zeep, one per camera host (shared by all ONVIF services of camera)
+    """
+    __instance = None
+    __initialized = False
+
+    _pool_size: int = 16
+    _host_connections: int = 2
+    _transports: collections.OrderedDict | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def host_connections(self) -> int:
+        return self._host_connections
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._transports = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, pool_size: int, host_connections: int, dns_ttl: float) -> None:
+        """
+        Changing pool limits (kept transports are closed, camera controllers take new transports on next request)
+        :param pool_size: Maximum count of hosts with kept transports
+        :param host_connections: Maximum count of kept connections to one host
+        :param dns_ttl: Lifetime (seconds) of resolved host names
+        :exception exceptions.IncorrectArgsError: Wrong argument(s) type or value
+        """
+        if not (isinstance(pool_size, int) and isinstance(host_connections, int) and
+                isinstance(dns_ttl, (int, float))):
+            raise exceptions.IncorrectArgsError
+        if pool_size < 1 or host_connections < 1 or dns_ttl < 0:
+            raise exceptions.IncorrectArgsError
+        DnsCache().ttl = dns_ttl
+        if pool_size == self._pool_size and host_connections == self._host_connections:
+            return None
+        self._pool_size = pool_size
+        self._host_connections = host_connections
+        self.clear()
+
+    def get_transport(self, address: str, port: int, timeout: float | tuple | None = None):
+        """
+        Getting transport for camera host (transport created on first request)
+        :param address: Address of IP camera
+        :param port: ONVIF port on IP camera
+        :param timeout: Timeout of ONVIF requests sent by calling thread (seconds or tuple of connect and read
+                        timeouts, None - no timeout)
+        :return: zeep transport with keep-alive session
+        """
+        _, _, transport_class = _import_http_modules()
+        key = (address, port)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is not None:
+                self._transports.move_to_end(key)
+                transport.operation_timeout = timeout
+                return transport
+            transport = transport_class(session=self._create_session(), operation_timeout=timeout)
+            self._transports[key] = transport
+            while len(self._transports) > self._pool_size:
+                _, old_transport = self._transports.popitem(last=False)
+                old_transport.session.close()
+            return transport
+
+    def _create_session(self):
+        """
+        :return: requests.Session object with DNS caching adapter on HTTP
+        """
+        requests, dns_caching_adapter, _ = _import_http_modules()
+        session = requests.Session()
+        # Not blocking: connections above limit are opened for one request and closed
+        session.mount('http://', dns_caching_adapter(pool_connections=1, pool_maxsize=self._host_connections,
+                                                     pool_block=False))
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1,
+                                                                pool_maxsize=self._host_connections,
+                                                                pool_block=False))
+        return session
+
+    def clear(self) -> None:
+        """
+        Closing all kept transports
+        """
+        with self._lock:
+            for transport in self._transports.values():
+                transport.session.close()
+            self._transports.clear()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import sys
+import os
+
+
+try:
+    import zeep
+    import zeep.transports
+    import zeep.wsdl
+except ModuleNotFoundError:
+    print('Module zeep not found! Please install required modules from file "requirements.txt"')
+    exit(1)
+except Exception as exc:
+    print(f'Import module zeep failed ({exc})!')
+    exit(1)
+
+
+import logger
+
+
+class WsdlCache:
+    """
+    Parsed ONVIF WSDL documents, shared by all cameras in process
+    """
+    __instance = None
+    __initialized = False
+
+    _PRELOAD_FILES: tuple = ('devicemgmt.wsdl', 'media.wsdl', 'ptz.wsdl')
+
+    _wsdl_dir: str = ''
+    _documents: dict | None = None
+    _settings: zeep.Settings | None = None
+    _transport: zeep.transports.Transport | None = None
+    _lock: threading.Lock = None
+
+    @property
+    def wsdl_dir(self) -> str:
+        return self._wsdl_dir
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__initialized = False
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        self._wsdl_dir = os.path.dirname(os.path.abspath(__file__))
+        # PyInstaller special
+        if hasattr(sys, '_MEIPASS'):
+            self._wsdl_dir += '/resources/wsdl'
+        else:
+            self._wsdl_dir += '/../resources/wsdl'
+        self._documents = dict()
+        self._settings = zeep.Settings(strict=False, xml_huge_tree=True)
+        self._transport = zeep.transports.Transport()
+        self._lock = threading.Lock()
+
+    def get_document(self, wsdl_file: str) -> zeep.wsdl.Document:
+        """
+        Getting parsed WSDL document (document parsed on first request)
+        :param wsdl_file: WSDL file path
+        :return: Parsed WSDL document
+        """
+        wsdl_file = os.path.abspath(wsdl_file)
+        with self._lock:
+            document = self._documents.get(wsdl_file)
+            if document is None:
+                document = zeep.wsdl.Document(wsdl_file, self._transport, settings=self._settings)
+                self._documents[wsdl_file] = document
+                logger.Logger().debug('WSDL file "%s" parsed', os.path.basename(wsdl_file))
+            return document
+
+    def create_client(self, wsdl_file: str, wsse=None,
+                      transport: zeep.transports.Transport | None = None) -> zeep.Client:
+        """
+        Creating SOAP client based on shared WSDL document
+        :param wsdl_file: WSDL file path
+        :param wsse: Security object for signing requests
+        :param transport: Transport for requests to camera (None - new transport)
+        :return: SOAP client
+        """
+        return zeep.Client(self.get_document(wsdl_file), wsse=wsse, transport=transport, settings=self._settings)
+
+    def preload(self) -> None:
+        """
+        Parsing WSDL documents used for moving cameras
+        """
+        for file_name in self._PRELOAD_FILES:
+            try:
+                self.get_document(os.path.join(self._wsdl_dir, file_name))
+            except Exception as e:
+                logger.Logger().warning('Preloading WSDL file "%s" failed!', file_name)
+                logger.Logger().debug('Exception text: %s', e)
+
+    def invalidate(self) -> None:
+        """
+        Removing parsed documents (documents are parsed again on next request)
+        """
+        with self._lock:
+            self._documents.clear()
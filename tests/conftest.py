@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+
+import base64
+import sys
+import os
+
+
+import pytest
+
+
+# Program modules are imported by name (as src/main.py does)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(_ROOT, 'src'), os.path.join(_ROOT, 'tools')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+
+class FakeClock:
+    """
+    Replacement of time.monotonic, moved forward by tests
+    """
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Fake monotonic clock (tests patch it into the tested module)
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def make_camera():
+    """
+    Factory of camera dictionaries in configuration file format (password "admin", hot key CTRL + last digit)
+    """
+    def make(number: int, address: str = '10.0.0.1', port: int = 80, preset: int = 1) -> dict:
+        return {'number': number, 'activated': True, 'hot-keys': ['CTRL', str(number % 10)], 'address': address,
+                'port': port, 'username': 'admin', 'password': base64.b64encode(b'admin').decode('UTF-8'),
+                'max-count': 16, 'preset': preset}
+
+    return make
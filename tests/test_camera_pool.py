@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+
+import pytest
+
+
+import camera_pool
+import mock_camera
+import settings
+
+
+@pytest.fixture
+def camera():
+    camera = mock_camera.MockCamera(password=None)
+    camera.start()
+    yield camera
+    camera.stop()
+
+
+@pytest.fixture
+def pool():
+    pool = camera_pool.CameraPool()
+    pool.clear()
+    yield pool
+    pool.clear()
+
+
+def test_controller_reused_and_options_updated(camera, pool):
+    controller = pool.get_controller(camera.address, camera.port, 'admin', 'admin', timeout=(1.0, 1.0))
+    same = pool.get_controller(camera.address, camera.port, 'admin', 'admin', True, (2.0, 3.0))
+    assert same is controller
+    assert controller.fast_path and controller.timeout == (2.0, 3.0)
+    assert camera.requests['GetProfiles'] == 1
+
+
+def test_controller_rebuilt_after_password_change(camera, pool):
+    controller = pool.get_controller(camera.address, camera.port, 'admin', 'admin')
+    rebuilt = pool.get_controller(camera.address, camera.port, 'admin', 'changed')
+    assert rebuilt is not controller
+    assert pool.get_controller(camera.address, camera.port, 'admin', 'changed') is rebuilt
+
+
+def test_evicted_controller_rebuilt(camera, pool):
+    controller = pool.get_controller(camera.address, camera.port, 'admin', 'admin')
+    assert pool.evict(camera.address, camera.port, 'admin')
+    assert not pool.evict(camera.address, camera.port, 'admin')
+    assert pool.get_controller(camera.address, camera.port, 'admin', 'admin') is not controller
+    assert camera.requests['GetProfiles'] == 2
+
+
+def test_sync_keeps_only_unchanged_cameras(camera, pool, make_camera):
+    controller = pool.get_controller(camera.address, camera.port, 'admin', 'admin')
+    other = pool.get_controller(camera.address, camera.port, 'operator', 'admin')
+    data = make_camera(1, camera.address, camera.port)
+    data['fast-path'] = True
+    pool.sync([settings.CameraData.from_dict(data)])
+    assert controller.fast_path
+    assert pool.get_controller(camera.address, camera.port, 'admin', 'admin', True) is controller
+    assert pool.get_controller(camera.address, camera.port, 'operator', 'admin') is not other
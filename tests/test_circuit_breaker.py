@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+
+import pytest
+
+
+import circuit_breaker
+import exceptions
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    """
+    Circuit breakers read fake clock
+    """
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+
+
+def _open_breaker(breaker: circuit_breaker.CircuitBreaker, failures: int) -> None:
+    for _ in range(failures):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_circuit_opens_after_threshold(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=3, reset_timeout=30.0)
+    _open_breaker(breaker, 2)
+    assert breaker.state == circuit_breaker.CircuitState.CLOSED
+    _open_breaker(breaker, 1)
+    assert breaker.state == circuit_breaker.CircuitState.OPEN
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_failures_count(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=2, reset_timeout=30.0)
+    _open_breaker(breaker, 1)
+    breaker.record_success()
+    _open_breaker(breaker, 1)
+    assert breaker.state == circuit_breaker.CircuitState.CLOSED
+
+
+def test_half_open_allows_one_probe(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=1, reset_timeout=30.0)
+    _open_breaker(breaker, 1)
+    clock.now += 29.0
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1.0
+    assert breaker.state == circuit_breaker.CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_success_closes_circuit(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=1, reset_timeout=30.0)
+    _open_breaker(breaker, 1)
+    clock.now += 30.0
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == circuit_breaker.CircuitState.CLOSED
+    assert breaker.failures == 0
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_probe_failure_opens_circuit_again(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=3, reset_timeout=30.0)
+    _open_breaker(breaker, 3)
+    clock.now += 30.0
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.CircuitState.OPEN
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.before_call()
+    clock.now += 30.0
+    breaker.before_call()
+
+
+def test_released_probe_allows_next_probe(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=1, reset_timeout=30.0)
+    _open_breaker(breaker, 1)
+    clock.now += 30.0
+    breaker.before_call()
+    breaker.release()
+    assert breaker.state == circuit_breaker.CircuitState.HALF_OPEN
+    breaker.before_call()
+
+
+def test_reset_closes_circuit(clock):
+    breaker = circuit_breaker.CircuitBreaker('camera', failure_threshold=1, reset_timeout=30.0)
+    _open_breaker(breaker, 1)
+    breaker.reset()
+    assert breaker.state == circuit_breaker.CircuitState.CLOSED
+    breaker.before_call()
+
+
+@pytest.mark.parametrize('args', [('camera', 0, 30.0), ('camera', 3, -1.0), (None, 3, 30.0), ('camera', 1.5, 30.0)])
+def test_wrong_arguments(args):
+    with pytest.raises(exceptions.IncorrectArgsError):
+        circuit_breaker.CircuitBreaker(*args)
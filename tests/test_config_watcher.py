@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import time
+import os
+
+
+import pytest
+
+
+import config_watcher
+import exceptions
+import settings
+
+
+def _settings(cameras: list, **options) -> settings.SettingsData:
+    return settings.SettingsData.from_dict({'version': settings.CONFIG_VERSION, 'cameras': cameras, **options})
+
+
+def test_diff_of_equal_settings_is_empty(make_camera):
+    old = _settings([make_camera(1), make_camera(2)])
+    changes = old.diff(_settings([make_camera(1), make_camera(2)]))
+    assert changes.empty
+    assert not changes.cameras_changed
+
+
+def test_diff_matches_cameras_by_number(make_camera):
+    old = _settings([make_camera(1), make_camera(2), make_camera(3)])
+    new = _settings([make_camera(2, preset=5), make_camera(3), make_camera(4)])
+    changes = old.diff(new)
+    assert [camera.number for camera in changes.added] == [4]
+    assert [camera.number for camera in changes.removed] == [1]
+    assert [(old_camera.preset, new_camera.preset) for old_camera, new_camera in changes.changed] == [(1, 5)]
+    assert changes.options == set()
+    assert changes.cameras_changed
+
+
+def test_diff_reports_changed_options_only(make_camera):
+    old = _settings([make_camera(1)], dns_ttl=300.0)
+    changes = old.diff(_settings([make_camera(1)], dns_ttl=60.0, health_check_interval=10.0))
+    assert changes.options == {'dns_ttl', 'health_check_interval'}
+    assert not changes.cameras_changed
+
+
+def test_diff_wrong_argument():
+    with pytest.raises(exceptions.IncorrectArgsError):
+        _settings([]).diff({'cameras': []})
+
+
+@pytest.fixture
+def watcher():
+    watcher = config_watcher.ConfigWatcher()
+    yield watcher
+    watcher.stop()
+
+
+def _edit(path, text: str) -> None:
+    with open(path, 'w', encoding='UTF-8') as f:
+        f.write(text)
+    # Modification time changed even on file systems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+
+def test_callback_called_after_edit(watcher, tmp_path):
+    path = tmp_path / 'MoveMyCam.conf'
+    path.write_text('{}', encoding='UTF-8')
+    called = threading.Event()
+    watcher.start(str(path), called.set, interval=0.02)
+    assert watcher.running
+    assert not called.wait(0.1)
+    _edit(path, '{"cameras": []}')
+    assert called.wait(5.0)
+
+
+def test_removed_file_ignored(watcher, tmp_path):
+    path = tmp_path / 'MoveMyCam.conf'
+    path.write_text('{}', encoding='UTF-8')
+    called = threading.Event()
+    watcher.start(str(path), called.set, interval=0.02)
+    path.unlink()
+    assert not called.wait(0.5)
+    _edit(path, '{}')
+    assert called.wait(5.0)
+
+
+def test_stopped_watcher_not_calling(watcher, tmp_path):
+    path = tmp_path / 'MoveMyCam.conf'
+    path.write_text('{}', encoding='UTF-8')
+    called = threading.Event()
+    watcher.start(str(path), called.set, interval=0.02)
+    watcher.stop()
+    assert not watcher.running
+    _edit(path, '{"cameras": []}')
+    assert not called.wait(0.5)
+
+
+def test_restart_leaves_one_thread(watcher, tmp_path):
+    path = tmp_path / 'MoveMyCam.conf'
+    path.write_text('{}', encoding='UTF-8')
+    for _ in range(5):
+        watcher.start(str(path), lambda: None, interval=0.02)
+    # Stopped threads finish after their current interval
+    time.sleep(0.2)
+    assert [thread.name for thread in threading.enumerate()].count('config-watcher') == 1
+
+
+@pytest.mark.parametrize('args', [('', lambda: None, 1.0), ('file.conf', None, 1.0), ('file.conf', lambda: None, 0)])
+def test_wrong_arguments(watcher, args):
+    with pytest.raises(exceptions.IncorrectArgsError):
+        watcher.start(*args)
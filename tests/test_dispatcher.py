@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import time
+
+
+import dispatcher
+
+
+def _wait(condition, timeout: float = 5.0) -> bool:
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class _BlockingHandler:
+    """
+    Move handler waiting for release of every command (commands are recorded in execution order)
+    """
+
+    def __init__(self):
+        self.commands = list()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, command: dispatcher.MoveCommand) -> tuple:
+        self.commands.append(command)
+        self.started.set()
+        self.release.wait(5.0)
+        return True, 'moved', 0.0
+
+
+def test_queued_command_superseded_by_newer_command():
+    handler = _BlockingHandler()
+    moves = dispatcher.Dispatcher(handler, workers=1)
+    try:
+        first = moves.submit(['camera'])
+        assert handler.started.wait(5.0)
+        second = moves.submit(['camera'])
+        third = moves.submit(['camera'])
+        handler.release.set()
+        assert _wait(lambda: first.done and second.done and third.done)
+    finally:
+        moves.stop(wait=True)
+    assert [command.batch for command in handler.commands] == [first, third]
+    assert second.results[0].superseded and not second.results[0].moved
+    assert third.results[0].moved
+    assert moves.superseded_count == 1
+    assert moves.executed_count == 2
+
+
+def test_commands_for_other_cameras_not_coalesced():
+    handler = _BlockingHandler()
+    moves = dispatcher.Dispatcher(handler, workers=1)
+    try:
+        first = moves.submit(['camera 1'])
+        assert handler.started.wait(5.0)
+        second = moves.submit(['camera 2', 'camera 3'])
+        handler.release.set()
+        assert _wait(lambda: first.done and second.done)
+    finally:
+        moves.stop(wait=True)
+    assert sorted(command.camera for command in handler.commands) == ['camera 1', 'camera 2', 'camera 3']
+    assert moves.superseded_count == 0
+
+
+def test_slot_key_groups_cameras():
+    handler = _BlockingHandler()
+    moves = dispatcher.Dispatcher(handler, workers=1, key=lambda camera: camera[0])
+    try:
+        moves.submit([('host', 1)])
+        assert handler.started.wait(5.0)
+        moves.submit([('host', 2)])
+        last = moves.submit([('host', 3)])
+        handler.release.set()
+        assert _wait(lambda: last.done)
+    finally:
+        moves.stop(wait=True)
+    assert [command.camera for command in handler.commands] == [('host', 1), ('host', 3)]
+
+
+def test_expired_command_not_executed():
+    handler = _BlockingHandler()
+    moves = dispatcher.Dispatcher(handler, workers=1, deadline=lambda camera: 0.05)
+    try:
+        first = moves.submit(['camera 1'])
+        assert handler.started.wait(5.0)
+        second = moves.submit(['camera 2'])
+        time.sleep(0.1)
+        handler.release.set()
+        assert _wait(lambda: first.done and second.done)
+    finally:
+        moves.stop(wait=True)
+    assert [command.camera for command in handler.commands] == ['camera 1']
+    assert second.results[0].expired
+    assert moves.expired_count == 1
+
+
+def test_batch_callback_receives_all_results():
+    results = list()
+    done = threading.Event()
+
+    def callback(batch_results: list) -> None:
+        results.extend(batch_results)
+        done.set()
+
+    moves = dispatcher.Dispatcher(lambda command: (True, 'moved', 0.0), workers=4)
+    try:
+        moves.submit(['camera 1', 'camera 2', 'camera 3'], callback)
+        assert done.wait(5.0)
+    finally:
+        moves.stop(wait=True)
+    assert sorted(result.camera for result in results) == ['camera 1', 'camera 2', 'camera 3']
+    assert all(result.moved for result in results)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+
+import socket
+
+
+import pytest
+
+
+import transport_pool
+
+
+@pytest.fixture
+def dns(clock, monkeypatch):
+    """
+    DNS cache with fake clock and resolver answering 10.0.0.<count of resolver calls>
+    """
+    calls = list()
+
+    def getaddrinfo(host, port, type=0):
+        calls.append(host)
+        if host == 'unknown.local':
+            raise socket.gaierror('not found')
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (f'10.0.0.{len(calls)}', 0))]
+
+    monkeypatch.setattr(transport_pool.socket, 'getaddrinfo', getaddrinfo)
+    monkeypatch.setattr(transport_pool.time, 'monotonic', clock)
+    cache = transport_pool.DnsCache()
+    old_ttl = cache.ttl
+    cache.ttl = 60.0
+    cache.clear()
+    yield cache, clock, calls
+    cache.clear()
+    cache.ttl = old_ttl
+
+
+def test_address_cached_until_ttl_expires(dns):
+    cache, clock, calls = dns
+    assert cache.resolve('camera.local') == '10.0.0.1'
+    clock.now += 59.0
+    assert cache.resolve('camera.local') == '10.0.0.1'
+    assert calls == ['camera.local']
+    clock.now += 1.0
+    assert cache.resolve('camera.local') == '10.0.0.2'
+    assert calls == ['camera.local', 'camera.local']
+
+
+def test_zero_ttl_resolves_every_time(dns):
+    cache, clock, calls = dns
+    cache.ttl = 0
+    cache.resolve('camera.local')
+    cache.resolve('camera.local')
+    assert len(calls) == 2
+
+
+def test_ip_address_not_resolved(dns):
+    cache, clock, calls = dns
+    assert cache.resolve('192.168.1.10') == '192.168.1.10'
+    assert cache.resolve('::1') == '::1'
+    assert calls == []
+
+
+def test_failed_resolving_returns_host_and_not_cached(dns):
+    cache, clock, calls = dns
+    assert cache.resolve('unknown.local') == 'unknown.local'
+    assert cache.resolve('unknown.local') == 'unknown.local'
+    assert calls == ['unknown.local', 'unknown.local']
+
+
+def test_wrong_ttl_ignored(dns):
+    cache, clock, calls = dns
+    cache.ttl = -1
+    cache.ttl = '10'
+    assert cache.ttl == 60.0
+
+
+def test_resolve_url_keeps_original_host(dns):
+    url, host = transport_pool.resolve_url('http://user@camera.local:8080/onvif/device_service')
+    assert url == 'http://10.0.0.1:8080/onvif/device_service'
+    assert host == 'camera.local:8080'
+    assert transport_pool.resolve_url('https://camera.local/onvif') == ('https://camera.local/onvif', None)
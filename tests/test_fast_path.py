@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+
+import time
+
+
+import pytest
+
+
+import camera_controller
+import mock_camera
+import exceptions
+
+
+@pytest.fixture
+def camera():
+    camera = mock_camera.MockCamera(fail_operations=['GotoPreset'])
+    camera.start()
+    yield camera
+    camera.hang = False
+    camera.stop()
+
+
+@pytest.fixture
+def controller(camera):
+    return camera_controller.CameraController(camera.address, camera.port, 'admin', 'admin', fast_path=True,
+                                              timeout=(1.0, 1.0))
+
+
+def test_preset_moved_by_fast_path(camera, controller):
+    assert controller.fast_path_active
+    assert controller.go_to_preset(2)
+    assert camera.preset == 2
+    assert camera.requests['GotoPreset'] == 1
+
+
+def test_transient_fault_not_resent(camera, controller):
+    camera.failure_rate = 1.0
+    with pytest.raises(exceptions.CameraMoveError):
+        controller.go_to_preset(2)
+    assert camera.requests['GotoPreset'] == 1
+    assert controller.fast_path_active
+
+
+def test_hung_camera_fails_after_one_timeout(camera, controller):
+    camera.hang = True
+    start_time = time.monotonic()
+    with pytest.raises(exceptions.CameraMoveError):
+        controller.go_to_preset(2, timeout=(0.2, 0.2))
+    assert time.monotonic() - start_time < 0.4
+    assert controller.fast_path_active
+
+
+def test_rejected_request_disables_fast_path(camera, controller):
+    # Password changed on camera: fast request rejected as not authorized, zeep request fails too
+    camera._password = 'changed'
+    with pytest.raises(exceptions.CameraMoveError):
+        controller.go_to_preset(2)
+    assert not controller.fast_path_active
+    assert camera.requests['GotoPreset'] == 2
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import socket
+import time
+
+
+import pytest
+
+
+import health_checker
+import settings
+
+
+def _wait(condition, timeout: float = 5.0) -> bool:
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def ports():
+    """
+    Port of listening socket (online camera) and port without listener (offline camera)
+    """
+    listener = socket.create_server(('127.0.0.1', 0))
+    closed = socket.create_server(('127.0.0.1', 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    yield listener.getsockname()[1], closed_port
+    listener.close()
+
+
+@pytest.fixture
+def checker(ports, make_camera):
+    """
+    Started health checker with online camera 1, offline camera 2 and recorded state changes
+    """
+    checker = health_checker.HealthChecker()
+    changes = list()
+    lock = threading.Lock()
+
+    def on_state_changed(address: str, port: int, state: health_checker.CameraState) -> None:
+        with lock:
+            changes.append((port, state))
+
+    checker.set_state_callback(on_state_changed)
+    checker.probe_timeout = 0.5
+    checker.set_cameras([settings.CameraData.from_dict(make_camera(number, '127.0.0.1', port))
+                         for number, port in enumerate(ports, 1)])
+    checker.start()
+    yield checker, changes
+    checker.stop()
+    checker.set_cameras(list())
+    checker.set_state_callback(None)
+
+
+def test_offline_camera_detected(checker, ports):
+    checker, changes = checker
+    online_port, offline_port = ports
+    assert _wait(lambda: checker.is_offline('127.0.0.1', offline_port))
+    assert _wait(lambda: checker.get_state('127.0.0.1', online_port) == health_checker.CameraState.ONLINE)
+    assert not checker.is_offline('127.0.0.1', online_port)
+    # First online state is not reported
+    assert changes == [(offline_port, health_checker.CameraState.OFFLINE)]
+
+
+def test_reported_failure_and_success_change_state(checker, ports):
+    checker, changes = checker
+    online_port, _ = ports
+    assert _wait(lambda: checker.get_state('127.0.0.1', online_port) == health_checker.CameraState.ONLINE)
+    checker.report_failure('127.0.0.1', online_port)
+    # Probe scheduled by failure finds camera online again
+    assert _wait(lambda: (online_port, health_checker.CameraState.ONLINE) in changes)
+    assert changes.index((online_port, health_checker.CameraState.OFFLINE)) < \
+        changes.index((online_port, health_checker.CameraState.ONLINE))
+    assert not checker.is_offline('127.0.0.1', online_port)
+
+
+def test_stopped_checker_not_reporting_offline(checker, ports):
+    checker, _ = checker
+    _, offline_port = ports
+    assert _wait(lambda: checker.is_offline('127.0.0.1', offline_port))
+    checker.stop()
+    assert not checker.is_offline('127.0.0.1', offline_port)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+
+import json
+
+
+import pytest
+
+
+import logger
+
+
+@pytest.fixture
+def log(tmp_path):
+    """
+    Logger writing warnings to text file and JSON lines file in temporary directory (settings restored after test)
+    """
+    log = logger.Logger()
+    old_settings = (log.log_level, log.print_log, log._file_path, log.json_file_path, log.force_use_file_log)
+    log.log_level = logger.LogLevel.WARNING
+    log.print_log = False
+    log.file_path = str(tmp_path / 'app.log')
+    log.force_use_file_log = True
+    log.json_file_path = str(tmp_path / 'app.jsonl')
+    yield log
+    log.flush()
+    log.log_level, log.print_log, log._file_path, log.json_file_path, log.force_use_file_log = old_settings
+
+
+def _json_records(tmp_path) -> list:
+    return [json.loads(line) for line in (tmp_path / 'app.jsonl').read_text(encoding='UTF-8').splitlines()]
+
+
+def _text_log(tmp_path) -> str:
+    path = tmp_path / 'app.log'
+    return path.read_text(encoding='UTF-8') if path.exists() else ''
+
+
+def test_record_written_to_both_logs(log, tmp_path):
+    assert log.warning('Camera "%s" offline', '10.0.0.1')
+    assert log.flush()
+    records = _json_records(tmp_path)
+    assert [(record['level'], record['message']) for record in records] == [('WARNING', 'Camera "10.0.0.1" offline')]
+    assert set(records[0].keys()) == {'time', 'level', 'message'}
+    assert 'Camera "10.0.0.1" offline' in _text_log(tmp_path)
+
+
+def test_typed_fields_written_regardless_of_level(log, tmp_path):
+    fields = {'address': '10.0.0.1', 'port': 80, 'chord': ['CTRL', '1'], 'latency_ms': 2.5, 'error': None}
+    assert log.info('Camera moved', fields=fields)
+    assert not log.info('Camera connected')
+    assert log.flush()
+    records = _json_records(tmp_path)
+    assert len(records) == 1
+    assert {name: records[0][name] for name in fields} == fields
+    assert records[0]['level'] == 'INFO'
+    assert 'Camera moved' not in _text_log(tmp_path)
+
+
+def test_fields_ignored_when_json_log_disabled(log, tmp_path):
+    log.json_file_path = None
+    assert not log.info('Camera moved', fields={'port': 80})
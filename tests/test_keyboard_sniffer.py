@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import queue
+import time
+import json
+
+
+import pytest
+
+
+import keyboard_sniffer
+import circuit_breaker
+import latency_tracker
+import health_checker
+import camera_pool
+import dispatcher
+import settings
+import logger
+
+
+@pytest.fixture
+def sniffer(tmp_path, make_camera):
+    """
+    Keyboard sniffer with cameras 1 and 11 on CTRL + 1 and camera 2 on CTRL + 2 (keyboard listener is not started)
+    """
+    path = tmp_path / 'MoveMyCam.conf'
+    path.write_text(json.dumps({'version': settings.CONFIG_VERSION,
+                                'cameras': [make_camera(1), make_camera(2, '10.0.0.2'),
+                                            make_camera(11, '10.0.0.11')],
+                                'log_level': logger.LogLevel.DISABLE_LOG.value, 'health_check_interval': 0,
+                                'latency_summary_interval': 0, 'circuit_failures': 1}), encoding='UTF-8')
+    settings.Settings(config_file_path=str(path))
+    sniffer = keyboard_sniffer.KeyboardSniffer()
+    yield sniffer
+    sniffer._dispatcher.stop(wait=True)
+
+
+@pytest.fixture
+def half_open(sniffer, clock, monkeypatch):
+    """
+    Circuit of camera 1 waiting for probe command
+    """
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    camera = settings.Settings().get_camera(1)
+    breaker = sniffer._get_breaker(camera)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now += 30.0
+    assert breaker.state == circuit_breaker.CircuitState.HALF_OPEN
+    return camera, breaker
+
+
+def _command(camera, deadline: float | None = None,
+             trace: latency_tracker.MoveTrace | None = None) -> dispatcher.MoveCommand:
+    return dispatcher.MoveCommand(camera, dispatcher.MoveBatch(1), deadline=deadline, trace=trace)
+
+
+def test_expired_deadline_not_counted_as_camera_failure(sniffer, half_open, monkeypatch):
+    camera, breaker = half_open
+    monkeypatch.setattr(camera_pool.CameraPool, 'get_controller', lambda *args: pytest.fail('camera requested'))
+    moved, _, _ = sniffer._move_camera(_command(camera, time.perf_counter() - 1.0))
+    assert not moved
+    assert breaker.state == circuit_breaker.CircuitState.HALF_OPEN
+    breaker.before_call()
+
+
+def test_unexpected_error_releases_probe(sniffer, half_open, monkeypatch):
+    camera, breaker = half_open
+
+    def get_controller(*args):
+        raise RuntimeError('unexpected')
+
+    monkeypatch.setattr(camera_pool.CameraPool, 'get_controller', get_controller)
+    with pytest.raises(RuntimeError):
+        sniffer._move_camera(_command(camera))
+    assert breaker.state == circuit_breaker.CircuitState.HALF_OPEN
+    breaker.before_call()
+
+
+def test_offline_camera_not_requested(sniffer, monkeypatch):
+    camera = settings.Settings().get_camera(1)
+    monkeypatch.setattr(health_checker.HealthChecker, 'is_offline', lambda self, address, port: address == '10.0.0.1')
+    monkeypatch.setattr(camera_pool.CameraPool, 'get_controller', lambda *args: pytest.fail('camera requested'))
+    moved, text, _ = sniffer._move_camera(_command(camera))
+    assert not moved and text == 'Camera not moved! Camera offline'
+    breaker = sniffer._get_breaker(camera)
+    assert breaker.state == circuit_breaker.CircuitState.CLOSED
+    breaker.before_call()
+
+
+def test_failed_move_latency_recorded_by_outcome(sniffer):
+    tracker = latency_tracker.LatencyTracker()
+    tracker.reset()
+    camera = settings.Settings().get_camera(1)
+    trace = latency_tracker.MoveTrace({latency_tracker.Span.KEY_RECEIVED: time.perf_counter()})
+    moved, _, _ = sniffer._move_camera(_command(camera, time.perf_counter() - 1.0, trace))
+    assert not moved
+    histograms = tracker.get_histograms()
+    assert histograms[('10.0.0.1:80', 'total', 'failed')].count == 1
+    assert ('10.0.0.1:80', 'total', 'moved') not in histograms
+    assert any(line.startswith('10.0.0.1:80 total (failed): ') for line in tracker.summary())
+    tracker.reset()
+
+
+@pytest.fixture
+def bindings(make_camera):
+    """
+    Hot keys table: CTRL + 1 (cameras 1 and 11), CTRL + 2, CTRL + SHIFT + 2, deactivated camera on CTRL + 3
+    """
+    cameras = [settings.CameraData.from_dict(make_camera(number)) for number in (11, 1, 2, 12, 3)]
+    cameras[3].hot_keys = ['CTRL', 'SHIFT', '2']
+    cameras[4].activated = False
+    return keyboard_sniffer.KeyboardSniffer.build_bindings(cameras)
+
+
+@pytest.mark.parametrize('pressed_keys, numbers', [
+    ({'CTRL', '1'}, [11, 1]),
+    ({'CTRL', '2', 'Q'}, [2]),
+    ({'CTRL', 'SHIFT', '2'}, [2, 12]),
+    ({'CTRL', '3'}, []),
+    ({'CTRL'}, []),
+    (set(), []),
+    ({'CTRL', 'SHIFT', 'ALT', '1', '2', 'Q'}, [1, 2, 11, 12]),
+])
+def test_match_bindings(bindings, pressed_keys, numbers):
+    cameras = keyboard_sniffer.KeyboardSniffer.match_bindings(bindings, pressed_keys)
+    assert [camera.number for camera in cameras] == numbers
+
+
+def test_match_bindings_same_result_with_many_pressed_keys(bindings):
+    few_keys = {'CTRL', 'SHIFT', '2'}
+    many_keys = few_keys | {'A', 'B', 'C', 'D'}
+    assert len(many_keys) > keyboard_sniffer._MAX_LOOKUP_KEYS >= len(few_keys)
+    few = keyboard_sniffer.KeyboardSniffer.match_bindings(bindings, few_keys)
+    many = keyboard_sniffer.KeyboardSniffer.match_bindings(bindings, many_keys)
+    assert [camera.number for camera in few] == [camera.number for camera in many] == [2, 12]
+
+
+def test_hot_key_moves_bound_cameras_in_parallel(sniffer, monkeypatch):
+    both_started = threading.Barrier(2)
+
+    def move(command: dispatcher.MoveCommand) -> tuple:
+        # Fails (broken barrier) if cameras are moved one by one
+        both_started.wait(5.0)
+        return True, 'moved', 0.0
+
+    results = queue.Queue()
+    monkeypatch.setattr(sniffer._dispatcher, '_handler', move)
+    monkeypatch.setattr(sniffer, '_notify_results', results.put)
+    sniffer._key_press('CTRL')
+    sniffer._key_press('1')
+    sniffer._key_release('1')
+    sniffer._key_release('CTRL')
+    moved = sorted((result.camera.number, result.moved) for result in results.get(timeout=5.0))
+    assert moved == [(1, True), (11, True)]
+
+
+def test_key_release_not_waiting_for_camera(sniffer, monkeypatch):
+    release = threading.Event()
+    threads = list()
+
+    def move(command: dispatcher.MoveCommand) -> tuple:
+        threads.append(threading.current_thread())
+        release.wait(5.0)
+        return True, 'moved', 0.0
+
+    results = queue.Queue()
+    monkeypatch.setattr(sniffer._dispatcher, '_handler', move)
+    monkeypatch.setattr(sniffer, '_notify_results', results.put)
+    sniffer._key_press('CTRL')
+    sniffer._key_press('2')
+    sniffer._key_release('2')
+    sniffer._key_release('CTRL')
+    assert results.empty()
+    release.set()
+    assert [result.moved for result in results.get(timeout=5.0)] == [True]
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
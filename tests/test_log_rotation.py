@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import gzip
+import time
+import os
+
+
+import pytest
+
+
+import logger
+
+
+_START = time.mktime((2026, 3, 1, 12, 0, 0, 0, 0, -1))
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """
+    Log writer without background threads (records written and segments compressed by test)
+    """
+    writer = logger._LogWriter()
+    # Compressing thread is not started, rotated segments are compressed by _compress_rotated call
+    writer._compressor = threading.Thread(target=lambda: None)
+    yield writer
+    writer._close_files()
+
+
+def _write(writer: logger._LogWriter, path: str, created: float, text: str) -> None:
+    writer._write(logger.LogLevel.INFO, created, text, tuple(), None, False, str(path), None)
+
+
+def _segments(directory) -> list:
+    return sorted(name for name in os.listdir(directory) if name != 'app.log')
+
+
+def test_rotated_by_size_with_timestamp_name(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(100, 0, 5)
+    _write(writer, path, _START, 'a' * 60)
+    _write(writer, path, _START + 1, 'b' * 60)
+    writer._flush_files()
+    assert _segments(tmp_path) == [f'app.log.{time.strftime("%Y%m%d-%H%M%S", time.localtime(_START + 1))}']
+    assert 'b' * 60 in path.read_text(encoding='UTF-8')
+    assert 'a' * 60 not in path.read_text(encoding='UTF-8')
+
+
+def test_size_counted_in_bytes(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(200, 0, 5)
+    # 40 characters, 80 bytes in UTF-8
+    _write(writer, path, _START, 'ж' * 40)
+    _write(writer, path, _START, 'ж' * 40)
+    writer._flush_files()
+    assert writer._files[str(path)].size == os.path.getsize(path)
+    assert len(_segments(tmp_path)) == 1
+
+
+def test_rotated_by_age(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(0, 60.0, 5)
+    _write(writer, path, _START, 'first')
+    _write(writer, path, _START + 59, 'second')
+    assert _segments(tmp_path) == []
+    _write(writer, path, _START + 60, 'third')
+    assert len(_segments(tmp_path)) == 1
+
+
+def test_same_second_segments_numbered(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(10, 0, 5)
+    for _ in range(3):
+        _write(writer, path, _START, 'x' * 20)
+    name = f'app.log.{time.strftime("%Y%m%d-%H%M%S", time.localtime(_START))}'
+    assert _segments(tmp_path) == [name, f'{name}-1']
+
+
+def test_old_segments_removed_and_kept_compressed(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(10, 0, 2)
+    for index in range(4):
+        _write(writer, path, _START + index, f'record {index:02d} ' + 'x' * 10)
+    writer._close_files()
+    logger._LogWriter._compress_rotated(str(path), 2)
+    segments = _segments(tmp_path)
+    assert segments == [f'app.log.{time.strftime("%Y%m%d-%H%M%S", time.localtime(_START + index))}.gz'
+                        for index in (2, 3)]
+    with gzip.open(tmp_path / segments[-1], 'rt', encoding='UTF-8') as f:
+        assert 'record 02' in f.read()
+
+
+def test_failed_rename_retried_later(writer, tmp_path, monkeypatch):
+    path = tmp_path / 'app.log'
+    writer.set_rotation(10, 0, 5)
+    attempts = list()
+
+    def replace(source, target):
+        attempts.append(target)
+        raise OSError('file locked')
+
+    monkeypatch.setattr(logger.os, 'replace', replace)
+    for index in range(10):
+        _write(writer, path, _START + index, 'x' * 20)
+    # First rotation attempted by second record
+    assert len(attempts) == 1
+    _write(writer, path, _START + 1 + logger._LogWriter._ROTATE_RETRY_INTERVAL, 'x' * 20)
+    assert len(attempts) == 2
+    writer._flush_files()
+    assert path.read_text(encoding='UTF-8').count('x' * 20) == 11
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import time
+
+
+import pytest
+
+
+import logger
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """
+    Log writer with queue for 3 records
+    """
+    monkeypatch.setattr(logger._LogWriter, '_QUEUE_SIZE', 3)
+    writer = logger._LogWriter()
+    yield writer
+    writer.stop()
+
+
+def _record(path, text: str, *args) -> tuple:
+    return logger.LogLevel.INFO, time.time(), text, args, None, False, str(path), None
+
+
+def test_records_written_in_order_after_flush(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    for index in range(3):
+        assert writer.put(_record(path, 'record %d', index))
+        assert writer.flush()
+    lines = path.read_text(encoding='UTF-8').splitlines()
+    assert [line.split(' :: ')[-1] for line in lines] == ['record 0', 'record 1', 'record 2']
+    assert writer.dropped_count == 0
+
+
+def test_records_dropped_when_queue_full(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    # Writing thread not started yet: queue is not emptied
+    writer._thread = threading.Thread(target=lambda: None)
+    results = [writer.put(_record(path, 'record %d', index)) for index in range(5)]
+    assert results == [True, True, True, False, False]
+    assert writer.dropped_count == 2
+    writer._thread = None
+    writer._start()
+    assert writer.flush()
+    lines = [line.split(' :: ')[-1] for line in path.read_text(encoding='UTF-8').splitlines()]
+    assert lines == ['record 0', 'record 1', 'record 2', '2 log record(s) dropped (queue is full)']
+    assert writer.dropped_count == 2
+
+
+def test_stopped_writer_restarted_by_next_record(writer, tmp_path):
+    path = tmp_path / 'app.log'
+    writer.put(_record(path, 'before stop'))
+    writer.stop()
+    assert 'before stop' in path.read_text(encoding='UTF-8')
+    writer.put(_record(path, 'after stop'))
+    assert writer.flush()
+    assert 'after stop' in path.read_text(encoding='UTF-8')
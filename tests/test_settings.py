@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+import json
+
+
+import pytest
+
+
+import exceptions
+import settings
+
+
+@pytest.fixture
+def config(tmp_path):
+    """
+    Settings object with configuration file in temporary directory
+    """
+    path = tmp_path / 'MoveMyCam.conf'
+
+    def load(data: dict) -> settings.Settings:
+        path.write_text(json.dumps(data), encoding='UTF-8')
+        config = settings.Settings(config_file_path=str(path), autoload=False)
+        assert config.load()
+        return config
+
+    return load
+
+
+def test_version_1_file_loaded(config, make_camera):
+    loaded = config({'cameras': [make_camera(0), make_camera(9, '10.0.0.9')]})
+    assert [camera.number for camera in loaded.data.cameras] == [0, 9]
+    assert loaded.get_camera(9).address == '10.0.0.9'
+
+
+def test_version_1_duplicate_numbers_keep_first_camera(config, make_camera):
+    loaded = config({'cameras': [make_camera(1, '10.0.0.1'), make_camera(1, '10.0.0.2')]})
+    assert [(camera.number, camera.address) for camera in loaded.data.cameras] == [(1, '10.0.0.1')]
+
+
+def test_version_1_camera_number_limited(config, make_camera):
+    with pytest.raises(exceptions.IncorrectData):
+        config({'cameras': [make_camera(10)]})
+
+
+def test_version_1_file_saved_as_current_version(config, make_camera, tmp_path):
+    loaded = config({'cameras': [make_camera(1), make_camera(2)]})
+    assert loaded.insert_camera(settings.CameraData.from_dict(make_camera(150)))
+    assert loaded.save()
+    data = json.loads((tmp_path / 'MoveMyCam.conf').read_text(encoding='UTF-8'))
+    assert data['version'] == settings.CONFIG_VERSION
+    assert [camera['number'] for camera in data['cameras']] == [1, 2, 150]
+    reloaded = settings.Settings(config_file_path=str(tmp_path / 'MoveMyCam.conf'))
+    assert [camera.number for camera in reloaded.data.cameras] == [1, 2, 150]
+
+
+@pytest.mark.parametrize('version, numbers', [
+    (settings.CONFIG_VERSION + 1, []),
+    (0, []),
+    ('2', []),
+    (2, [5, 5]),
+    (2, [settings.MAX_CAMERA_NUMBER + 1]),
+])
+def test_wrong_file_rejected(make_camera, version, numbers):
+    with pytest.raises(exceptions.IncorrectData):
+        settings.SettingsData.from_dict({'version': version, 'cameras': [make_camera(number) for number in numbers]})
+
+
+def test_cameras_indexed_by_address(config, make_camera):
+    loaded = config({'version': 2, 'cameras': [make_camera(1), make_camera(2, '10.0.0.2'), make_camera(3)]})
+    assert [camera.number for camera in loaded.get_cameras_by_address('10.0.0.1', 80)] == [1, 3]
+    moved = settings.CameraData.from_dict(make_camera(3, '10.0.0.2'))
+    assert loaded.insert_camera(moved, replace=True)
+    assert [camera.number for camera in loaded.get_cameras_by_address('10.0.0.1', 80)] == [1]
+    assert [camera.number for camera in loaded.get_cameras_by_address('10.0.0.2', 80)] == [2, 3]
+    assert loaded.remove_camera(2)
+    assert not loaded.remove_camera(2)
+    assert [camera.number for camera in loaded.get_cameras_by_address('10.0.0.2', 80)] == [3]
+    assert loaded.get_cameras_by_address('10.0.0.9', 80) == []
+
+
+def test_cameras_list_replaced_on_change(config, make_camera):
+    loaded = config({'version': 2, 'cameras': [make_camera(1)]})
+    cameras = loaded.data.cameras
+    assert loaded.insert_camera(settings.CameraData.from_dict(make_camera(2)))
+    assert [camera.number for camera in cameras] == [1]
+    assert [camera.number for camera in loaded.data.cameras] == [1, 2]
+    loaded.clear_data()
+    assert loaded.data.cameras == []
+
+
+def test_concurrent_changes_keep_list_and_indexes_equal(config, make_camera):
+    loaded = config({'version': 2, 'cameras': []})
+
+    def insert(first: int) -> None:
+        for number in range(first, first + 100):
+            loaded.insert_camera(settings.CameraData.from_dict(make_camera(number)))
+
+    threads = [threading.Thread(target=insert, args=(first,)) for first in (1, 101, 201)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(camera.number for camera in loaded.data.cameras) == list(range(1, 301))
+    assert len(loaded.get_cameras_by_address('10.0.0.1', 80)) == 300
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+
+import threading
+
+
+import pytest
+
+
+import transport_pool
+
+
+@pytest.fixture
+def pool():
+    pool = transport_pool.TransportPool()
+    pool.clear()
+    yield pool
+    pool.clear()
+
+
+def test_request_timeout_kept_per_thread(pool):
+    transport = pool.get_transport('10.0.0.1', 80, (1.0, 2.0))
+    timeouts = dict()
+
+    def move(name: str, timeout: tuple) -> None:
+        assert pool.get_transport('10.0.0.1', 80, timeout) is transport
+        both_set.wait(5.0)
+        timeouts[name] = transport.operation_timeout
+
+    both_set = threading.Barrier(2)
+    threads = [threading.Thread(target=move, args=(name, timeout))
+               for name, timeout in (('short', (0.1, 0.2)), ('long', (3.0, 4.0)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timeouts == {'short': (0.1, 0.2), 'long': (3.0, 4.0)}
+    assert transport.operation_timeout == (1.0, 2.0)
+    with transport.settings(timeout=5.0):
+        assert transport.operation_timeout == 5.0
+    assert transport.operation_timeout == (1.0, 2.0)
+
+
+def test_connections_above_host_limit_not_blocking(pool):
+    transport = pool.get_transport('10.0.0.1', 80)
+    for url in ('http://10.0.0.1', 'https://10.0.0.1'):
+        adapter = transport.session.get_adapter(url)
+        assert adapter._pool_maxsize == pool.host_connections
+        assert not adapter._pool_block
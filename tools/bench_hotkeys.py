@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+
+"""
+Hot key to camera move benchmark: KeyboardSniffer driven by synthetic key events against local mock cameras
+(cold / warm latency, bursts, fan-out, slow and dead cameras). Results are printed as JSON
+"""
+
+
+import statistics
+import tempfile
+import platform
+import argparse
+import base64
+import queue
+import json
+import time
+import sys
+import os
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+import keyboard_sniffer
+import transport_pool
+import camera_pool
+import mock_camera
+import settings
+import logger
+
+
+_CHORD = ('Q', '1')
+_MAX_CAMERAS = 100
+_CONFIG_FILE = 'MoveMyCam.conf'
+
+
+def _summary(samples: list) -> dict:
+    if len(samples) == 0:
+        return {'count': 0}
+    samples = sorted(samples)
+    return {'count': len(samples),
+            'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+            'p50_ms': round(samples[len(samples) // 2] * 1000, 3),
+            'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+            'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+            'min_ms': round(samples[0] * 1000, 3),
+            'max_ms': round(samples[-1] * 1000, 3)}
+
+
+class HotkeyBench:
+    """
+    Keyboard sniffer with configuration pointing at mock cameras (keyboard listener is not started)
+    """
+    _sniffer: keyboard_sniffer.KeyboardSniffer | None = None
+    _farm: mock_camera.MockCameraFarm | None = None
+    _results: queue.Queue | None = None
+    _read_timeout: float = 1.0
+
+    def __init__(self, read_timeout: float = 1.0):
+        """
+        :param read_timeout: Read timeout of cameras in configuration
+        """
+        self._read_timeout = read_timeout
+        self._results = queue.Queue()
+        os.chdir(tempfile.mkdtemp(prefix='movemycam-bench-'))
+        self._write_config(list())
+        settings.Settings()
+        self._sniffer = keyboard_sniffer.KeyboardSniffer()
+        self._sniffer._notify_results = lambda results: self._results.put((time.perf_counter(), results))
+
+    def _write_config(self, cameras: list) -> None:
+        data = {'version': settings.CONFIG_VERSION,
+                'cameras': [{'number': index, 'activated': True, 'hot-keys': ['Q', '1'],
+                             'address': camera.address, 'port': camera.port, 'username': 'admin',
+                             'password': base64.b64encode(b'admin').decode('UTF-8'), 'max-count': 16,
+                             'preset': index % 16 + 1, 'read-timeout': self._read_timeout}
+                            for index, camera in enumerate(cameras)],
+                'log_level': logger.LogLevel.DISABLE_LOG.value, 'health_check_interval': 0,
+                'latency_summary_interval': 0}
+        with open(_CONFIG_FILE, 'w', encoding='UTF-8') as f:
+            json.dump(data, f)
+
+    def use_cameras(self, count: int, **options) -> list:
+        """
+        Starting new mock cameras and loading them to sniffer configuration (all cameras on one hot key)
+        :param count: Count of cameras
+        :param options: MockCamera options
+        :return: Mock cameras
+        """
+        if self._farm is not None:
+            self._farm.stop()
+        self._farm = mock_camera.MockCameraFarm(count, **options)
+        self._farm.start()
+        self._write_config(self._farm.cameras)
+        self._sniffer.load_configuration()
+        return self._farm.cameras
+
+    def reset_sessions(self) -> None:
+        camera_pool.CameraPool().clear()
+        transport_pool.TransportPool().clear()
+
+    def warm_up(self) -> None:
+        self._sniffer._warm_up()
+
+    def press(self) -> float:
+        """
+        Pressing and releasing hot key
+        :return: Time (time.perf_counter value) of first key release
+        """
+        for key_text in _CHORD:
+            self._sniffer._key_press(key_text, time.perf_counter())
+        release_time = time.perf_counter()
+        for key_text in reversed(_CHORD):
+            self._sniffer._key_release(key_text, time.perf_counter())
+        return release_time
+
+    def wait_results(self, timeout: float = 30.0) -> tuple:
+        """
+        :return: Time of notification and list of dispatcher.MoveResult objects
+        """
+        return self._results.get(timeout=timeout)
+
+    def close(self) -> None:
+        if self._farm is not None:
+            self._farm.stop()
+            self._farm = None
+
+
+def bench_cold_warm(bench: HotkeyBench, count: int) -> dict:
+    bench.use_cameras(1)
+    cold = list()
+    for _ in range(min(count, 10)):
+        bench.reset_sessions()
+        release_time = bench.press()
+        done_time, _ = bench.wait_results()
+        cold.append(done_time - release_time)
+    warm = list()
+    for _ in range(count):
+        release_time = bench.press()
+        done_time, _ = bench.wait_results()
+        warm.append(done_time - release_time)
+    return {'cold': _summary(cold), 'warm': _summary(warm)}
+
+
+def bench_burst(bench: HotkeyBench, presses: int, latency: float) -> dict:
+    cameras = bench.use_cameras(1, latency=latency)
+    bench.warm_up()
+    cameras[0].requests.clear()
+    start_time = time.perf_counter()
+    for _ in range(presses):
+        bench.press()
+    moved = superseded = 0
+    done_time = start_time
+    for _ in range(presses):
+        done_time, results = bench.wait_results()
+        moved += sum(1 for result in results if result.moved)
+        superseded += sum(1 for result in results if result.superseded)
+    elapsed = done_time - start_time
+    return {'presses': presses,
+            'camera_latency_ms': latency * 1000,
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'presses_per_second': round(presses / elapsed, 1),
+            'moves_executed': moved,
+            'moves_superseded': superseded,
+            'goto_preset_requests': cameras[0].requests['GotoPreset']}
+
+
+def bench_fan_out(bench: HotkeyBench, cameras_count: int, count: int, latency: float) -> dict:
+    bench.use_cameras(cameras_count, latency=latency)
+    bench.warm_up()
+    batch = list()
+    for _ in range(count):
+        release_time = bench.press()
+        done_time, _ = bench.wait_results()
+        batch.append(done_time - release_time)
+    return {'cameras': cameras_count, 'camera_latency_ms': latency * 1000, 'batch': _summary(batch)}
+
+
+def bench_degraded(bench: HotkeyBench, cameras_count: int, count: int, mode: str) -> dict:
+    """
+    One camera of fan-out group is slow (answers after 0.5 s) or dead (never answers)
+    """
+    cameras = bench.use_cameras(cameras_count)
+    bench.warm_up()
+    if mode == 'slow':
+        cameras[0].latency = 0.5
+    else:
+        cameras[0].hang = True
+    bad_address = (cameras[0].address, cameras[0].port)
+    healthy = list()
+    degraded = list()
+    outcomes = dict()
+    for _ in range(count):
+        bench.press()
+        _, results = bench.wait_results()
+        for result in results:
+            latency = result.wait_time + result.latency
+            if (result.camera.address, result.camera.port) == bad_address:
+                degraded.append(latency)
+                outcomes[result.text] = outcomes.get(result.text, 0) + 1
+            else:
+                healthy.append(latency)
+    cameras[0].hang = False
+    return {'cameras': cameras_count, 'mode': mode, 'healthy_cameras': _summary(healthy),
+            'degraded_camera': _summary(degraded), 'degraded_camera_outcomes': outcomes}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hot key to camera move benchmark')
+    parser.add_argument('-n', '--count', type=int, default=50, help='count of hot key presses per scenario')
+    parser.add_argument('-c', '--cameras', type=int, default=8, help=f'cameras in fan-out scenarios '
+                                                                     f'(maximum {_MAX_CAMERAS})')
+    parser.add_argument('-b', '--burst', type=int, default=100, help='hot key presses in burst scenario')
+    parser.add_argument('-l', '--latency', type=float, default=0.01, help='mock camera answer delay (seconds)')
+    parser.add_argument('-o', '--output', type=str, default=None, help='JSON report file (default - stdout)')
+    args = parser.parse_args()
+    cameras_count = max(1, min(args.cameras, _MAX_CAMERAS))
+    logger.Logger().log_level = logger.LogLevel.DISABLE_LOG
+    hotkey_bench = HotkeyBench()
+    try:
+        report = {'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+                  'latency': bench_cold_warm(hotkey_bench, args.count),
+                  'burst': bench_burst(hotkey_bench, args.burst, args.latency),
+                  'fan_out': bench_fan_out(hotkey_bench, cameras_count, args.count, args.latency),
+                  'slow_camera': bench_degraded(hotkey_bench, cameras_count, min(args.count, 10), 'slow'),
+                  'dead_camera': bench_degraded(hotkey_bench, cameras_count, min(args.count, 10), 'dead')}
+    finally:
+        hotkey_bench.close()
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='UTF-8') as f:
+            f.write(text + '\n')
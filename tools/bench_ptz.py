@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+
+"""
+GotoPreset latency: zeep (onvif-zeep) path vs fast PTZ path, measured against one camera
+(local mock camera when no address is given)
+"""
+
+
+import statistics
+import argparse
+import json
+import time
+import sys
+import os
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+import camera_controller
+import mock_camera
+import logger
+
+
+def _summary(samples: list) -> dict:
+    samples = sorted(samples)
+    return {'count': len(samples),
+            'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+            'p50_ms': round(samples[len(samples) // 2] * 1000, 3),
+            'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+            'min_ms': round(samples[0] * 1000, 3),
+            'max_ms': round(samples[-1] * 1000, 3)}
+
+
+def bench_goto_preset(address: str, port: int, username: str, password: str, fast_path: bool, count: int) -> dict:
+    controller = camera_controller.CameraController(address, port, username, password, fast_path=fast_path)
+    samples = list()
+    for index in range(count):
+        start_time = time.perf_counter()
+        controller.go_to_preset(index % controller.ptz_presets_count + 1)
+        samples.append(time.perf_counter() - start_time)
+    result = _summary(samples)
+    result['fast_path_active'] = controller.fast_path_active
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='GotoPreset benchmark (zeep vs fast PTZ path)')
+    parser.add_argument('-a', '--address', help='camera address (local mock camera is started when omitted)')
+    parser.add_argument('-p', '--port', type=int, default=80, help='camera ONVIF port')
+    parser.add_argument('-u', '--username', default='admin', help='camera user name')
+    parser.add_argument('-w', '--password', default='admin', help='camera password')
+    parser.add_argument('-n', '--count', type=int, default=500, help='count of GotoPreset requests per path')
+    args = parser.parse_args()
+    logger.Logger().log_level = logger.LogLevel.DISABLE_LOG
+    mock = None
+    if args.address is None:
+        mock = mock_camera.MockCamera(username=args.username, password=args.password)
+        mock.start()
+        args.address, args.port = mock.address, mock.port
+    report = {'zeep': bench_goto_preset(args.address, args.port, args.username, args.password, False, args.count),
+              'fast_path': bench_goto_preset(args.address, args.port, args.username, args.password, True,
+                                             args.count)}
+    if mock is not None:
+        report['requests'] = dict(mock.requests)
+        mock.stop()
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,471 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+
+"""
+Local ONVIF camera stub for tests and benchmarks (device management, media and PTZ services described by bundled
+WSDL files) with configurable latency, jitter and failure injection
+"""
+
+
+import xml.etree.ElementTree as ElementTree
+import xml.sax.saxutils as saxutils
+import http.server
+import collections
+import threading
+import argparse
+import hashlib
+import random
+import socket
+import base64
+import time
+import sys
+import os
+
+
+_SOAP_ENVELOPE_NS = 'http://www.w3.org/2003/05/soap-envelope'
+_WSSE_NS = 'http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd'
+_WSU_NS = 'http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd'
+
+_ENVELOPE = ('<?xml version="1.0" encoding="UTF-8"?>'
+             f'<s:Envelope xmlns:s="{_SOAP_ENVELOPE_NS}" '
+             'xmlns:tds="http://www.onvif.org/ver10/device/wsdl" '
+             'xmlns:trt="http://www.onvif.org/ver10/media/wsdl" '
+             'xmlns:tptz="http://www.onvif.org/ver20/ptz/wsdl" '
+             'xmlns:tt="http://www.onvif.org/ver10/schema" '
+             'xmlns:ter="http://www.onvif.org/ver10/error">'
+             '<s:Body>{body}</s:Body></s:Envelope>')
+
+_WSDL_NS = 'http://schemas.xmlsoap.org/wsdl/'
+_WSDL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resources', 'wsdl')
+
+# URL service name: WSDL file, namespace prefix in answers
+_SERVICES = {
+    'device': ('devicemgmt.wsdl', 'tds'),
+    'media': ('media.wsdl', 'trt'),
+    'ptz': ('ptz.wsdl', 'tptz'),
+}
+
+_FAULT = ('<s:Fault><s:Code><s:Value>s:{code}</s:Value><s:Subcode><s:Value>{subcode}</s:Value></s:Subcode>'
+          '</s:Code><s:Reason><s:Text xml:lang="en">{reason}</s:Text></s:Reason></s:Fault>')
+
+
+_operations_cache = dict()
+_operations_lock = threading.Lock()
+
+
+def load_operations(wsdl_file: str) -> frozenset:
+    """
+    Reading operation names of all port types in WSDL file
+    :param wsdl_file: Name of file in resources/wsdl
+    :return: Operation names
+    """
+    with _operations_lock:
+        operations = _operations_cache.get(wsdl_file)
+        if operations is None:
+            root = ElementTree.parse(os.path.join(_WSDL_DIR, wsdl_file)).getroot()
+            operations = frozenset(operation.get('name') for port_type in root.iter(f'{{{_WSDL_NS}}}portType')
+                                   for operation in port_type.iter(f'{{{_WSDL_NS}}}operation'))
+            _operations_cache[wsdl_file] = operations
+        return operations
+
+
+class MockCamera:
+    """
+    ONVIF camera stub, answering on http://address:port/onvif/{device,media,ptz}_service.
+    Operations described in WSDL file of service but not implemented by stub get empty response.
+    WSDL file is available by GET request with "?wsdl" query
+    """
+    _address: str = '127.0.0.1'
+    _port: int = 0
+    _username: str = 'admin'
+    _password: str | None = 'admin'
+    _presets_count: int = 16
+    _latency: float = 0.0
+    _jitter: float = 0.0
+    _failure_rate: float = 0.0
+    _drop_rate: float = 0.0
+    _fail_operations: frozenset | None = None
+    _hang_event: threading.Event | None = None
+    _random: random.Random | None = None
+    _server: http.server.ThreadingHTTPServer | None = None
+    _thread: threading.Thread | None = None
+    _lock: threading.Lock = None
+
+    requests: collections.Counter | None = None
+    failures: collections.Counter | None = None
+    preset: int | None = None
+    position: tuple = (0.0, 0.0, 0.0)
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    @latency.setter
+    def latency(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value >= 0:
+            self._latency = value
+
+    @property
+    def jitter(self) -> float:
+        return self._jitter
+
+    @jitter.setter
+    def jitter(self, value: float) -> None:
+        if isinstance(value, (int, float)) and value >= 0:
+            self._jitter = value
+
+    @property
+    def failure_rate(self) -> float:
+        return self._failure_rate
+
+    @failure_rate.setter
+    def failure_rate(self, value: float) -> None:
+        if isinstance(value, (int, float)) and 0 <= value <= 1:
+            self._failure_rate = value
+
+    @property
+    def drop_rate(self) -> float:
+        return self._drop_rate
+
+    @drop_rate.setter
+    def drop_rate(self, value: float) -> None:
+        if isinstance(value, (int, float)) and 0 <= value <= 1:
+            self._drop_rate = value
+
+    @property
+    def hang(self) -> bool:
+        """
+        Requests are accepted but never answered (until hang disabled or camera stopped)
+        """
+        return not self._hang_event.is_set()
+
+    @hang.setter
+    def hang(self, value: bool) -> None:
+        if value:
+            self._hang_event.clear()
+        else:
+            self._hang_event.set()
+
+    def __init__(self, address: str = '127.0.0.1', port: int = 0, username: str = 'admin',
+                 password: str | None = 'admin', presets_count: int = 16, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, drop_rate: float = 0.0, fail_operations: list | None = None,
+                 seed: int | None = None):
+        """
+        :param address: Listening address
+        :param port: Listening port (0 - random free port)
+        :param username: ONVIF username
+        :param password: ONVIF user password (None - authentication not checked)
+        :param presets_count: Maximum count of PTZ presets
+        :param latency: Delay (seconds) before every answer
+        :param jitter: Maximum random deviation (seconds) of delay
+        :param failure_rate: Probability of SOAP fault instead of answer
+        :param drop_rate: Probability of closing connection without answer
+        :param fail_operations: Names of operations affected by failure injection (None - all operations)
+        :param seed: Seed of random generator (latency jitter and failures)
+        """
+        self._address = address
+        self._port = port
+        self._username = username
+        self._password = password
+        self._presets_count = presets_count
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self._fail_operations = None if fail_operations is None else frozenset(fail_operations)
+        self._hang_event = threading.Event()
+        self._hang_event.set()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = collections.Counter()
+        self.failures = collections.Counter()
+        for wsdl_file, _ in _SERVICES.values():
+            load_operations(wsdl_file)
+
+    def start(self) -> None:
+        camera = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self) -> None:
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition('?')
+                wsdl_file = camera.service_wsdl(path)
+                if wsdl_file is None or query.lower() != 'wsdl':
+                    self.send_error(404)
+                    return None
+                with open(os.path.join(_WSDL_DIR, wsdl_file), 'rb') as f:
+                    answer = f.read()
+                self._answer(200, 'text/xml; charset=utf-8', answer)
+
+            def do_POST(self) -> None:
+                data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                camera._hang_event.wait()
+                delay = camera._delay()
+                if delay > 0:
+                    time.sleep(delay)
+                status, body = camera.handle(self.path, data)
+                if status is None:
+                    # Injected connection drop
+                    self.close_connection = True
+                    return None
+                self._answer(status, 'application/soap+xml; charset=utf-8', _ENVELOPE.format(body=body).encode('UTF-8'))
+
+            def _answer(self, status: int, content_type: str, answer: bytes) -> None:
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(answer)))
+                    self.end_headers()
+                    self.wfile.write(answer)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client closed connection (timeout while camera was hanging)
+                    self.close_connection = True
+
+        self._server = http.server.ThreadingHTTPServer((self._address, self._port), Handler)
+        self._server.daemon_threads = True
+        self._port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return None
+        self._hang_event.set()
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def service_wsdl(self, path: str) -> str | None:
+        """
+        :param path: Request path
+        :return: WSDL file name of service (None if path is unknown)
+        """
+        if not path.startswith('/onvif/') or not path.endswith('_service'):
+            return None
+        service = _SERVICES.get(path[len('/onvif/'):-len('_service')])
+        return None if service is None else service[0]
+
+    def _delay(self) -> float:
+        if self._jitter == 0:
+            return self._latency
+        with self._lock:
+            return max(self._latency + self._random.uniform(-self._jitter, self._jitter), 0.0)
+
+    def _inject_failure(self, operation: str) -> str | None:
+        """
+        :return: Failure type ("drop" or "fault") or None
+        """
+        if self._failure_rate == 0 and self._drop_rate == 0:
+            return None
+        if self._fail_operations is not None and operation not in self._fail_operations:
+            return None
+        with self._lock:
+            value = self._random.random()
+            if value < self._drop_rate:
+                failure = 'drop'
+            elif value < self._drop_rate + self._failure_rate:
+                failure = 'fault'
+            else:
+                return None
+            self.failures[failure] += 1
+        return failure
+
+    def handle(self, path: str, data: bytes) -> tuple:
+        """
+        Processing SOAP request
+        :return: HTTP status and SOAP body (None and None - connection must be closed without answer)
+        """
+        try:
+            root = ElementTree.fromstring(data)
+        except ElementTree.ParseError:
+            return 400, self._fault('Sender', 'ter:WellFormed', 'Wrong XML')
+        body = root.find(f'{{{_SOAP_ENVELOPE_NS}}}Body')
+        if body is None or len(body) == 0:
+            return 400, self._fault('Sender', 'ter:WellFormed', 'Empty body')
+        request = body[0]
+        operation = request.tag.rsplit('}', 1)[-1]
+        with self._lock:
+            self.requests[operation] += 1
+        wsdl_file = self.service_wsdl(path)
+        if wsdl_file is None or operation not in load_operations(wsdl_file):
+            return 400, self._fault('Receiver', 'ter:ActionNotSupported', f'{operation} not supported')
+        failure = self._inject_failure(operation)
+        if failure == 'drop':
+            return None, None
+        if failure == 'fault':
+            return 500, self._fault('Receiver', 'ter:Action', 'Injected failure')
+        if operation != 'GetSystemDateAndTime' and not self._authorized(root):
+            return 400, self._fault('Sender', 'ter:NotAuthorized', 'Sender not authorized')
+        handler = getattr(self, f'_op_{operation}', None)
+        if handler is None:
+            prefix = [prefix for wsdl, prefix in _SERVICES.values() if wsdl == wsdl_file][0]
+            return 200, f'<{prefix}:{operation}Response/>'
+        return handler(request)
+
+    def _authorized(self, root: ElementTree.Element) -> bool:
+        if self._password is None:
+            return True
+        token = root.find(f'.//{{{_WSSE_NS}}}UsernameToken')
+        if token is None:
+            return False
+        try:
+            nonce = base64.b64decode(token.findtext(f'{{{_WSSE_NS}}}Nonce', ''))
+        except ValueError:
+            return False
+        created = token.findtext(f'{{{_WSU_NS}}}Created', '')
+        digest = hashlib.sha1(nonce + created.encode('UTF-8') + self._password.encode('UTF-8')).digest()
+        return token.findtext(f'{{{_WSSE_NS}}}Username') == self._username and \
+            token.findtext(f'{{{_WSSE_NS}}}Password') == base64.b64encode(digest).decode('ascii')
+
+    @staticmethod
+    def _fault(code: str, subcode: str, reason: str) -> str:
+        return _FAULT.format(code=code, subcode=subcode, reason=saxutils.escape(reason))
+
+    def _xaddr(self, service: str) -> str:
+        return f'http://{self._address}:{self._port}/onvif/{service}_service'
+
+    def _op_GetCapabilities(self, _) -> tuple:
+        return 200, ('<tds:GetCapabilitiesResponse><tds:Capabilities>'
+                     f'<tt:Device><tt:XAddr>{self._xaddr("device")}</tt:XAddr></tt:Device>'
+                     f'<tt:Media><tt:XAddr>{self._xaddr("media")}</tt:XAddr>'
+                     '<tt:StreamingCapabilities><tt:RTPMulticast>false</tt:RTPMulticast><tt:RTP_TCP>true</tt:RTP_TCP>'
+                     '<tt:RTP_RTSP_TCP>true</tt:RTP_RTSP_TCP></tt:StreamingCapabilities></tt:Media>'
+                     f'<tt:PTZ><tt:XAddr>{self._xaddr("ptz")}</tt:XAddr></tt:PTZ>'
+                     '</tds:Capabilities></tds:GetCapabilitiesResponse>')
+
+    def _op_GetDeviceInformation(self, _) -> tuple:
+        return 200, ('<tds:GetDeviceInformationResponse><tds:Manufacturer>MoveMyCam</tds:Manufacturer>'
+                     '<tds:Model>MockCamera</tds:Model><tds:FirmwareVersion>1.0</tds:FirmwareVersion>'
+                     f'<tds:SerialNumber>{self._port}</tds:SerialNumber><tds:HardwareId>mock</tds:HardwareId>'
+                     '</tds:GetDeviceInformationResponse>')
+
+    def _op_GetSystemDateAndTime(self, _) -> tuple:
+        return 200, ('<tds:GetSystemDateAndTimeResponse><tds:SystemDateAndTime>'
+                     '<tt:DateTimeType>NTP</tt:DateTimeType><tt:DaylightSavings>false</tt:DaylightSavings>'
+                     '</tds:SystemDateAndTime></tds:GetSystemDateAndTimeResponse>')
+
+    def _op_GetProfiles(self, _) -> tuple:
+        return 200, ('<trt:GetProfilesResponse><trt:Profiles token="profile_1" fixed="true">'
+                     '<tt:Name>MainStream</tt:Name></trt:Profiles></trt:GetProfilesResponse>')
+
+    def _op_GetNodes(self, _) -> tuple:
+        return 200, ('<tptz:GetNodesResponse><tptz:PTZNode token="node_1"><tt:Name>PTZ</tt:Name>'
+                     '<tt:SupportedPTZSpaces/>'
+                     f'<tt:MaximumNumberOfPresets>{self._presets_count}</tt:MaximumNumberOfPresets>'
+                     '<tt:HomeSupported>true</tt:HomeSupported></tptz:PTZNode></tptz:GetNodesResponse>')
+
+    def _op_GetPresets(self, _) -> tuple:
+        presets = ''.join(f'<tptz:Preset token="{number}"><tt:Name>Preset {number}</tt:Name></tptz:Preset>'
+                          for number in range(1, self._presets_count + 1))
+        return 200, f'<tptz:GetPresetsResponse>{presets}</tptz:GetPresetsResponse>'
+
+    def _op_GotoPreset(self, request: ElementTree.Element) -> tuple:
+        preset = None
+        for element in request:
+            if element.tag.endswith('}PresetToken'):
+                preset = element.text
+        if preset is None or not preset.isdigit() or not 0 < int(preset) <= self._presets_count:
+            return 400, self._fault('Sender', 'ter:InvalidArgVal', 'No such preset')
+        with self._lock:
+            self.preset = int(preset)
+            self.position = (int(preset) / self._presets_count, 0.0, 0.0)
+        return 200, '<tptz:GotoPresetResponse/>'
+
+    def _op_ContinuousMove(self, _) -> tuple:
+        with self._lock:
+            self.preset = None
+        return 200, '<tptz:ContinuousMoveResponse/>'
+
+    def _op_Stop(self, _) -> tuple:
+        return 200, '<tptz:StopResponse/>'
+
+    def _op_GetStatus(self, _) -> tuple:
+        pan, tilt, zoom = self.position
+        return 200, ('<tptz:GetStatusResponse><tptz:PTZStatus><tt:Position>'
+                     f'<tt:PanTilt x="{pan}" y="{tilt}"/><tt:Zoom x="{zoom}"/></tt:Position>'
+                     '<tt:MoveStatus><tt:PanTilt>IDLE</tt:PanTilt><tt:Zoom>IDLE</tt:Zoom></tt:MoveStatus>'
+                     '<tt:UtcTime>2000-01-01T00:00:00Z</tt:UtcTime></tptz:PTZStatus></tptz:GetStatusResponse>')
+
+
+class MockCameraFarm:
+    """
+    Many mock cameras on different ports
+    """
+    cameras: list | None = None
+
+    def __init__(self, count: int, address: str = '127.0.0.1', base_port: int = 0, **options):
+        """
+        :param count: Count of cameras
+        :param address: Listening address
+        :param base_port: Port of first camera (next cameras use next ports). 0 - random free ports
+        :param options: MockCamera arguments (username, password, latency, jitter, failure_rate, ...)
+        """
+        seed = options.pop('seed', None)
+        self.cameras = [MockCamera(address, base_port + index if base_port > 0 else 0,
+                                   seed=None if seed is None else seed + index, **options) for index in range(count)]
+
+    def start(self) -> None:
+        for camera in self.cameras:
+            camera.start()
+
+    def stop(self) -> None:
+        for camera in self.cameras:
+            camera.stop()
+
+    def wait(self) -> None:
+        for camera in self.cameras:
+            camera.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local ONVIF camera stub')
+    parser.add_argument('-a', '--address', type=str, default='127.0.0.1', help='listening address')
+    parser.add_argument('-p', '--port', type=int, default=8080, help='listening port of first camera')
+    parser.add_argument('-n', '--count', type=int, default=1, help='count of cameras (on next ports)')
+    parser.add_argument('-u', '--username', type=str, default='admin', help='ONVIF username')
+    parser.add_argument('-w', '--password', type=str, default='admin', help='ONVIF user password')
+    parser.add_argument('-l', '--latency', type=float, default=0.0, help='answer delay (seconds)')
+    parser.add_argument('-j', '--jitter', type=float, default=0.0, help='maximum deviation of answer delay (seconds)')
+    parser.add_argument('-f', '--failure-rate', type=float, default=0.0, dest='failure_rate',
+                        help='probability of SOAP fault answer')
+    parser.add_argument('-d', '--drop-rate', type=float, default=0.0, dest='drop_rate',
+                        help='probability of closing connection without answer')
+    parser.add_argument('-o', '--fail-operation', action='append', default=None, dest='fail_operations',
+                        help='operation affected by failure injection (may be repeated, default - all)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of random generator')
+    args = parser.parse_args()
+    farm = MockCameraFarm(args.count, args.address, args.port, username=args.username, password=args.password,
+                          latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                          drop_rate=args.drop_rate, fail_operations=args.fail_operations, seed=args.seed)
+    try:
+        farm.start()
+    except OSError as e:
+        print(f'Starting mock cameras failed ({e})')
+        sys.exit(1)
+    for mock_camera in farm.cameras:
+        print(f'Mock camera listening on {mock_camera.address}:{mock_camera.port}')
+    try:
+        farm.wait()
+    except KeyboardInterrupt:
+        farm.stop()